@@ -0,0 +1,168 @@
+"""
+Chart renderer golden-image check and timing.
+
+Compares ChartRenderer against the original per-candle OpenCV renderer
+(cv2.line + cv2.rectangle per candle, kept below as the reference) on
+random windows and on a live-like sequence: the still-open candle
+updating, new candles pushing the oldest out, new highs/lows rescaling
+the chart, dojis, flat windows, windows filling up, more candles than
+pixel columns, and one renderer shared by interleaved streams. Every
+frame must be pixel-identical.
+
+Then times the reference, stateless render_chart and the incremental
+renderer on the live sequence. Exits non-zero on any mismatch.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_chart [--frames 2000]
+"""
+import argparse
+import sys
+import time
+import cv2
+import numpy as np
+
+from src.market.chart import ChartRenderer, render_chart
+
+
+def reference_render(opens, highs, lows, closes) -> np.ndarray:
+    """The original renderer: two OpenCV draw calls per candle."""
+    width = 1280
+    height = 720
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+
+    if not len(closes):
+        return img
+
+    min_price = float(lows.min())
+    max_price = float(highs.max())
+    price_range = max_price - min_price if max_price > min_price else 1.0
+
+    candle_width = width // len(closes)
+    padding = 2
+
+    for i in range(len(closes)):
+        x_center = i * candle_width + candle_width // 2
+        high, low, open_, close = float(highs[i]), float(lows[i]), float(opens[i]), float(closes[i])
+
+        y_high = height - int((high - min_price) / price_range * (height - 50)) - 25
+        y_low = height - int((low - min_price) / price_range * (height - 50)) - 25
+        y_open = height - int((open_ - min_price) / price_range * (height - 50)) - 25
+        y_close = height - int((close - min_price) / price_range * (height - 50)) - 25
+
+        color = (0, 255, 0) if close >= open_ else (0, 0, 255)
+        cv2.line(img, (x_center, y_high), (x_center, y_low), color, 1)
+
+        top = min(y_open, y_close)
+        bottom = max(y_open, y_close)
+        left = x_center - (candle_width // 2) + padding
+        right = x_center + (candle_width // 2) - padding
+        if bottom == top:
+            bottom += 1
+
+        cv2.rectangle(img, (left, top), (right, bottom), color, -1)
+
+    return img
+
+
+def random_candles(rng, count: int, price: float = 100.0) -> tuple:
+    close = price + np.cumsum(rng.normal(size=count))
+    open_ = close + rng.normal(size=count) * 0.5
+    doji = rng.random(count) < 0.1
+    open_[doji] = close[doji]
+    high = np.maximum(open_, close) + rng.random(count)
+    low = np.minimum(open_, close) - rng.random(count)
+    return open_, high, low, close
+
+
+def live_sequence(rng, frames: int, window: int = 100):
+    """Windows as a live scanner sees them: ticks on the open candle, then a new candle."""
+    open_, high, low, close = (list(values) for values in random_candles(rng, window))
+    for frame in range(frames):
+        if frame % 12 == 11:
+            # Candle closes: a new one opens at the last close
+            for values in (open_, high, low, close):
+                if len(values) >= window:
+                    values.pop(0)
+            price = close[-1]
+            open_.append(price), high.append(price), low.append(price), close.append(price)
+        else:
+            price = close[-1] + rng.normal() * (3.0 if rng.random() < 0.02 else 0.3)
+            close[-1] = price
+            high[-1] = max(high[-1], price)
+            low[-1] = min(low[-1], price)
+        yield tuple(np.array(values) for values in (open_, high, low, close))
+
+
+def golden_check(rng, frames: int) -> int:
+    """Number of frames that differ from the reference."""
+    mismatches = 0
+
+    def compare(label, candles, image):
+        nonlocal mismatches
+        expected = reference_render(*candles)
+        if not np.array_equal(expected, image):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  MISMATCH {label}: {int((expected != image).any(axis=2).sum())} pixels")
+
+    # Stateless, random sizes (including more candles than columns and one candle)
+    for count in [1, 2, 3, 5, 99, 100, 101, 255, 256, 300, 427, 640, 641, 1280, 1500, 2600]:
+        candles = random_candles(rng, count)
+        compare(f"{count} candles", candles, render_chart(*candles))
+
+    # Flat window (zero price range)
+    flat = tuple(np.full(50, 100.0) for _ in range(4))
+    compare("flat", flat, render_chart(*flat))
+
+    # Incremental: filling up, then live ticks and closes
+    renderer = ChartRenderer()
+    full = random_candles(rng, 100)
+    for count in range(1, 101):
+        compare(f"filling {count}", tuple(values[:count] for values in full), renderer.render(*(values[:count] for values in full)))
+    for i, candles in enumerate(live_sequence(rng, frames)):
+        compare(f"live frame {i}", candles, renderer.render(*candles))
+
+    # One renderer, two interleaved streams
+    shared = ChartRenderer()
+    for i, (a, b) in enumerate(zip(live_sequence(rng, frames // 4), live_sequence(rng, frames // 4))):
+        compare(f"interleaved {i} A", a, shared.render(*a))
+        compare(f"interleaved {i} B", b, shared.render(*b))
+
+    print(f"Golden check: {mismatches} mismatching frames (incremental stats: {renderer.stats})")
+    return mismatches
+
+
+def timed(render, windows) -> float:
+    start = time.perf_counter()
+    for candles in windows:
+        render(*candles)
+    return (time.perf_counter() - start) / len(windows) * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart renderer golden check and timing")
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    mismatches = golden_check(rng, args.frames)
+
+    windows = list(live_sequence(rng, args.frames))
+    renderer = ChartRenderer()
+    reference_ms = timed(reference_render, windows)
+    stateless_ms = timed(render_chart, windows)
+    incremental_ms = timed(renderer.render, windows)
+
+    print(f"Live sequence, 100 candles, {len(windows)} frames (1 close per 12 updates):")
+    print(f"  reference (cv2 per candle)  {reference_ms:.3f} ms/frame")
+    print(f"  render_chart (vectorized)   {stateless_ms:.3f} ms/frame ({reference_ms / stateless_ms:.1f}x)")
+    print(f"  ChartRenderer (incremental) {incremental_ms:.3f} ms/frame ({reference_ms / incremental_ms:.1f}x)")
+    print(f"  full redraws {renderer.stats['full']}, shifts {renderer.stats['shifted']}, "
+          f"{renderer.stats['candles_drawn'] / renderer.stats['renders']:.1f} candles drawn per frame")
+
+    print("OK" if mismatches == 0 else "FAILED")
+    sys.exit(0 if mismatches == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
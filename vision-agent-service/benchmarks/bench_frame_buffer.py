@@ -0,0 +1,67 @@
+"""
+Microbenchmark: per-frame cost of FrameBuffer.add + get_sequence.
+
+Compares the ring-buffer FrameBuffer with the previous list-based buffer.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_frame_buffer
+"""
+import time
+import numpy as np
+
+from src.config import config
+from src.agent.video_processor import FrameBuffer
+
+
+class ListFrameBuffer:
+    """Previous implementation: list of dicts, rebuilt array per call."""
+
+    def __init__(self, sequence_length: int):
+        self.sequence_length = sequence_length
+        self.buffer = []
+
+    def add(self, frame_data: dict):
+        self.buffer.append(frame_data)
+        if len(self.buffer) > self.sequence_length:
+            self.buffer.pop(0)
+
+    def is_ready(self) -> bool:
+        return len(self.buffer) >= self.sequence_length
+
+    def get_sequence(self) -> np.ndarray:
+        features = [frame['features'] for frame in self.buffer[-self.sequence_length:]]
+        return np.array(features)
+
+
+def bench(buffer, vectors: np.ndarray) -> float:
+    """Return mean microseconds per frame (add + get_sequence)."""
+    start = time.perf_counter()
+    for i, vector in enumerate(vectors):
+        buffer.add({'frame_idx': i, 'features': vector})
+        if buffer.is_ready():
+            buffer.get_sequence()
+    return (time.perf_counter() - start) / len(vectors) * 1e6
+
+
+def main():
+    frames = 20000
+    vectors = np.random.rand(frames, config.FEATURE_DIM).astype(np.float32)
+
+    # Same windows from both implementations
+    old, new = ListFrameBuffer(config.SEQUENCE_LENGTH), FrameBuffer()
+    for i, vector in enumerate(vectors[:100]):
+        old.add({'frame_idx': i, 'features': vector})
+        new.add({'frame_idx': i, 'features': vector})
+        if old.is_ready():
+            assert np.array_equal(old.get_sequence(), new.get_sequence())
+
+    old_us = bench(ListFrameBuffer(config.SEQUENCE_LENGTH), vectors)
+    new_us = bench(FrameBuffer(), vectors)
+
+    print(f"Window: ({config.SEQUENCE_LENGTH}, {config.FEATURE_DIM}), {frames} frames")
+    print(f"list buffer: {old_us:8.2f} us/frame")
+    print(f"ring buffer: {new_us:8.2f} us/frame ({old_us / new_us:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
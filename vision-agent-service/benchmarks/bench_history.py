@@ -0,0 +1,137 @@
+"""
+History cache check and timing.
+
+Runs HistoryCache against a synthetic 1m source with Yahoo's 7-day
+look-back: a first refresh fills the cache, then one refresh per simulated
+minute must request only the missing tail. After every refresh the cached
+candles must equal the source's closed candles exactly and the last
+candle returned must be the open one. An append cut short (one column
+longer than the others) must be trimmed on the next append.
+
+Then times the cache's side of a refresh (the source is local, so this
+excludes the network: what the tail saves is the rows requested, shown by
+the check) and memory-mapped loads of the live window and of a backtest
+range. Exits non-zero on any mismatch.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_history [--minutes 600]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import numpy as np
+from pathlib import Path
+
+from src.market.history import DTYPES, HistoryCache, YF_LOOKBACK_DAYS, DAY_MS
+
+MINUTE = 60_000
+
+
+class SyntheticSource:
+    """Deterministic 1m candles up to a settable clock; counts the rows it serves."""
+
+    def __init__(self, now_ms: int):
+        self.now_ms = now_ms
+        self.rows_served = 0
+        self.requests = 0
+
+    def candles(self, start_ms: int, end_ms: int) -> dict:
+        """Candles opening in [start_ms, end_ms), the last one open as of now."""
+        times = np.arange(start_ms - start_ms % MINUTE, end_ms, MINUTE, dtype=np.int64)
+        base = 1.1 + 0.01 * np.sin(times / 3.7e6)
+        return {
+            'time': times,
+            'open': base,
+            'high': base + 0.0005,
+            'low': base - 0.0005,
+            'close': base + 0.0001 * np.cos(times / 1.1e5),
+            'volume': (times // MINUTE % 97).astype(np.float64)
+        }
+
+    def fetch(self, symbol: str, interval: str, start_ms=None) -> dict:
+        oldest = self.now_ms - (YF_LOOKBACK_DAYS[interval] - 1) * DAY_MS
+        start_ms = oldest if start_ms is None else max(start_ms, oldest)
+        columns = self.candles(start_ms, self.now_ms + 1)
+        self.rows_served += len(columns['time'])
+        self.requests += 1
+        return columns
+
+
+def check(root: Path, minutes: int) -> int:
+    """Number of refreshes where the cache differs from the source."""
+    source = SyntheticSource(1_700_000_000_000 + 30_000)
+    cache = HistoryCache(root, fetch=source.fetch, source='synthetic')
+
+    cache.refresh('TEST', '1m', source.now_ms)
+    first_rows = source.rows_served
+    mismatches = 0
+    for minute in range(minutes):
+        source.now_ms += MINUTE
+        if minute == minutes // 2:
+            with open(cache.path('TEST', '1m') / 'close.bin', 'ab') as f:
+                f.write(b'\0' * 5)  # An append cut short
+        fetched = cache.refresh('TEST', '1m', source.now_ms)
+
+        cached = cache.load('TEST', '1m')
+        oldest = int(cached['time'][0])
+        expected = source.candles(oldest, source.now_ms - source.now_ms % MINUTE)  # Closed ones
+        if not all(np.array_equal(cached[name], expected[name]) for name in DTYPES):
+            mismatches += 1
+        if int(fetched['time'][-1]) != source.now_ms - source.now_ms % MINUTE:
+            mismatches += 1
+
+    tail_rows = (source.rows_served - first_rows) / minutes
+    print(f"Check: first refresh {first_rows} candles (the {YF_LOOKBACK_DAYS['1m']}-day look-back, as every poll "
+          f"fetched before), then {tail_rows:.1f} candles per refresh, {cache.rows('TEST', '1m')} cached, "
+          f"{mismatches} mismatches")
+    return mismatches
+
+
+def timing(root: Path):
+    source = SyntheticSource(1_700_000_000_000)
+    cache = HistoryCache(root, fetch=source.fetch, source='synthetic')
+    cache.refresh('TIME', '1m', source.now_ms)
+
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        source.now_ms += MINUTE
+        cache.refresh('TIME', '1m', source.now_ms)
+    tail_ms = (time.perf_counter() - start) / runs * 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        window = cache.load('TIME', '1m', last=100)
+        {name: np.array(values) for name, values in window.items()}
+    window_us = (time.perf_counter() - start) / runs * 1e6
+
+    start = time.perf_counter()
+    backtest = cache.load('TIME', '1m', start_ms=source.now_ms - 5 * DAY_MS, end_ms=source.now_ms - DAY_MS)
+    total = float(np.asarray(backtest['close']).sum())
+    backtest_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Refresh: {tail_ms:.2f} ms to fetch (locally) and append the tail")
+    print(f"Load: {window_us:.0f} us for the 100-candle window, {backtest_ms:.2f} ms for a "
+          f"{len(backtest['time'])}-candle backtest range (checksum {total:.1f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="History cache check and timing")
+    parser.add_argument('--minutes', type=int, default=600)
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp(prefix='history_bench_'))
+    try:
+        mismatches = check(root, args.minutes)
+        timing(root)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("OK" if mismatches == 0 else "FAILED")
+    sys.exit(0 if mismatches == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Latency benchmark: single-window inference per frame.
+
+Compares keras `model.predict` (previous path) with the compiled fast path
+used by ModelInference.predict.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_inference [--iterations 200]
+"""
+import argparse
+import time
+import numpy as np
+
+from src.config import config
+from src.agent.model_inference import ModelInference
+
+
+def percentiles(samples: list) -> str:
+    ms = np.array(samples) * 1000.0
+    return f"p50 {np.percentile(ms, 50):7.3f} ms | p99 {np.percentile(ms, 99):7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inference latency benchmark")
+    parser.add_argument('--iterations', type=int, default=200)
+    args = parser.parse_args()
+
+    config.FAST_INFERENCE = True
+    inference = ModelInference()
+    sequence = np.random.rand(config.SEQUENCE_LENGTH, config.FEATURE_DIM).astype(np.float32)
+    batch = np.expand_dims(sequence, axis=0)
+
+    # Both paths must agree
+    expected = inference.model.predict(batch, verbose=0)[0]
+    assert np.allclose(inference._predict_window(sequence), expected, atol=1e-5)
+
+    predict_times, fast_times = [], []
+    for _ in range(args.iterations):
+        start = time.perf_counter()
+        inference.model.predict(batch, verbose=0)
+        predict_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        inference.predict(sequence)
+        fast_times.append(time.perf_counter() - start)
+
+    print(f"Window: ({config.SEQUENCE_LENGTH}, {config.FEATURE_DIM}), {args.iterations} iterations")
+    print(f"model.predict: {percentiles(predict_times)}")
+    print(f"fast path:     {percentiles(fast_times)}")
+    print(f"speedup (p50): {np.median(predict_times) / np.median(fast_times):.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Streamed live feed: event latency, reconnects and gap backfill.
+
+Runs KlineStream against the local mock exchange on 1s candles through a
+normal phase, a pause in pushed events (the stream must backfill the gap
+over REST) and dropped connections (it must reconnect, resubscribe and
+backfill), then checks the final window candle by candle against the
+exchange. Also reports candle close -> on_candle latency next to what the
+polling loop would add (it fetches once per interval, so a close is seen
+on average half an interval late).
+
+`--scanner` runs the same phases through LiveMarketScanner (LIVE_FEED=stream)
+with an analysis slower than the event rate. Events must keep being applied
+while an analysis runs (coalescing into one follow-up run, never two at
+once), and the window must still survive the gap and the reconnects.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_kline_stream [--seconds 6] [--symbols 1] [--scanner]
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+import numpy as np
+
+from src.market import CandleStore, KlineStream, interval_ms
+from benchmarks.mock_exchange import MockExchange
+
+INTERVAL = '1s'
+ANALYSIS_SECONDS = 0.5  # Simulated analysis time in --scanner (events arrive every 0.1 s)
+
+
+def check_window(exchange: MockExchange, stream: KlineStream) -> tuple:
+    """Whether the stream's window has no holes, and how many closed candles differ from the exchange."""
+    length = interval_ms(INTERVAL)
+    now = int(time.time() * 1000)
+    columns = stream.store.arrays()
+    times = columns['time']
+    contiguous = bool(len(times) > 1 and np.all(np.diff(times) == length))
+
+    mismatched = 0
+    for i in range(len(times) - 1):  # The last one may still be open
+        expected = exchange.candle(stream.symbol, INTERVAL, int(times[i]), now)
+        if any(abs(columns[key][i] - expected[key]) > 1e-6 for key in ('open', 'high', 'low', 'close', 'volume')):
+            mismatched += 1
+
+    return contiguous, mismatched
+
+
+async def run(seconds: float, symbols: int) -> bool:
+    exchange = MockExchange()
+    url = await exchange.start()
+    length = interval_ms(INTERVAL)
+
+    latencies = {}
+    streams = []
+    for k in range(symbols):
+        symbol = f"MOCK{k}USDT"
+        latencies[symbol] = []
+
+        def on_candle(store, closed, symbol=symbol):
+            if closed:
+                # Close events arrive right at the candle boundary
+                latencies[symbol].append(time.time() * 1000 - (store.last_time + length))
+
+        streams.append(KlineStream(
+            symbol, INTERVAL, limit=50, on_candle=on_candle,
+            ws_url=url.replace('http', 'ws', 1), rest_url=url
+        ))
+
+    tasks = [asyncio.ensure_future(stream.run()) for stream in streams]
+
+    print(f"Normal feed for {seconds:.0f}s...")
+    await asyncio.sleep(seconds)
+
+    print("Pausing events for 3s (gap)...")
+    exchange.pause(3)
+    await asyncio.sleep(3 + seconds / 2)
+
+    print("Dropping connections...")
+    await exchange.drop_connections()
+    await asyncio.sleep(seconds)
+
+    for stream in streams:
+        await stream.stop()
+    await asyncio.gather(*tasks)
+
+    ok = True
+    for stream in streams:
+        contiguous, mismatched = check_window(exchange, stream)
+        lat = np.array(latencies[stream.symbol]) if latencies[stream.symbol] else np.zeros(1)
+        print(
+            f"{stream.symbol}: {len(stream.store)} candles, contiguous={contiguous}, mismatched={mismatched}, "
+            f"reconnects={stream.stats['reconnects']}, backfills={stream.stats['backfills']} "
+            f"({stream.stats['backfilled_candles']} candles), messages={stream.stats['messages']}"
+        )
+        print(f"  close -> on_candle: p50 {np.percentile(lat, 50):.1f} ms, p99 {np.percentile(lat, 99):.1f} ms")
+
+        ok = ok and contiguous and mismatched == 0 and stream.stats['reconnects'] >= 1 and stream.stats['backfills'] >= 3
+
+    print(f"Polling once per interval sees a close {length / 2:.0f} ms late on average ({INTERVAL} candles)")
+    print(f"Exchange: {exchange.stats}")
+    await exchange.stop()
+    return ok
+
+
+async def run_scanner(seconds: float) -> bool:
+    """LiveMarketScanner on the stream, with a slow analysis, through a gap and dropped connections."""
+    from src.config import config
+    from src.main import LiveMarketScanner
+
+    exchange = MockExchange()
+    url = await exchange.start()
+    config.BINANCE_WS_URL = url.replace('http', 'ws', 1)
+    config.BINANCE_REST_URL = url
+    config.LIVE_TRIGGER = 'update'
+
+    scanner = LiveMarketScanner(agent=None)
+    scanner.symbol, scanner.interval, scanner.limit = 'MOCK0USDT', INTERVAL, 50
+    scanner.store = CandleStore(scanner.symbol, INTERVAL, 50)
+
+    counts = {'events': 0, 'coalesced': 0, 'analyses': 0, 'running': 0, 'max_running': 0}
+    lock = threading.Lock()
+
+    def analyse(candles, video_id):
+        with lock:
+            counts['running'] += 1
+            counts['max_running'] = max(counts['max_running'], counts['running'])
+        time.sleep(ANALYSIS_SECONDS)
+        with lock:
+            counts['running'] -= 1
+            counts['analyses'] += 1
+
+    dispatch = scanner._dispatch
+
+    def counted_dispatch(video_id):
+        # Runs on the stream's event loop: an event applied while an
+        # analysis runs proves the socket is not blocked by it
+        counts['events'] += 1
+        counts['coalesced'] += scanner._busy
+        dispatch(video_id)
+
+    scanner._process_candles = analyse
+    scanner._dispatch = counted_dispatch
+    scanner.running = True
+    thread = threading.Thread(target=scanner._run_stream, args=('LIVE_BENCH',), daemon=True)
+    thread.start()
+
+    print(f"Normal feed for {seconds:.0f}s ({ANALYSIS_SECONDS:.1f}s per analysis)...")
+    await asyncio.sleep(seconds)
+
+    print("Pausing events for 3s (gap)...")
+    exchange.pause(3)
+    await asyncio.sleep(3 + seconds / 2)
+
+    print("Dropping connections...")
+    await exchange.drop_connections()
+    await asyncio.sleep(seconds)
+
+    stream = scanner._stream
+    scanner.stop()
+    await asyncio.get_running_loop().run_in_executor(None, thread.join, 10)
+
+    contiguous, mismatched = check_window(exchange, stream)
+    print(
+        f"{stream.symbol}: {len(stream.store)} candles, contiguous={contiguous}, mismatched={mismatched}, "
+        f"reconnects={stream.stats['reconnects']}, backfills={stream.stats['backfills']} "
+        f"({stream.stats['backfilled_candles']} candles), messages={stream.stats['messages']}"
+    )
+    print(
+        f"  events {counts['events']}, applied during an analysis {counts['coalesced']}, "
+        f"analyses {counts['analyses']}, max concurrent {counts['max_running']}"
+    )
+    await exchange.stop()
+
+    return (
+        not thread.is_alive() and contiguous and mismatched == 0
+        and stream.stats['reconnects'] >= 1 and stream.stats['backfills'] >= 3
+        and counts['coalesced'] > 0 and counts['max_running'] == 1
+        and 0 < counts['analyses'] < counts['events']
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kline stream benchmark")
+    parser.add_argument('--seconds', type=float, default=6.0)
+    parser.add_argument('--symbols', type=int, default=1)
+    parser.add_argument('--scanner', action='store_true', help='Run through LiveMarketScanner with a slow analysis')
+    args = parser.parse_args()
+
+    ok = asyncio.run(run_scanner(args.seconds) if args.scanner else run(args.seconds, args.symbols))
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Market data client against a throttling mock exchange.
+
+Checks the shared MarketDataClient on the local mock exchange:
+
+- coalescing: concurrent identical requests reach the exchange once
+- priority: requests queued behind a busy connection start lowest
+  priority value (soonest candle close) first
+- throttling: with the mock limiting REST weight per window, a client
+  unaware of the limit is answered 429 and must wait out each Retry-After
+  (every request still succeeds); a client given the limit must never be
+  throttled, spreading its requests over the windows instead
+
+Exits non-zero on any failed check.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_market_client [--requests 120] [--weight-limit 60] [--window 5]
+"""
+import argparse
+import asyncio
+import sys
+import time
+import aiohttp
+import numpy as np
+
+from src.market.client import MarketDataClient
+from benchmarks.mock_exchange import KLINES_WEIGHT, MockExchange
+
+
+def klines(symbol: str) -> dict:
+    return {'symbol': symbol, 'interval': '1m', 'limit': 50}
+
+
+async def check_coalescing(url: str, exchange: MockExchange) -> bool:
+    async with aiohttp.ClientSession() as session:
+        client = MarketDataClient(session, url, connections=10, weight_limit=0)
+        before = exchange.stats['rest_requests']
+        results = await asyncio.gather(*(client.klines(klines('MOCK0USDT')) for _ in range(50)))
+        sent = exchange.stats['rest_requests'] - before
+
+    ok = sent == 1 and all(rows == results[0] for rows in results)
+    print(f"Coalescing: 50 identical concurrent requests -> {sent} sent, "
+          f"{client.stats['coalesced']} coalesced: {'OK' if ok else 'FAILED'}")
+    return ok
+
+
+async def check_priority(url: str) -> bool:
+    rng = np.random.default_rng(3)
+    priorities = rng.permutation(30).astype(float)
+    started = []
+
+    async with aiohttp.ClientSession() as session:
+        client = MarketDataClient(session, url, connections=1, weight_limit=0)
+
+        async def fetch(k: int, priority: float):
+            await client.klines(klines(f"MOCK{k}USDT"), priority=priority)
+            started.append(priority)
+
+        # The first takes the only connection; the rest queue behind it
+        await asyncio.gather(*(fetch(k, priority) for k, priority in enumerate(priorities)))
+
+    ok = started[1:] == sorted(started[1:])
+    print(f"Priority: {len(priorities) - 1} queued requests served in priority order: {'OK' if ok else 'FAILED'}")
+    return ok
+
+
+async def throttled_run(url: str, exchange: MockExchange, count: int, weight_limit: int, window: float) -> tuple:
+    """(seconds, 429 responses, failed requests, max weight the exchange saw in a window)"""
+    exchange.stats['throttled'] = 0
+    exchange.stats['max_window_weight'] = 0
+    await asyncio.sleep((int(time.time() // window) + 1) * window - time.time())  # Start on a fresh window
+
+    async with aiohttp.ClientSession() as session:
+        client = MarketDataClient(session, url, connections=10, weight_limit=weight_limit, weight_window=window)
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(client.klines(klines(f"MOCK{k}USDT")) for k in range(count)), return_exceptions=True
+        )
+        elapsed = time.perf_counter() - start
+
+    failed = sum(isinstance(result, BaseException) for result in results)
+    return elapsed, exchange.stats['throttled'], failed, exchange.stats['max_window_weight']
+
+
+async def run(args) -> bool:
+    exchange = MockExchange(weight_limit=args.weight_limit, window=args.window)
+    url = await exchange.start()
+    try:
+        ok = await check_coalescing(url, exchange)
+        ok &= await check_priority(url)
+
+        per_window = args.weight_limit // KLINES_WEIGHT
+        print(f"Throttling: {args.requests} requests, exchange limit {args.weight_limit} weight "
+              f"({per_window} requests) per {args.window:.0f}s")
+        for name, limit in (('unaware', 0), ('weight-aware', args.weight_limit)):
+            elapsed, throttled, failed, peak = await throttled_run(url, exchange, args.requests, limit, args.window)
+            print(f"  {name} client: {elapsed:.1f}s, {throttled} x 429, {failed} failed, "
+                  f"peak window weight {peak}/{args.weight_limit}")
+            ok &= failed == 0
+            if limit:
+                ok &= throttled == 0
+    finally:
+        await exchange.stop()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market data client check")
+    parser.add_argument('--requests', type=int, default=120)
+    parser.add_argument('--weight-limit', type=int, default=60)
+    parser.add_argument('--window', type=float, default=5.0)
+    args = parser.parse_args()
+
+    ok = asyncio.run(run(args))
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
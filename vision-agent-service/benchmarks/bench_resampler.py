@@ -0,0 +1,155 @@
+"""
+Multi-timeframe resampler check and timing.
+
+Feeds a live-like 1m candle sequence (ticks on the open candle, then a new
+candle) through a 100-candle CandleStore and CandleResampler into
+5m/15m/1h/4h stores, seeded once with the base history of the open
+intervals as at start-up. After every update each higher store must equal
+the direct aggregation of the whole base history so far (open candle
+included), and the open candles of all intervals must share the latest
+close. Also feeds bursts of several candles at once (a poll after a pause).
+
+Then times an update against aggregating the base candles of the open
+4h interval from scratch. Exits non-zero on any mismatch.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_resampler [--candles 3000]
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from src.market.candle_store import FIELDS, CandleStore
+from src.market.intervals import interval_start
+from src.market.resampler import CandleResampler, aggregate
+
+
+TARGETS = ('5m', '15m', '1h', '4h')
+MINUTE = 60_000
+
+
+def random_candles(rng, count: int, start_time: int) -> dict:
+    close = 100.0 + np.cumsum(rng.normal(size=count))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    return {
+        'time': start_time + np.arange(count, dtype=np.int64) * MINUTE,
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.random(count),
+        'low': np.minimum(open_, close) - rng.random(count),
+        'close': close,
+        'volume': rng.random(count) * 10.0
+    }
+
+
+def live_updates(rng, history: dict, first: int, ticks: int = 3, burst_every: int = 0):
+    """
+    (end, candles) updates after candle `first`: partial versions of the
+    open candle, then the next candle; every `burst_every` candles several
+    candles arrive at once.
+    """
+    end = first
+    total = len(history['time'])
+    while end < total:
+        step = int(rng.integers(2, 7)) if burst_every and end % burst_every == 0 else 1
+        end = min(end + step, total)
+        rows = {name: values[end - step:end].copy() for name, values in history.items()}
+        for tick in range(1, ticks + 1):
+            partial = {name: values.copy() for name, values in rows.items()}
+            if tick < ticks:
+                fraction = tick / ticks
+                open_, close = partial['open'][-1], rows['close'][-1]
+                partial['close'][-1] = open_ + (close - open_) * fraction
+                partial['high'][-1] = max(open_, partial['close'][-1])
+                partial['low'][-1] = min(open_, partial['close'][-1])
+                partial['volume'][-1] *= fraction
+            yield end, partial
+
+
+def same(name: str, actual: np.ndarray, expected: np.ndarray) -> bool:
+    """Prices exactly; volumes are sums, equal up to the order of addition."""
+    if name == 'volume':
+        return np.allclose(actual, expected, rtol=1e-12, atol=0.0)
+    return np.array_equal(actual, expected)
+
+
+def check(rng, candles: int, burst_every: int) -> int:
+    """Number of updates where a higher store differs from direct aggregation."""
+    start_time = interval_start(1_700_000_000_000, '4h') + 7 * MINUTE  # Start mid-interval
+    history = random_candles(rng, candles, start_time)
+    first = 400
+
+    base = CandleStore('TEST', '1m', 100)
+    targets = [CandleStore('TEST', interval, 100) for interval in TARGETS]
+    resampler = CandleResampler(base, targets)
+
+    # Start-up: base window, then base history from the oldest open interval
+    base.update(**{name: values[:first] for name, values in history.items()})
+    seed_from = resampler.open_interval_start(int(history['time'][first - 1]))
+    seeded = history['time'][:first] >= seed_from
+    resampler.seed({name: values[:first][seeded] for name, values in history.items()})
+    resampler.update()
+
+    mismatches = 0
+    for updates, (end, rows) in enumerate(live_updates(rng, history, first, burst_every=burst_every)):
+        base.update(**rows)
+        resampler.update()
+
+        # Expected: everything since the seed start, with the open candle as it is now
+        known = {name: np.concatenate([values[:end - len(rows['time'])], rows[name]]) for name, values in history.items()}
+        since = known['time'] >= seed_from
+        for store in targets:
+            expected = aggregate({name: values[since] for name, values in known.items()}, store.interval)
+            count = min(len(store), len(expected['time']))
+            differ = [name for name in FIELDS if not same(name, getattr(store, name)[-count:], expected[name][-count:])]
+            if differ:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"  MISMATCH {store.interval} at update {updates}: {differ}")
+        if len({float(store.close[-1]) for store in targets} | {float(base.close[-1])}) != 1:
+            mismatches += 1
+
+    print(f"Check ({'bursts' if burst_every else 'one candle per update'}): {mismatches} mismatches, "
+          f"{len(base)} base candles held, {[len(store) for store in targets]} higher candles, stats {resampler.stats}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-timeframe resampler check and timing")
+    parser.add_argument('--candles', type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    mismatches = check(rng, args.candles, 0) + check(rng, args.candles, 37)
+
+    # Timing: 12 ticks per 1m candle into all four targets, base store merge excluded
+    history = random_candles(rng, 2000, interval_start(1_700_000_000_000, '4h'))
+    base = CandleStore('TEST', '1m', 100)
+    resampler = CandleResampler(base, [CandleStore('TEST', interval, 100) for interval in TARGETS])
+    elapsed = 0.0
+    updates = 0
+    for _, rows in live_updates(rng, history, 1, ticks=12):
+        base.update(**rows)
+        start = time.perf_counter()
+        resampler.update()
+        elapsed += time.perf_counter() - start
+        updates += 1
+    incremental_us = elapsed / updates * 1e6
+
+    # From scratch: aggregate the base candles of the open 4h interval for each target
+    window = {name: values[:240] for name, values in history.items()}
+    start = time.perf_counter()
+    for _ in range(1000):
+        for interval in TARGETS:
+            aggregate(window, interval)
+    scratch_us = (time.perf_counter() - start) / 1000 * 1e6
+
+    print(f"Update of 4 targets: {incremental_us:.0f} us incremental, "
+          f"{scratch_us:.0f} us aggregating the open 4h interval's 240 base candles from scratch "
+          f"(which the base window of 100 candles does not even hold)")
+    print("OK" if mismatches == 0 else "FAILED")
+    sys.exit(0 if mismatches == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
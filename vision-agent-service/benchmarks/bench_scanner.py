@@ -0,0 +1,235 @@
+"""
+Multi-stream scanner load test against the local mock exchange.
+
+Runs MarketScanner over N mock symbols on 1s candles (every stream closes
+a candle every second, 60x the load of 1m candles) in one process, with the
+real chart renderer, FrameBuffers and model, and reports per-stream lag
+(scheduled poll -> decision), candle close -> decision lag, request rate
+and decision throughput.
+
+Streams poll just after each candle close (`--trigger update`: every
+`--poll` seconds, staggered, analysing any change). Passes when every poll
+of every stream was made on time without errors and no stream was starved
+(each decided at least every 5s, coalescing older closes when processing
+falls behind). The throughput line shows how many
+streams one process keeps real-time on 1m candles.
+
+The exchange runs in a separate process, so it does not compete with the
+scanner for the GIL. The default `--extractor chart` computes a small vector from the rendered
+chart instead of running MediaPipe/OCR, so the numbers measure the scanner
+itself (I/O, scheduling, rendering, batching); `--extractor full` uses the
+real FeatureExtractor when its dependencies are installed. `--features
+candles` skips the chart: NumericFeatureExtractor and a candle model.
+`--intervals 1s,1m` adds higher intervals per symbol, built from the 1s
+candles by the resampler (only the 1s streams poll) unless
+`--no-resample`; starvation is judged on the finest interval.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_scanner [--streams 200] [--seconds 45] [--broker] [--features candles]
+                                       [--intervals 1s,1m] [--no-resample]
+"""
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import threading
+import time
+import types
+import numpy as np
+
+from src.config import config
+from src.agent.model_inference import ModelInference
+from src.agent.inference_broker import InferenceBroker
+from src.agent.numeric_features import NumericFeatureExtractor
+from src.market import MarketScanner
+from src.market.intervals import interval_ms
+
+
+class ChartExtractor:
+    """Cheap stand-in for FeatureExtractor: column means of the chart."""
+
+    def __init__(self):
+        self.prev = None
+
+    def extract_features(self, frame: np.ndarray, frame_idx: int) -> dict:
+        profile = frame[:, ::16, 1].mean(axis=0) / 255.0
+        vector = np.zeros(config.FEATURE_DIM, dtype=np.float32)
+        vector[:min(len(profile), config.FEATURE_DIM)] = profile[:config.FEATURE_DIM]
+        self.prev = profile
+        return {'vector': vector}
+
+    def get_state(self):
+        return {'prev': self.prev}
+
+    def set_state(self, state):
+        self.prev = state['prev'] if state else None
+
+
+def build_agent(extractor: str, broker: bool, features: str = 'chart'):
+    """The parts of VisionTradingAgent the scanner uses, without Supabase."""
+    if extractor == 'full':
+        from src.agent.feature_extractor import FeatureExtractor
+        feature_extractor = FeatureExtractor()
+    else:
+        feature_extractor = ChartExtractor()
+
+    model = ModelInference()
+    candle_model = ModelInference(version=config.CANDLE_MODEL_VERSION) if features == 'candles' else None
+    agent = types.SimpleNamespace(
+        feature_extractor=feature_extractor,
+        model=model,
+        broker=InferenceBroker(model) if broker else None,
+        candle_features=NumericFeatureExtractor(),
+        candle_model=candle_model,
+        candle_broker=InferenceBroker(candle_model) if broker and candle_model is not None else None,
+        stats={'frames_processed': 0},
+        signals=0
+    )
+
+    def predict_frame(frame_buffer, stream_id=None, windowed=False):
+        if agent.broker is not None:
+            return model.to_action(agent.broker.predict_proba(frame_buffer.get_sequence(), stream_id))
+        return model.predict(frame_buffer.get_sequence())
+
+    def predict_candles(window, frame_idx, stream_id=None):
+        if agent.candle_broker is not None:
+            return candle_model.to_action(agent.candle_broker.predict_proba(window, stream_id))
+        return candle_model.predict(window)
+
+    signal_lock = threading.Lock()  # Called from the scanner's workers, like the real agent's
+
+    def handle_signal(**kwargs):
+        with signal_lock:
+            agent.signals += 1
+
+    agent.predict_frame = predict_frame
+    agent.predict_candles = predict_candles
+    agent._handle_signal = handle_signal
+    agent._build_features_summary = lambda features: {}
+    return agent
+
+
+def start_exchange() -> tuple:
+    """Run benchmarks.mock_exchange in a subprocess; returns (process, base URL)."""
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.mock_exchange', '--port', str(port)],
+        stdout=subprocess.DEVNULL
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError("Mock exchange did not start")
+
+
+async def run(args, url: str) -> bool:
+    agent = build_agent(args.extractor, args.broker, args.features)
+    config.SCANNER_REPORT_SECONDS = 0
+    config.MARKET_WEIGHT_PER_MINUTE = 0  # Polls every second are far over Binance's budget; the mock does not limit
+    intervals = [interval.strip() for interval in args.intervals.split(',') if interval.strip()]
+    finest = min(intervals, key=interval_ms)
+    scanner = MarketScanner(
+        agent,
+        streams=[(f"MOCK{i}USDT", interval) for i in range(args.streams) for interval in intervals],
+        limit=100,
+        poll_seconds=args.poll,
+        workers=args.workers,
+        connections=args.connections,
+        feed=args.feed,
+        trigger=args.trigger,
+        features=args.features,
+        resample=not args.no_resample,
+        rest_url=url,
+        ws_url=url.replace('http', 'ws', 1)
+    )
+
+    print(
+        f"{args.streams} symbols x {','.join(intervals)} ({len(scanner.feeds)} fed, "
+        f"{len(scanner.streams) - len(scanner.feeds)} resampled), feed={args.feed}, trigger={args.trigger}, {args.workers} workers, "
+        f"{args.connections} connections, broker={args.broker}, "
+        f"features={args.features}{'' if args.features == 'candles' else f', extractor={args.extractor}'}"
+    )
+    task = asyncio.ensure_future(scanner.run(register=False))
+    start = time.perf_counter()
+    await asyncio.sleep(args.seconds)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    rows = scanner.report()
+    lags = np.array([row['lag_p50_ms'] for row in rows if row['lag_p50_ms'] is not None])
+    max_lags = np.array([row['lag_max_ms'] for row in rows if row['lag_max_ms'] is not None])
+    close_lags = np.array([row['close_lag_ms'] for row in rows if row['close_lag_ms'] is not None])
+    processed = np.array([row['processed'] for row in rows])
+    errors = sum(row['errors'] for row in rows)
+    polls = sum(row['polls'] for row in rows)
+
+    missed = sum(row['missed_polls'] for row in rows)
+    # Starved: a finest-interval stream with fewer decisions than one per 5s after the first poll
+    finest_processed = np.array([row['processed'] for row in rows if row['stream'].endswith(f"@{finest}")])
+    starved = int((finest_processed < (args.seconds - args.poll) / 5.0).sum())
+    rate = processed.sum() / elapsed
+
+    print(f"Processed {processed.sum()} windows in {elapsed:.1f}s ({rate:.0f}/s, "
+          f"real-time for ~{rate * 60:.0f} streams on 1m candles), "
+          f"{polls / elapsed:.0f} polls/s, {errors} errors, "
+          f"{sum(row['coalesced'] for row in rows)} coalesced, {missed} missed polls")
+    if len(lags):
+        print(f"Per-stream lag (poll -> decision): p50 {np.percentile(lags, 50):.0f} ms, "
+              f"p99 {np.percentile(lags, 99):.0f} ms, max {max_lags.max():.0f} ms")
+    if len(close_lags):
+        print(f"Candle close -> decision: p50 {np.percentile(close_lags, 50):.0f} ms, "
+              f"p99 {np.percentile(close_lags, 99):.0f} ms")
+    print(f"Decisions per stream: min {processed.min()}, max {processed.max()}; starved streams: {starved}")
+    print("Worst streams:")
+    for row in rows[:3]:
+        print(f"  {row['stream']}: lag p50 {row['lag_p50_ms'] or 0:.0f} ms, processed {row['processed']}, errors {row['errors']}")
+
+    for broker in (agent.broker, agent.candle_broker):
+        if broker is not None:
+            broker.stop()
+
+    return errors == 0 and missed == 0 and starved == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Market scanner load test")
+    parser.add_argument('--streams', type=int, default=200)
+    parser.add_argument('--seconds', type=float, default=45.0)
+    parser.add_argument('--poll', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=config.SCANNER_WORKERS)
+    parser.add_argument('--connections', type=int, default=config.SCANNER_HTTP_CONNECTIONS)
+    parser.add_argument('--feed', choices=['poll', 'stream'], default='poll')
+    parser.add_argument('--trigger', choices=['close', 'update'], default='close',
+                        help='Poll after each candle close, or every --poll seconds')
+    parser.add_argument('--extractor', choices=['chart', 'full'], default='chart')
+    parser.add_argument('--features', choices=['chart', 'candles'], default='chart',
+                        help='Rendered chart + extractor, or numeric candle features')
+    parser.add_argument('--broker', action='store_true', help='Batch predictions across streams')
+    parser.add_argument('--intervals', default='1s', help='Comma-separated intervals per symbol')
+    parser.add_argument('--no-resample', action='store_true', help='Fetch every interval instead of resampling')
+    args = parser.parse_args()
+
+    config.FAST_INFERENCE = True
+    process, url = start_exchange()
+    try:
+        ok = asyncio.run(run(args, url))
+    finally:
+        process.terminate()
+        process.wait()
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
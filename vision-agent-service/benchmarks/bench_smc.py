@@ -0,0 +1,297 @@
+"""
+SMC analytics check and timing over a million candles.
+
+Compares the vectorized detections in src/market/smc.py against a
+candle-by-candle port of the dashboard's analyze-multi-timeframe functions
+(kept below as the reference) on random windows and on a long history, and
+SMCEngine's incremental analysis against the full analysis of the same
+window on a live-like sequence (ticks on the open candle, then a new candle
+pushing the oldest out). Every result must be identical.
+
+Then times swing/FVG detection, the full analysis and the per-candle SMC
+feature columns over --candles candles against the reference (run on
+--reference-candles and scaled), and the incremental update against
+re-analysing the window on each update. Exits non-zero on any mismatch.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_smc [--candles 1000000] [--reference-candles 100000]
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from src.market.smc import (
+    SMCEngine, analyze, detect_swing_points, fvg_arrays, smc_feature_columns,
+    FVG_LIMIT, ORDER_BLOCK_LIMIT, ORDER_BLOCK_LOOKBACK, ORDER_BLOCK_SIZE_PERIOD
+)
+
+
+# Reference: the dashboard's functions, one candle at a time
+
+
+def reference_swings(high, low, left_bars=5, right_bars=5):
+    swings = []
+    for i in range(left_bars, len(high) - right_bars):
+        is_high = is_low = True
+        for j in range(i - left_bars, i + right_bars + 1):
+            if j == i:
+                continue
+            if high[j] >= high[i]:
+                is_high = False
+            if low[j] <= low[i]:
+                is_low = False
+        if is_high:
+            swings.append((i, high[i], 'high'))
+        if is_low:
+            swings.append((i, low[i], 'low'))
+    return swings
+
+
+def reference_structure(times, swings):
+    highs = sorted([s for s in swings if s[2] == 'high'], key=lambda s: s[0])
+    lows = sorted([s for s in swings if s[2] == 'low'], key=lambda s: s[0])
+    result = {'trend': 'NEUTRO', 'last_bos': None, 'last_choch': None, 'confidence': 30, 'bos_count': 0, 'choch_count': 0}
+    if len(highs) < 2 or len(lows) < 2:
+        return result
+
+    recent_highs, recent_lows = highs[-3:], lows[-3:]
+    higher_highs = all(recent_highs[i][1] > recent_highs[i - 1][1] for i in range(1, len(recent_highs)))
+    higher_lows = all(recent_lows[i][1] > recent_lows[i - 1][1] for i in range(1, len(recent_lows)))
+    lower_highs = all(recent_highs[i][1] < recent_highs[i - 1][1] for i in range(1, len(recent_highs)))
+    lower_lows = all(recent_lows[i][1] < recent_lows[i - 1][1] for i in range(1, len(recent_lows)))
+    last_high, prev_high = recent_highs[-1], recent_highs[-2]
+    last_low, prev_low = recent_lows[-1], recent_lows[-2]
+
+    if higher_highs and higher_lows:
+        result['trend'] = 'ALTA'
+        if last_high[1] > prev_high[1]:
+            result['last_bos'] = int(times[last_high[0]])
+            result['bos_count'] += 1
+        if last_low[1] < prev_low[1]:
+            result['last_choch'] = int(times[last_low[0]])
+            result['choch_count'] += 1
+    elif lower_highs and lower_lows:
+        result['trend'] = 'BAIXA'
+        if last_low[1] < prev_low[1]:
+            result['last_bos'] = int(times[last_low[0]])
+            result['bos_count'] += 1
+        if last_high[1] > prev_high[1]:
+            result['last_choch'] = int(times[last_high[0]])
+            result['choch_count'] += 1
+
+    if result['trend'] != 'NEUTRO':
+        confidence = 60 + (20 if result['last_bos'] else 0) + (10 if result['bos_count'] > 1 else 0)
+        result['confidence'] = min(confidence, 95)
+    return result
+
+
+def reference_premium_discount(close, swings):
+    price = float(close[-1])
+    highs = [s[1] for s in swings if s[2] == 'high'][-3:]
+    lows = [s[1] for s in swings if s[2] == 'low'][-3:]
+    if not highs or not lows:
+        return {'current_price': price, 'range_high': price, 'range_low': price, 'range_percentage': 50.0, 'status': 'EQUILIBRIUM'}
+
+    range_high, range_low = float(max(highs)), float(min(lows))
+    size = range_high - range_low
+    percentage = (price - range_low) / size * 100.0 if size > 0 else 50.0
+    status = 'PREMIUM' if percentage >= 60 else 'DISCOUNT' if percentage <= 40 else 'EQUILIBRIUM'
+    return {'current_price': price, 'range_high': range_high, 'range_low': range_low,
+            'range_percentage': max(0.0, min(100.0, percentage)), 'status': status}
+
+
+def reference_fvg(high, low, close):
+    gaps = []
+    price = close[-1]
+    for i in range(1, len(close) - 1):
+        if high[i - 1] < low[i + 1]:
+            bottom, top = high[i - 1], low[i + 1]
+            if not bottom <= price <= top:
+                gaps.append({'index': i, 'type': 'bullish', 'top': float(top), 'bottom': float(bottom),
+                             'midpoint': float((top + bottom) / 2), 'size': float(top - bottom), 'is_filled': False})
+        if low[i - 1] > high[i + 1]:
+            bottom, top = high[i + 1], low[i - 1]
+            if not bottom <= price <= top:
+                gaps.append({'index': i, 'type': 'bearish', 'top': float(top), 'bottom': float(bottom),
+                             'midpoint': float((top + bottom) / 2), 'size': float(top - bottom), 'is_filled': False})
+    return gaps[-FVG_LIMIT:]
+
+
+def reference_order_blocks(candles, swings, bos_indexes):
+    open_, high, low, close, volume = (candles[name] for name in ('open', 'high', 'low', 'close', 'volume'))
+    blocks = []
+    for bos in bos_indexes:
+        swing = next(s for s in swings if s[0] == bos and s[2] == bos_indexes[bos])
+        for i in range(bos - 1, max(0, bos - ORDER_BLOCK_LOOKBACK) - 1, -1):
+            bearish_needed = swing[2] == 'high'
+            if (close[i] < open_[i]) if bearish_needed else (close[i] > open_[i]):
+                size = abs(high[i] - low[i])
+                history = [abs(high[j] - low[j]) for j in range(max(0, i - ORDER_BLOCK_SIZE_PERIOD), i)]
+                size_score = size / (sum(history) / min(ORDER_BLOCK_SIZE_PERIOD, i)) * 50 if i else 0.0
+                strength = min(100.0, size_score + min(50.0, volume[i] / 1_000_000 * 10))
+                kind = 'bullish' if bearish_needed else 'bearish'
+                blocks.append({
+                    'index': i, 'type': kind, 'top': float(high[i]), 'bottom': float(low[i]),
+                    'midpoint': float((high[i] + low[i]) / 2), 'volume': float(volume[i]), 'strength': float(strength),
+                    'confirmed': bool(close[-1] > high[i] if kind == 'bullish' else close[-1] < low[i])
+                })
+                break
+    return sorted(blocks, key=lambda block: -block['strength'])[:ORDER_BLOCK_LIMIT]
+
+
+def reference_analyze(candles):
+    swings = reference_swings(candles['high'], candles['low'])
+    structure = reference_structure(candles['time'], swings)
+    side = {'ALTA': 'high', 'BAIXA': 'low'}.get(structure['trend'])
+    bos_indexes = {s[0]: s[2] for s in swings if s[2] == side}
+    return {
+        'swing_highs': np.array([s[0] for s in swings if s[2] == 'high'], dtype=np.int64),
+        'swing_lows': np.array([s[0] for s in swings if s[2] == 'low'], dtype=np.int64),
+        'structure': structure,
+        'premium_discount': reference_premium_discount(candles['close'], swings),
+        'fvgs': reference_fvg(candles['high'], candles['low'], candles['close']),
+        'order_blocks': reference_order_blocks(candles, swings, bos_indexes)
+    }
+
+
+# Data
+
+
+def random_candles(rng, count: int, start_time: int = 0) -> dict:
+    """Random walk with volatility regimes, so trends, gaps and flat stretches all occur."""
+    volatility = np.repeat(rng.uniform(0.2, 2.0, count // 500 + 1), 500)[:count]
+    close = 100.0 + np.cumsum(rng.normal(size=count) * volatility)
+    open_ = close + rng.normal(size=count) * volatility * 0.5
+    high = np.maximum(open_, close) + rng.random(count) * volatility
+    low = np.minimum(open_, close) - rng.random(count) * volatility
+    return {
+        'time': start_time + np.arange(count, dtype=np.int64) * 60_000,
+        'open': open_,
+        'high': np.round(high, 2),  # Ties make the strict swing comparisons matter
+        'low': np.round(low, 2),
+        'close': close,
+        'volume': rng.lognormal(13, 1, count)
+    }
+
+
+def live_windows(candles: dict, window: int, ticks: int = 3):
+    """Windows as a live scanner sees them: ticks on the open candle, then a new candle."""
+    for end in range(1, len(candles['time']) + 1):
+        start = max(0, end - window)
+        final = {name: values[start:end] for name, values in candles.items()}
+        for tick in range(1, ticks + 1):
+            if tick == ticks:
+                yield final
+                continue
+            # The open candle so far: part of the way from its open to its close
+            partial = {name: values.copy() for name, values in final.items()}
+            open_, close = partial['open'][-1], final['close'][-1]
+            partial['close'][-1] = open_ + (close - open_) * tick / ticks
+            partial['high'][-1] = min(final['high'][-1], max(open_, partial['close'][-1]) + 0.1)
+            partial['low'][-1] = max(final['low'][-1], min(open_, partial['close'][-1]) - 0.1)
+            partial['volume'][-1] *= tick / ticks
+            yield partial
+
+
+# Checks
+
+
+def same(expected: dict, actual: dict) -> bool:
+    for key, value in expected.items():
+        if isinstance(value, np.ndarray):
+            if not np.array_equal(value, actual[key]):
+                return False
+        elif value != actual[key]:
+            return False
+    return True
+
+
+def check(rng, reference_candles: int, stream_candles: int) -> int:
+    """Number of results that differ."""
+    mismatches = 0
+
+    def compare(label, expected, actual):
+        nonlocal mismatches
+        if not same(expected, actual):
+            mismatches += 1
+            if mismatches <= 5:
+                keys = [key for key in expected if not same({key: expected[key]}, actual)]
+                print(f"  MISMATCH {label}: {keys}")
+
+    # Batch analysis against the reference: windows of live sizes, then one long history
+    for count in [0, 1, 5, 11, 12, 30, 100, 200, 1000]:
+        for _ in range(20 if count < 1000 else 3):
+            candles = random_candles(rng, count)
+            if count:
+                compare(f"{count} candles", reference_analyze(candles), analyze(candles))
+
+    long_history = random_candles(rng, reference_candles)
+    compare(f"{reference_candles} candles", reference_analyze(long_history), analyze(long_history))
+
+    # Incremental engine against the full analysis of each window
+    engine = SMCEngine()
+    updates = 0
+    for window in live_windows(random_candles(rng, stream_candles), 200):
+        compare(f"live update {updates}", analyze(window), engine.update(window))
+        updates += 1
+
+    print(f"Check: {mismatches} mismatches ({updates} incremental updates, {engine.stats['rebuilds']} rebuilds)")
+    return mismatches
+
+
+def timed(function, *args, repeat: int = 3) -> float:
+    """Best of `repeat` runs, seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMC analytics check and timing")
+    parser.add_argument('--candles', type=int, default=1_000_000)
+    parser.add_argument('--reference-candles', type=int, default=100_000)
+    parser.add_argument('--stream-candles', type=int, default=3_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    mismatches = check(rng, args.reference_candles, args.stream_candles)
+
+    candles = random_candles(rng, args.candles)
+    high, low, close = candles['high'], candles['low'], candles['close']
+    atr = np.full(args.candles, 1.0)
+    swings = detect_swing_points(high, low)
+    print(f"{args.candles} candles: {int(swings[0].sum())} swing highs, {int(swings[1].sum())} swing lows, "
+          f"{len(fvg_arrays(high, low)[0])} gaps")
+
+    sample = {name: values[:args.reference_candles] for name, values in candles.items()}
+    scale = args.candles / args.reference_candles
+    reference_s = timed(reference_analyze, sample, repeat=1) * scale
+    rows = [
+        ('detect_swing_points', timed(detect_swing_points, high, low)),
+        ('fvg_arrays', timed(fvg_arrays, high, low)),
+        ('analyze (all detections)', timed(analyze, candles)),
+        ('smc_feature_columns', timed(smc_feature_columns, candles['open'], high, low, close, atr))
+    ]
+    print(f"  reference (per candle)      {reference_s:8.3f} s (scaled from {args.reference_candles})")
+    for label, seconds in rows:
+        print(f"  {label:<27} {seconds:8.3f} s ({seconds / args.candles * 1e9:.0f} ns/candle)")
+    print(f"  analyze speed-up: {reference_s / rows[2][1]:.0f}x")
+
+    # Live: 200-candle window, 3 updates per candle
+    windows = list(live_windows(random_candles(rng, 2_000), 200))
+    engine = SMCEngine()
+    full_ms = timed(lambda: [analyze(window) for window in windows], repeat=1) / len(windows) * 1000.0
+    incremental_ms = timed(lambda: [engine.update(window) for window in windows], repeat=1) / len(windows) * 1000.0
+    print(f"Live window (200 candles, {len(windows)} updates): analyze {full_ms:.3f} ms/update, "
+          f"SMCEngine.update {incremental_ms:.3f} ms/update ({full_ms / incremental_ms:.1f}x)")
+
+    print("OK" if mismatches == 0 else "FAILED")
+    sys.exit(0 if mismatches == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Startup-time budget for the CLI and each agent mode.
+
+Runs each scenario in a fresh interpreter, reports the median wall time and
+the slowest imports (python -X importtime), and exits non-zero when a
+scenario exceeds its budget.
+
+Mode scenarios run the real entry point (`python -m src.main --mode ...`)
+in daemon mode with an empty stdin: the agent starts up, finds no input
+and exits. Supabase points at a closed local port, so nothing is sent.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_startup [--runs 3] [--budget cli=0.5 ...]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# (description, interpreter arguments, budget in seconds)
+SCENARIOS = {
+    'cli': (
+        "python -m src.main --help",
+        ['-m', 'src.main', '--help'],
+        1.0
+    ),
+    'shadow': (
+        "python -m src.main --mode SHADOW: agent startup (components, model)",
+        ['-m', 'src.main', '--mode', 'SHADOW'],
+        15.0
+    ),
+    'live': (
+        "live scanner polling path (requests, OpenCV)",
+        ['-c', "import src.main as m; m.requests.Session; m.cv2.line"],
+        2.5
+    ),
+    'video': (
+        "video download + feature extraction (yt-dlp, OpenCV, MediaPipe)",
+        ['-c', "from src.agent import video_processor as v, feature_extractor as f; v.yt_dlp.YoutubeDL; f.mp.solutions"],
+        6.0
+    ),
+    'inference': (
+        "Keras inference (TensorFlow)",
+        ['-c', "from src.agent import model_inference as m; m.keras.Model"],
+        10.0
+    ),
+}
+
+# Side effects of starting a mode: no Supabase project, no model directory watcher
+ENV = dict(
+    os.environ,
+    SUPABASE_URL='http://127.0.0.1:9',
+    SUPABASE_SERVICE_ROLE_KEY='bench',
+    MODEL_WATCH_INTERVAL='0'
+)
+
+
+def run(args: list) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable] + args, check=True, env=ENV, text=True,
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    return time.perf_counter() - start
+
+
+def slowest_imports(args: list, top: int = 5) -> list:
+    """Top-level imports with the largest cumulative time."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args, env=ENV,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Top-level imports only (no indentation)
+        if not name.startswith('  '):
+            imports.append((int(cumulative) / 1e6, name.strip()))
+    return sorted(imports, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup-time budget")
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--budget', nargs='*', default=[], help="Override budgets, e.g. cli=0.5")
+    parser.add_argument('--only', nargs='*', default=None, help="Scenarios to run")
+    args = parser.parse_args()
+
+    budgets = {name: scenario[2] for name, scenario in SCENARIOS.items()}
+    for item in args.budget:
+        name, seconds = item.split('=')
+        budgets[name] = float(seconds)
+
+    baseline = statistics.median(run(['-c', 'pass']) for _ in range(args.runs))
+    print(f"Interpreter baseline: {baseline:.3f}s\n")
+
+    failed = []
+    for name, (description, scenario_args, _) in SCENARIOS.items():
+        if args.only and name not in args.only:
+            continue
+
+        try:
+            seconds = statistics.median(run(scenario_args) for _ in range(args.runs))
+        except subprocess.CalledProcessError as e:
+            output = e.stdout.strip().splitlines()
+            print(f"{name:10s} FAILED to run ({description}): {output[-1] if output else f'exit {e.returncode}'}")
+            failed.append(name)
+            continue
+
+        status = 'ok' if seconds <= budgets[name] else 'OVER BUDGET'
+        print(f"{name:10s} {seconds:7.3f}s / {budgets[name]:5.1f}s  {status:12s} {description}")
+        for cumulative, module in slowest_imports(scenario_args):
+            print(f"{'':12s}{cumulative:7.3f}s  {module}")
+
+        if seconds > budgets[name]:
+            failed.append(name)
+
+    if failed:
+        print(f"\nBudget exceeded: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Streaming vs windowed inference: per-frame latency and output drift.
+
+Feeds the same frames through the windowed fast path and the stateful
+single-step path (StreamingLSTM) and reports the deviation between them.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.bench_streaming [--frames 600] [--resync 30]
+"""
+import argparse
+import time
+import numpy as np
+
+from src.config import config
+from src.agent.model_inference import ModelInference
+from src.agent.streaming_inference import StreamingLSTM
+from src.agent.video_processor import FrameBuffer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming inference benchmark")
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--resync', type=int, default=config.STREAM_RESYNC_INTERVAL)
+    args = parser.parse_args()
+
+    config.FAST_INFERENCE = True
+    config.STREAMING_INFERENCE = False
+    inference = ModelInference()
+    streaming = StreamingLSTM(inference.model, resync_interval=args.resync)
+
+    # Smoothly varying features, closer to video than white noise
+    steps = np.random.randn(args.frames, config.FEATURE_DIM).astype(np.float32) * 0.1
+    vectors = np.clip(0.5 + np.cumsum(steps, axis=0) * 0.1, 0.0, 1.0)
+
+    buffer = FrameBuffer()
+    deviations, agreements, window_times, stream_times = [], [], [], []
+
+    for i, vector in enumerate(vectors):
+        buffer.add({'frame_idx': i, 'features': vector})
+        if not buffer.is_ready():
+            continue
+
+        start = time.perf_counter()
+        windowed = inference._predict_window(buffer.get_sequence())
+        window_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        streamed = streaming.update(buffer)
+        stream_times.append(time.perf_counter() - start)
+
+        deviations.append(float(np.max(np.abs(windowed - streamed))))
+        agreements.append(np.argmax(windowed) == np.argmax(streamed))
+
+    deviations = np.array(deviations)
+    print(f"Frames: {len(deviations)}, re-sync every {args.resync} frames")
+    print(f"windowed:  p50 {np.median(window_times) * 1000:7.3f} ms/frame")
+    print(f"streaming: p50 {np.median(stream_times) * 1000:7.3f} ms/frame, "
+          f"mean {np.mean(stream_times) * 1000:7.3f} ms/frame (incl. re-syncs)")
+    print(f"|dp| max {deviations.max():.5f} | p99 {np.percentile(deviations, 99):.5f} | "
+          f"mean {deviations.mean():.5f}")
+    print(f"argmax agreement: {100.0 * np.mean(agreements):.1f}%")
+
+
+if __name__ == '__main__':
+    main()
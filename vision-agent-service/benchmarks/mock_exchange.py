@@ -0,0 +1,252 @@
+"""
+Local stand-in for the Binance market data endpoints used by the scanner.
+
+Serves deterministic synthetic candles in real time:
+
+    GET /api/v3/klines?symbol=&interval=&limit=&startTime=   (REST rows)
+    WS  /ws  {"method": "SUBSCRIBE", "params": ["btcusdt@kline_1s"], "id": 1}
+
+Kline events are pushed every `update_ms` and exactly at each candle close
+(with "x": true). Candle values depend only on symbol and time, so REST and
+WebSocket always agree and a client's window can be checked against
+`MockExchange.candle`. Faults for exercising clients: `drop_connections()`
+closes every WebSocket, `pause(seconds)` stops pushing events (the client
+sees a gap when they resume).
+
+With `weight_limit` the REST endpoint throttles like Binance: each klines
+request weighs KLINES_WEIGHT, the weight used in the current clock-aligned
+window is returned in X-MBX-USED-WEIGHT-1M, and requests over the limit get
+429 with a Retry-After until the window rolls over.
+
+Usage (from vision-agent-service/):
+    python -m benchmarks.mock_exchange [--port 8765] [--update-ms 100] [--weight-limit 0] [--window 60]
+
+then point the agent at it with BINANCE_REST_URL=http://127.0.0.1:8765 and
+BINANCE_WS_URL=ws://127.0.0.1:8765.
+"""
+import argparse
+import asyncio
+import math
+import time
+import zlib
+from typing import Dict, List, Optional
+
+from aiohttp import web, WSMsgType
+
+from src.market.intervals import interval_ms
+
+KLINES_WEIGHT = 2
+
+class MockExchange:
+    """In-process mock exchange (aiohttp server)."""
+
+    def __init__(self, update_ms: float = 100.0, weight_limit: int = 0, window: float = 60.0):
+        self.update_ms = update_ms
+        self.weight_limit = weight_limit  # REST weight per window (0 = unlimited)
+        self.window = window
+        self.stats = {'rest_requests': 0, 'ws_connections': 0, 'events': 0, 'throttled': 0, 'max_window_weight': 0}
+
+        self._window_id = None
+        self._window_weight = 0
+
+        self._paused_until = 0.0
+        self._sockets: List[web.WebSocketResponse] = []
+        self._runner: Optional[web.AppRunner] = None
+
+        self.app = web.Application()
+        self.app.router.add_get('/api/v3/klines', self._klines)
+        self.app.router.add_get('/ws', self._websocket)
+
+    # Synthetic data
+
+    @staticmethod
+    def _price(symbol: str, t_ms: int) -> float:
+        phase = zlib.crc32(symbol.encode()) % 1000
+        return 100.0 + 5.0 * math.sin((t_ms + phase * 997) / 7e5) + 2.0 * math.sin((t_ms + phase) / 1.3e4)
+
+    def candle(self, symbol: str, interval: str, open_time: int, now_ms: int = None) -> Dict:
+        """Candle opening at `open_time` as of `now_ms` (closed once now >= close time)."""
+        now_ms = self._now_ms() if now_ms is None else now_ms
+        length = interval_ms(interval)
+        until = min(now_ms, open_time + length)
+
+        open_ = self._price(symbol, open_time)
+        close = self._price(symbol, until)
+        progress = max(until - open_time, 0) / length
+        return {
+            'time': open_time,
+            'open': round(open_, 4),
+            'high': round(max(open_, close) + 0.05 * progress, 4),
+            'low': round(min(open_, close) - 0.05 * progress, 4),
+            'close': round(close, 4),
+            'volume': round(1000.0 * progress, 4),
+            'closed': now_ms >= open_time + length
+        }
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    # Faults
+
+    def pause(self, seconds: float):
+        """Push no kline events for `seconds`."""
+        self._paused_until = time.monotonic() + seconds
+
+    async def drop_connections(self):
+        """Close every open WebSocket."""
+        for ws in list(self._sockets):
+            await ws.close()
+
+    # Handlers
+
+    def _charge(self, weight: int) -> Optional[web.Response]:
+        """Account a request's weight; the 429 response when it is over the limit."""
+        window_id = int(time.time() // self.window)
+        if window_id != self._window_id:
+            self._window_id, self._window_weight = window_id, 0
+        if self.weight_limit and self._window_weight + weight > self.weight_limit:
+            self.stats['throttled'] += 1
+            retry_after = math.ceil((window_id + 1) * self.window - time.time())
+            return web.json_response(
+                {'code': -1003, 'msg': 'Too much request weight used'}, status=429,
+                headers={'Retry-After': str(retry_after), 'X-MBX-USED-WEIGHT-1M': str(self._window_weight)}
+            )
+        self._window_weight += weight
+        self.stats['max_window_weight'] = max(self.stats['max_window_weight'], self._window_weight)
+        return None
+
+    async def _klines(self, request: web.Request) -> web.Response:
+        self.stats['rest_requests'] += 1
+        throttled = self._charge(KLINES_WEIGHT)
+        if throttled is not None:
+            return throttled
+        symbol = request.query['symbol'].upper()
+        interval = request.query['interval']
+        limit = min(int(request.query.get('limit', 500)), 1000)
+        length = interval_ms(interval)
+
+        now = self._now_ms()
+        current = now // length * length
+        if 'startTime' in request.query:
+            start = -(-int(request.query['startTime']) // length) * length
+        else:
+            start = current - (limit - 1) * length
+
+        rows = []
+        for open_time in range(start, min(current, start + (limit - 1) * length) + 1, length):
+            c = self.candle(symbol, interval, open_time, now)
+            rows.append([
+                c['time'], f"{c['open']}", f"{c['high']}", f"{c['low']}", f"{c['close']}", f"{c['volume']}",
+                c['time'] + length - 1
+            ])
+        return web.json_response(rows, headers={'X-MBX-USED-WEIGHT-1M': str(self._window_weight)})
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.stats['ws_connections'] += 1
+        self._sockets.append(ws)
+
+        streams: Dict[str, Optional[int]] = {}  # stream name -> open time of the last pushed candle
+        pusher = asyncio.ensure_future(self._push(ws, streams))
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                payload = message.json()
+                if payload.get('method') == 'SUBSCRIBE':
+                    for name in payload.get('params', []):
+                        streams.setdefault(name, None)
+                    await ws.send_json({'result': None, 'id': payload.get('id')})
+        finally:
+            pusher.cancel()
+            self._sockets.remove(ws)
+        return ws
+
+    async def _push(self, ws: web.WebSocketResponse, streams: Dict[str, Optional[int]]):
+        """Push updates every update_ms and a final event at each candle close."""
+        while not ws.closed:
+            now = self._now_ms()
+            paused = time.monotonic() < self._paused_until
+            next_close = None
+
+            for name in list(streams):
+                symbol, kind = name.split('@')
+                interval = kind.split('_', 1)[1]
+                length = interval_ms(interval)
+                current = now // length * length
+                last = streams[name]
+
+                if paused:
+                    streams[name] = None  # After a pause, resume at the current candle
+                else:
+                    if last is not None and last < current:
+                        await self._send(ws, symbol, interval, last, now)  # Closes it
+                    await self._send(ws, symbol, interval, current, now)
+                    streams[name] = current
+
+                boundary = current + length
+                next_close = boundary if next_close is None else min(next_close, boundary)
+
+            delay = self.update_ms / 1000.0
+            if next_close is not None:
+                delay = min(delay, max((next_close - self._now_ms()) / 1000.0, 0.0))
+            await asyncio.sleep(delay)
+
+    async def _send(self, ws: web.WebSocketResponse, symbol: str, interval: str, open_time: int, now: int):
+        c = self.candle(symbol.upper(), interval, open_time, now)
+        await ws.send_json({
+            'e': 'kline',
+            'E': now,
+            's': symbol.upper(),
+            'k': {
+                't': c['time'], 'T': c['time'] + interval_ms(interval) - 1, 's': symbol.upper(), 'i': interval,
+                'o': f"{c['open']}", 'h': f"{c['high']}", 'l': f"{c['low']}", 'c': f"{c['close']}",
+                'v': f"{c['volume']}", 'x': c['closed']
+            }
+        })
+        self.stats['events'] += 1
+
+    # Server
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving; returns the base URL (http://host:port)."""
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        await self.drop_connections()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Binance market data server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--update-ms', type=float, default=100.0)
+    parser.add_argument('--weight-limit', type=int, default=0, help='REST weight per window (0 = unlimited)')
+    parser.add_argument('--window', type=float, default=60.0, help='Weight window in seconds')
+    args = parser.parse_args()
+
+    async def serve():
+        exchange = MockExchange(update_ms=args.update_ms, weight_limit=args.weight_limit, window=args.window)
+        url = await exchange.start(args.host, args.port)
+        print(f"Mock exchange on {url} (WebSocket {url.replace('http', 'ws', 1)}/ws)")
+        while True:
+            await asyncio.sleep(3600)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
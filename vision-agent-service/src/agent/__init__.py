@@ -1,12 +1,31 @@
-"""Agent package."""
-from .video_processor import VideoProcessor, FrameBuffer
-from .feature_extractor import FeatureExtractor
-from .model_inference import ModelInference, ModelTrainer
-
-__all__ = [
-    "VideoProcessor",
-    "FrameBuffer",
-    "FeatureExtractor",
-    "ModelInference",
-    "ModelTrainer"
-]
+"""Agent package.
+
+Submodules depend on OpenCV, MediaPipe, TensorFlow and yt-dlp, so they are
+imported on first access to the names below rather than with the package.
+"""
+import importlib
+
+_EXPORTS = {
+    "VideoProcessor": ".video_processor",
+    "FrameBuffer": ".video_processor",
+    "FeatureExtractor": ".feature_extractor",
+    "NumericFeatureExtractor": ".numeric_features",
+    "ModelInference": ".model_inference",
+    "ModelTrainer": ".model_inference",
+    "ChartRegionDetector": ".chart_region",
+    "FeatureStore": ".feature_store",
+    "CascadeGate": ".cascade_gate",
+    "InferenceBroker": ".inference_broker",
+    "PredictionLog": ".prediction_log",
+    "DatasetBuilder": ".dataset_builder"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,210 @@
+"""Cheap first-stage gate that skips the sequence model on quiet windows."""
+import time
+import numpy as np
+from pathlib import Path
+from typing import Optional
+
+from ..utils import logger
+
+
+def gate_path(model_path: Path) -> Path:
+    """
+    Path of the gate sidecar next to its Keras model.
+
+    e.g. models/model_seq_v20251125.h5 -> models/model_seq_v20251125_gate.npz
+    """
+    return model_path.with_name(f"{model_path.stem}_gate.npz")
+
+
+class CascadeGate:
+    """
+    Logistic regression over window summary statistics.
+
+    Predicts whether the sequence model could return an actionable signal
+    (ENTER/EXIT at or above CONFIDENCE_THRESHOLD) for a window. Windows
+    scoring below `threshold` are answered IGNORE without running the
+    sequence model. The threshold is picked on held-back training windows to keep
+    a target recall of actionable windows; the misses are the cost of the
+    skipped compute and are reported by `report`.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, mean: np.ndarray, scale: np.ndarray, threshold: float):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.mean = mean.astype(np.float32)
+        self.scale = scale.astype(np.float32)
+        self.threshold = float(threshold)
+
+    @staticmethod
+    def summarize(windows: np.ndarray) -> np.ndarray:
+        """
+        Summary statistics per window.
+
+        Args:
+            windows: Array of shape (n, sequence_length, feature_dim)
+
+        Returns:
+            Array of shape (n, 4 * feature_dim): mean, std, last frame and
+            last-frame change over the window
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        mean = windows.mean(axis=1)
+        return np.concatenate([
+            mean,
+            windows.std(axis=1),
+            windows[:, -1],
+            windows[:, -1] - mean
+        ], axis=1)
+
+    def score(self, windows: np.ndarray) -> np.ndarray:
+        """Probability that each window is actionable."""
+        x = (self.summarize(windows) - self.mean) / self.scale
+        return 1.0 / (1.0 + np.exp(-(x @ self.weights + self.bias)))
+
+    def passes(self, windows: np.ndarray) -> np.ndarray:
+        """Boolean mask of windows that go on to the sequence model."""
+        return self.score(windows) >= self.threshold
+
+    def passes_window(self, sequence: np.ndarray) -> bool:
+        """Whether a single (sequence_length, feature_dim) window goes on to the sequence model."""
+        return bool(self.passes(sequence.reshape((1,) + sequence.shape[-2:]))[0])
+
+    @classmethod
+    def fit(
+        cls,
+        windows: np.ndarray,
+        targets: np.ndarray,
+        target_recall: float = 0.99,
+        calibration_split: float = 0.2,
+        epochs: int = 300,
+        learning_rate: float = 0.1,
+        l2: float = 1e-3
+    ) -> 'CascadeGate':
+        """
+        Train the gate with full-batch gradient descent.
+
+        The threshold is picked on a calibration slice not used for the
+        weights; training-set scores overstate the recall on new windows.
+
+        Args:
+            windows: Training windows of shape (n, sequence_length, feature_dim)
+            targets: 1 for windows the sequence model finds actionable, else 0
+            target_recall: Fraction of actionable windows the gate must pass
+            calibration_split: Fraction of the windows held out to pick the threshold
+            epochs: Gradient steps
+            learning_rate: Step size
+            l2: Weight decay
+
+        Returns:
+            Fitted CascadeGate
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        targets = np.asarray(targets, dtype=np.float32)
+
+        order = np.random.default_rng(0).permutation(len(windows))
+        n_calibration = int(len(windows) * calibration_split)
+        calibration, train = order[:n_calibration], order[n_calibration:]
+
+        x = cls.summarize(windows[train])
+        y = targets[train]
+
+        mean = x.mean(axis=0)
+        scale = x.std(axis=0) + 1e-6
+        x = (x - mean) / scale
+
+        # Actionable windows are rare; weight classes equally
+        positives = max(float(y.sum()), 1.0)
+        negatives = max(float(len(y) - y.sum()), 1.0)
+        sample_weight = np.where(y > 0, 0.5 / positives, 0.5 / negatives).astype(np.float32)
+
+        weights = np.zeros(x.shape[1], dtype=np.float32)
+        bias = 0.0
+        for _ in range(epochs):
+            p = 1.0 / (1.0 + np.exp(-(x @ weights + bias)))
+            error = (p - y) * sample_weight
+            weights -= learning_rate * (x.T @ error + l2 * weights)
+            bias -= learning_rate * float(error.sum())
+
+        gate = cls(weights, bias, mean, scale, threshold=0.0)
+
+        if not targets[calibration].any():
+            calibration = train
+        positives = calibration[targets[calibration] > 0]
+
+        if len(positives):
+            scores = gate.score(windows[positives])
+            # Highest threshold that still passes target_recall of the positives
+            gate.threshold = float(np.quantile(scores, 1.0 - target_recall))
+
+        return gate
+
+    def report(self, windows: np.ndarray, targets: np.ndarray, model_ms: Optional[float] = None) -> dict:
+        """
+        Recall loss and compute saved on held-out windows.
+
+        Args:
+            windows: Held-out windows
+            targets: 1 for windows the sequence model finds actionable, else 0
+            model_ms: Single-window latency of the sequence model, to turn the
+                skip rate into time saved
+
+        Returns:
+            Dictionary with recall, recall_loss, pass_rate, compute_saved
+            and the per-window gate / model latencies
+        """
+        targets = np.asarray(targets).astype(bool)
+        passed = self.passes(windows)
+
+        start = time.perf_counter()
+        for i in range(min(len(windows), 100)):
+            self.passes_window(windows[i])
+        gate_ms = (time.perf_counter() - start) / max(min(len(windows), 100), 1) * 1000.0
+
+        recall = float(passed[targets].mean()) if targets.any() else 1.0
+        pass_rate = float(passed.mean()) if len(passed) else 1.0
+
+        report = {
+            'windows': int(len(windows)),
+            'actionable': int(targets.sum()),
+            'recall': recall,
+            'recall_loss': 1.0 - recall,
+            'pass_rate': pass_rate,
+            'gate_ms': gate_ms
+        }
+
+        if model_ms:
+            report['model_ms'] = model_ms
+            # Every window pays for the gate, passing windows also for the model
+            report['compute_saved'] = 1.0 - (gate_ms + pass_rate * model_ms) / model_ms
+        else:
+            report['compute_saved'] = 1.0 - pass_rate
+
+        logger.info(
+            f"Cascade gate: recall {recall:.3f} (loss {report['recall_loss']:.3f}), "
+            f"pass rate {pass_rate:.3f}, compute saved {report['compute_saved']:.1%}"
+        )
+        return report
+
+    def save(self, path: Path):
+        """Save the gate as an .npz sidecar."""
+        np.savez(
+            path,
+            weights=self.weights,
+            bias=np.float32(self.bias),
+            mean=self.mean,
+            scale=self.scale,
+            threshold=np.float32(self.threshold)
+        )
+        logger.info(f"Cascade gate saved: {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> 'CascadeGate':
+        """Load a gate saved with `save`."""
+        with np.load(path) as data:
+            return cls(
+                data['weights'],
+                float(data['bias']),
+                data['mean'],
+                data['scale'],
+                float(data['threshold'])
+            )
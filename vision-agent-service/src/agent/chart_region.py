@@ -0,0 +1,125 @@
+"""Chart region detection for fixed-layout trading videos."""
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+from ..config import config
+from ..utils import logger
+
+
+class ChartRegionDetector:
+    """
+    Finds the stable chart area of a video layout and crops frames to it.
+
+    Trading videos usually keep the chart in one fixed region while webcams,
+    logos and chat overlays sit around it. The chart is the large region with
+    dense edges (candles, grid lines, drawings) and little temporal change;
+    webcams change constantly and overlays are small.
+    """
+
+    # Width used for the analysis thumbnails
+    ANALYSIS_WIDTH = 320
+
+    def __init__(self):
+        self.roi: Optional[Tuple[int, int, int, int]] = None  # (x, y, w, h)
+        self.prev_hist = None
+
+    def detect(self, frames: List[np.ndarray]) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Detect the chart region from a sample of frames of the same layout.
+
+        Args:
+            frames: Sampled frames (BGR format from OpenCV)
+
+        Returns:
+            Region as (x, y, w, h) in frame coordinates, or None to use the full frame
+        """
+        self.roi = None
+
+        if not frames:
+            return None
+
+        height, width = frames[0].shape[:2]
+        scale = self.ANALYSIS_WIDTH / float(width)
+        size = (self.ANALYSIS_WIDTH, max(1, int(round(height * scale))))
+
+        grays = [
+            cv2.cvtColor(cv2.resize(frame, size, interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            for frame in frames
+            if frame.shape[:2] == (height, width)
+        ]
+
+        # Edge density averaged over the samples (0-1)
+        edge_density = np.mean([cv2.Canny(gray, 50, 150) > 0 for gray in grays], axis=0).astype(np.float32)
+        edge_density = cv2.blur(edge_density, (15, 15))
+
+        # Temporal change per pixel (0-1)
+        if len(grays) > 1:
+            change = np.std(np.stack(grays).astype(np.float32), axis=0) / 255.0
+            change = cv2.blur(change, (15, 15))
+        else:
+            change = np.zeros_like(edge_density)
+
+        mask = (edge_density > config.CHART_EDGE_DENSITY) & (change < config.CHART_MAX_CHANGE)
+        mask = mask.astype(np.uint8)
+        # Fill gaps between candles, then cut thin bridges to logos and overlays
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, np.ones((15, 15), np.uint8))
+
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+        if count <= 1:
+            logger.info("No stable chart region found, using full frame")
+            return None
+
+        # Largest non-background component
+        label = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+        x, y, w, h = (int(v) for v in stats[label, :4])
+
+        if (w * h) / float(mask.shape[0] * mask.shape[1]) < config.CHART_MIN_AREA:
+            logger.info("Chart region too small, using full frame")
+            return None
+
+        # Back to frame coordinates, with a small margin
+        margin = 4
+        x0 = max(0, int((x - margin) / scale))
+        y0 = max(0, int((y - margin) / scale))
+        x1 = min(width, int((x + w + margin) / scale))
+        y1 = min(height, int((y + h + margin) / scale))
+
+        self.roi = (x0, y0, x1 - x0, y1 - y0)
+        logger.info(
+            f"Chart region: {self.roi} "
+            f"({100.0 * (x1 - x0) * (y1 - y0) / (width * height):.0f}% of frame)"
+        )
+        return self.roi
+
+    def crop(self, frame: np.ndarray) -> np.ndarray:
+        """Crop a frame to the detected chart region (no copy)."""
+        if self.roi is None:
+            return frame
+
+        x, y, w, h = self.roi
+        return frame[y:y + h, x:x + w]
+
+    def is_scene_cut(self, frame: np.ndarray) -> bool:
+        """
+        Check whether a frame starts a new scene.
+
+        Compares a coarse grayscale histogram with the previous frame passed in.
+        """
+        thumb = cv2.cvtColor(cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        hist = cv2.calcHist([thumb], [0], None, [32], [0, 256])
+        cv2.normalize(hist, hist)
+
+        prev_hist = self.prev_hist
+        self.prev_hist = hist
+
+        if prev_hist is None:
+            return False
+
+        return cv2.compareHist(prev_hist, hist, cv2.HISTCMP_CORREL) < config.SCENE_CUT_THRESHOLD
+
+    def reset(self):
+        """Forget the region and scene history (e.g. for a new video)."""
+        self.roi = None
+        self.prev_hist = None
@@ -0,0 +1,321 @@
+"""Builds sharded training windows from stored video features and labels."""
+import csv
+import json
+import os
+import time
+import zlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from ..config import config
+from ..utils import logger
+from .feature_store import FeatureStore
+from .model_inference import ModelInference
+
+
+ACTIONS = ModelInference.ACTIONS
+
+MANIFEST = 'manifest.json'
+
+
+def load_labels(path: Path) -> List[Tuple[int, str]]:
+    """
+    Read a label file.
+
+    One CSV per video, `<LABELS_DIR>/<video_id>.csv`, with a header and one
+    annotated frame per row; frames not listed are IGNORE:
+
+        frame_idx,action
+        5400,ENTER
+        7260,EXIT
+    """
+    labels = []
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            action = row['action'].strip().upper()
+            if action not in ACTIONS:
+                raise ValueError(f"{path}: unknown action {row['action']!r}")
+            labels.append((int(row['frame_idx']), action))
+    return labels
+
+
+def align_labels(frame_indices: np.ndarray, labels: List[Tuple[int, str]], tolerance: int) -> np.ndarray:
+    """
+    Class index per stored frame.
+
+    Stored frames are sampled every FRAME_STEP frames, so an annotated frame
+    is moved to the first stored frame at or after it, if that is within
+    `tolerance` frames; otherwise the annotation is dropped.
+    """
+    classes = np.zeros(len(frame_indices), dtype=np.int64)
+
+    for frame_idx, action in labels:
+        position = int(np.searchsorted(frame_indices, frame_idx, side='left'))
+        if position < len(frame_indices) and frame_indices[position] - frame_idx <= tolerance:
+            classes[position] = ACTIONS.index(action)
+
+    return classes
+
+
+def split_for(video_id: str, val_fraction: float) -> str:
+    """Stable train/val assignment per video (windows of one video overlap, so never split a video)."""
+    return 'val' if zlib.crc32(video_id.encode()) % 1000 < val_fraction * 1000 else 'train'
+
+
+def _build_video(task: dict) -> dict:
+    """
+    Worker: window one video and write its shards.
+
+    Runs in a separate process, so it only takes and returns plain data.
+    """
+    with np.load(task['features']) as data:
+        frame_indices = data['frame_indices']
+        vectors = data['vectors'].astype(np.float32, copy=False)
+
+    labels = load_labels(Path(task['labels']))
+    classes = align_labels(frame_indices, labels, task['tolerance'])
+
+    sequence_length = task['sequence_length']
+    shards = []
+    counts = np.zeros(len(ACTIONS), dtype=np.int64)
+
+    if len(vectors) >= sequence_length:
+        # Window i ends at stored frame i + sequence_length - 1 and takes its label
+        windows = np.lib.stride_tricks.sliding_window_view(
+            vectors, sequence_length, axis=0
+        ).transpose(0, 2, 1)
+        window_classes = classes[sequence_length - 1:]
+        counts = np.bincount(window_classes, minlength=len(ACTIONS))
+
+        for k, start in enumerate(range(0, len(windows), task['shard_size'])):
+            stop = start + task['shard_size']
+            name = f"{task['video_id']}_{k:04d}.npz"
+            np.savez_compressed(
+                Path(task['output_dir']) / name,
+                X=np.ascontiguousarray(windows[start:stop]),
+                y=np.eye(len(ACTIONS), dtype=np.float32)[window_classes[start:stop]],
+                frame_idx=frame_indices[sequence_length - 1:][start:stop]
+            )
+            shards.append({'file': name, 'windows': int(len(window_classes[start:stop]))})
+
+    return {
+        'video_id': task['video_id'],
+        'split': task['split'],
+        'shards': shards,
+        'windows': int(counts.sum()),
+        'class_counts': {action: int(counts[i]) for i, action in enumerate(ACTIONS)},
+        'labels': len(labels),
+        'source_mtime': task['source_mtime']
+    }
+
+
+class DatasetBuilder:
+    """
+    Turns processed videos into sharded training windows.
+
+    Inputs are the feature vectors saved by FeatureStore
+    (`FEATURES_DIR/<video_id>.npz`) and a label file per video
+    (`LABELS_DIR/<video_id>.csv`, see load_labels). Videos are windowed in
+    parallel worker processes; each writes compressed shards of at most
+    `shard_size` windows (X, one-hot y, frame_idx) into
+    `TRAINING_DIR/shards/`. `TRAINING_DIR/manifest.json` lists the shards,
+    the train/val split and class counts per video.
+
+    Builds are incremental: a video is (re)built only when it is new or its
+    features or labels changed since the manifest was written; videos whose
+    inputs disappeared, or whose features were extracted with other settings
+    (see FeatureStore), are removed.
+    """
+
+    def __init__(
+        self,
+        features_dir: str = None,
+        labels_dir: str = None,
+        output_dir: str = None,
+        shard_size: int = None,
+        val_fraction: float = 0.2,
+        workers: int = None
+    ):
+        self.features_dir = Path(features_dir or config.FEATURES_DIR)
+        self.labels_dir = Path(labels_dir or config.LABELS_DIR)
+        self.output_dir = Path(output_dir or config.TRAINING_DIR)
+        self.shards_dir = self.output_dir / 'shards'
+        self.shard_size = shard_size or config.DATASET_SHARD_SIZE
+        self.val_fraction = val_fraction
+        self.workers = workers or config.DATASET_WORKERS or os.cpu_count() or 1
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST
+
+    def load_manifest(self) -> dict:
+        """Current manifest (empty if nothing was built yet)."""
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text())
+        return {'videos': {}}
+
+    def _save_manifest(self, manifest: dict):
+        tmp = self.manifest_path.with_suffix('.json.tmp')
+        tmp.write_text(json.dumps(manifest, indent=2))
+        tmp.replace(self.manifest_path)
+
+    def _remove_shards(self, entry: dict):
+        for shard in entry.get('shards', []):
+            (self.shards_dir / shard['file']).unlink(missing_ok=True)
+
+    def build(self, rebuild: bool = False) -> dict:
+        """
+        Build or update the dataset.
+
+        Args:
+            rebuild: Ignore the manifest and rebuild every video
+
+        Returns:
+            The updated manifest
+        """
+        start = time.time()
+        self.shards_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self.load_manifest()
+        if manifest.get('sequence_length', config.SEQUENCE_LENGTH) != config.SEQUENCE_LENGTH or \
+                manifest.get('feature_dim', config.FEATURE_DIM) != config.FEATURE_DIM:
+            logger.info("Window shape changed since the last build, rebuilding all videos")
+            rebuild = True
+
+        if rebuild:
+            manifest = {'videos': {}}
+            for path in self.shards_dir.glob('*.npz'):
+                path.unlink()
+
+        store = FeatureStore(self.features_dir)
+        sources = {}
+        for labels_path in sorted(self.labels_dir.glob('*.csv')):
+            video_id = labels_path.stem
+            features_path = store.path(video_id)
+            if not features_path.exists():
+                continue
+            if not store.is_current(video_id):
+                logger.warning(f"Skipping {video_id}: features extracted with other settings, re-process the video")
+                continue
+            sources[video_id] = (features_path, labels_path)
+
+        # Inputs removed (or stale) since the last build
+        for video_id in list(manifest['videos']):
+            if video_id not in sources:
+                self._remove_shards(manifest['videos'].pop(video_id))
+                logger.info(f"Removed {video_id} from dataset (features or labels gone or stale)")
+
+        tasks = []
+        for video_id, (features_path, labels_path) in sources.items():
+            source_mtime = max(features_path.stat().st_mtime, labels_path.stat().st_mtime)
+            entry = manifest['videos'].get(video_id)
+            if entry is not None and entry.get('source_mtime') == source_mtime:
+                continue
+
+            if entry is not None:
+                self._remove_shards(entry)
+
+            tasks.append({
+                'video_id': video_id,
+                'features': str(features_path),
+                'labels': str(labels_path),
+                'output_dir': str(self.shards_dir),
+                'split': split_for(video_id, self.val_fraction),
+                'sequence_length': config.SEQUENCE_LENGTH,
+                'shard_size': self.shard_size,
+                'tolerance': config.FRAME_STEP,
+                'source_mtime': source_mtime
+            })
+
+        logger.info(
+            f"Dataset build: {len(tasks)} of {len(sources)} labeled videos to process "
+            f"with {min(self.workers, max(len(tasks), 1))} workers"
+        )
+
+        if tasks:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+                for result in pool.map(_build_video, tasks):
+                    manifest['videos'][result['video_id']] = result
+                    logger.info(
+                        f"{result['video_id']}: {result['windows']} windows ({result['split']}), "
+                        f"{result['class_counts']}"
+                    )
+                    # Saved after each video, so an interrupted build resumes where it stopped
+                    self._save_manifest(self._summarize(manifest))
+
+        manifest = self._summarize(manifest)
+        self._save_manifest(manifest)
+
+        logger.info(
+            f"Dataset ready in {time.time() - start:.1f}s: "
+            f"{manifest['splits']['train']['windows']} train / {manifest['splits']['val']['windows']} val windows"
+        )
+        return manifest
+
+    def _summarize(self, manifest: dict) -> dict:
+        """Refresh the dataset-level fields of the manifest."""
+        splits = {}
+        for split in ('train', 'val'):
+            entries = [e for e in manifest['videos'].values() if e['split'] == split]
+            splits[split] = {
+                'videos': len(entries),
+                'windows': sum(e['windows'] for e in entries),
+                'class_counts': {
+                    action: sum(e['class_counts'][action] for e in entries) for action in ACTIONS
+                }
+            }
+
+        manifest.update(
+            format=1,
+            actions=ACTIONS,
+            sequence_length=config.SEQUENCE_LENGTH,
+            feature_dim=config.FEATURE_DIM,
+            shard_size=self.shard_size,
+            val_fraction=self.val_fraction,
+            splits=splits,
+            updated=time.time()
+        )
+        return manifest
+
+    def shard_paths(self, split: str = 'train') -> List[Path]:
+        """Shard files of a split, in a stable order."""
+        manifest = self.load_manifest()
+        return [
+            self.shards_dir / shard['file']
+            for video_id, entry in sorted(manifest['videos'].items())
+            if entry['split'] == split
+            for shard in entry['shards']
+        ]
+
+    def load_split(self, split: str = 'train') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load a split for ModelTrainer.train.
+
+        Returns:
+            Tuple of (X, y): X of shape (n, sequence_length, feature_dim),
+            y one-hot of shape (n, len(ACTIONS))
+        """
+        X, y = [], []
+        for path in self.shard_paths(split):
+            with np.load(path) as data:
+                X.append(data['X'])
+                y.append(data['y'])
+
+        if not X:
+            return (
+                np.zeros((0, config.SEQUENCE_LENGTH, config.FEATURE_DIM), dtype=np.float32),
+                np.zeros((0, len(ACTIONS)), dtype=np.float32)
+            )
+        return np.concatenate(X), np.concatenate(y)
+
+    def class_weights(self, split: str = 'train') -> Dict[int, float]:
+        """Inverse-frequency class weights (IGNORE usually dominates)."""
+        counts = self.load_manifest().get('splits', {}).get(split, {}).get('class_counts', {})
+        total = sum(counts.values())
+        return {
+            i: total / (len(ACTIONS) * counts[action])
+            for i, action in enumerate(ACTIONS)
+            if counts.get(action)
+        }
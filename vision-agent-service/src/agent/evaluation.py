@@ -0,0 +1,149 @@
+"""Single-pass, chunked model evaluation with a confidence threshold sweep."""
+import numpy as np
+from pathlib import Path
+from typing import List, Sequence, Union
+
+from ..config import config
+
+
+def load_array(data: Union[np.ndarray, str, Path]) -> np.ndarray:
+    """Return an array as is, or memory-map an .npy file."""
+    if isinstance(data, (str, Path)):
+        return np.load(str(data), mmap_mode='r')
+    return data
+
+
+def default_thresholds() -> np.ndarray:
+    """Threshold grid covering the valid CONFIDENCE_THRESHOLD range (0.50-0.95)."""
+    return np.round(np.arange(0.50, 0.96, 0.05), 2)
+
+
+class StreamingEvaluator:
+    """
+    Accumulates evaluation metrics chunk by chunk.
+
+    Each `update` adds one chunk of predicted probabilities and true labels
+    to the argmax confusion matrix, the log loss and, for every threshold of
+    the sweep, a confusion matrix of the signal policy: the argmax action
+    when its confidence reaches the threshold, IGNORE otherwise. Nothing
+    but the counts is kept, so memory does not grow with the dataset.
+    """
+
+    def __init__(self, actions: List[str], thresholds: Sequence[float] = None, ignore_label: str = 'IGNORE'):
+        self.actions = list(actions)
+        self.thresholds = np.asarray(thresholds if thresholds is not None else default_thresholds(), dtype=np.float64)
+        self.ignore = self.actions.index(ignore_label)
+
+        n = len(self.actions)
+        self.confusion = np.zeros((n, n), dtype=np.int64)
+        self.threshold_confusion = np.zeros((len(self.thresholds), n, n), dtype=np.int64)
+        self.loss_sum = 0.0
+        self.count = 0
+
+    def update(self, probabilities: np.ndarray, labels: np.ndarray):
+        """
+        Add a chunk.
+
+        Args:
+            probabilities: Array of shape (n, len(actions))
+            labels: True labels, one-hot (n, len(actions)) or class indices (n,)
+        """
+        labels = np.asarray(labels)
+        y_true = np.argmax(labels, axis=1) if labels.ndim == 2 else labels.astype(np.int64)
+        n = len(self.actions)
+
+        y_pred = np.argmax(probabilities, axis=1)
+        confidence = probabilities[np.arange(len(y_pred)), y_pred]
+
+        self.confusion += np.bincount(y_true * n + y_pred, minlength=n * n).reshape(n, n)
+
+        # (n_thresholds, n_windows): argmax if confident enough, else IGNORE
+        confident = confidence[np.newaxis, :] >= self.thresholds[:, np.newaxis]
+        policy = np.where(confident, y_pred[np.newaxis, :], self.ignore)
+        offsets = np.arange(len(self.thresholds))[:, np.newaxis] * n * n
+        flat = (offsets + y_true[np.newaxis, :] * n + policy).ravel()
+        self.threshold_confusion += np.bincount(
+            flat, minlength=len(self.thresholds) * n * n
+        ).reshape(len(self.thresholds), n, n)
+
+        true_probability = probabilities[np.arange(len(y_true)), y_true]
+        self.loss_sum += float(-np.log(np.clip(true_probability, 1e-7, 1.0)).sum())
+        self.count += len(y_true)
+
+    def _class_report(self, confusion: np.ndarray) -> dict:
+        """Per-class precision/recall/F1 in the layout of sklearn's classification_report."""
+        true_positives = np.diag(confusion).astype(np.float64)
+        support = confusion.sum(axis=1)
+        predicted = confusion.sum(axis=0)
+
+        precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+        recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+        f1_denominator = precision + recall
+        f1 = np.divide(2 * precision * recall, f1_denominator, out=np.zeros_like(true_positives), where=f1_denominator > 0)
+
+        report = {}
+        for i, action in enumerate(self.actions):
+            report[action] = {
+                'precision': float(precision[i]),
+                'recall': float(recall[i]),
+                'f1-score': float(f1[i]),
+                'support': int(support[i])
+            }
+
+        total = max(int(support.sum()), 1)
+        report['accuracy'] = float(true_positives.sum() / total)
+        for name, weights in [('macro avg', np.ones(len(self.actions)) / len(self.actions)), ('weighted avg', support / total)]:
+            report[name] = {
+                'precision': float(precision @ weights),
+                'recall': float(recall @ weights),
+                'f1-score': float(f1 @ weights),
+                'support': int(support.sum())
+            }
+
+        return report
+
+    def _signal_metrics(self, confusion: np.ndarray) -> dict:
+        """Precision/recall of non-IGNORE predictions (the signals the agent would send)."""
+        signal_classes = [i for i in range(len(self.actions)) if i != self.ignore]
+        signals = int(confusion[:, signal_classes].sum())
+        correct = int(sum(confusion[i, i] for i in signal_classes))
+        actionable = int(confusion[signal_classes, :].sum())
+
+        return {
+            'signals': signals,
+            'signal_precision': correct / signals if signals else 0.0,
+            'signal_recall': correct / actionable if actionable else 0.0
+        }
+
+    def result(self) -> dict:
+        """
+        Metrics over everything added so far.
+
+        Returns:
+            Dictionary with loss, accuracy, report, confusion_matrix and
+            threshold_sweep (one entry per threshold)
+        """
+        sweep = []
+        for threshold, confusion in zip(self.thresholds, self.threshold_confusion):
+            report = self._class_report(confusion)
+            entry = {
+                'threshold': float(threshold),
+                'accuracy': report['accuracy'],
+                **self._signal_metrics(confusion)
+            }
+            for action in self.actions:
+                entry[f'{action.lower()}_precision'] = report[action]['precision']
+                entry[f'{action.lower()}_recall'] = report[action]['recall']
+            sweep.append(entry)
+
+        report = self._class_report(self.confusion)
+
+        return {
+            'samples': self.count,
+            'loss': self.loss_sum / max(self.count, 1),
+            'accuracy': report['accuracy'],
+            'report': report,
+            'confusion_matrix': self.confusion.tolist(),
+            'threshold_sweep': sweep,
+            'confidence_threshold': config.CONFIDENCE_THRESHOLD
+        }
@@ -1,19 +1,14 @@
 """Feature extraction module using MediaPipe, OpenCV, OCR, and YOLO."""
 import cv2
 import numpy as np
-import mediapipe as mp
-import pytesseract
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    YOLO_AVAILABLE = False
-
 from ..config import config
-from ..utils import logger
+from ..utils import logger, lazy_import
+
+mp = lazy_import('mediapipe')
+pytesseract = lazy_import('pytesseract')
 
 
 class FeatureExtractor:
@@ -31,10 +26,13 @@ class FeatureExtractor:
         
         # YOLO (if available and model exists)
         self.yolo_model = None
-        if YOLO_AVAILABLE and Path(config.YOLO_MODEL_PATH).exists():
+        if Path(config.YOLO_MODEL_PATH).exists():
             try:
+                from ultralytics import YOLO
                 self.yolo_model = YOLO(config.YOLO_MODEL_PATH)
                 logger.info("YOLO model loaded successfully")
+            except ImportError:
+                logger.warning("ultralytics not installed, arrow detection disabled")
             except Exception as e:
                 logger.warning(f"Failed to load YOLO model: {e}")
         
@@ -323,6 +321,37 @@ class FeatureExtractor:
         
         return vector
     
+    def reset_state(self):
+        """Reset per-stream state (motion reference and cached OCR)."""
+        self.prev_gray = None
+        self.last_text_features = {
+            'text_detected': False,
+            'text': '',
+            'numbers': [],
+            'words': []
+        }
+    
+    def get_state(self) -> Dict:
+        """
+        Per-stream state, for sharing one extractor between streams.
+        
+        Swap a stream's state in with set_state before extracting its frame
+        and save it back afterwards. MediaPipe's hand tracking is not part of
+        it; interleaved streams just fall back to detection.
+        """
+        return {
+            'prev_gray': self.prev_gray,
+            'last_text_features': self.last_text_features
+        }
+    
+    def set_state(self, state: Optional[Dict]):
+        """Restore a state from get_state (None: fresh stream)."""
+        if state is None:
+            self.reset_state()
+            return
+        self.prev_gray = state['prev_gray']
+        self.last_text_features = state['last_text_features']
+    
     def cleanup(self):
         """Release resources."""
         if self.hands:
@@ -0,0 +1,154 @@
+"""Per-video store of extracted feature vectors."""
+import json
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..config import config
+from ..utils import logger
+
+# Layout of FeatureExtractor vectors; bump when the extractor changes what it stores
+EXTRACTOR_SCHEMA = 'chart_v1'
+
+
+def extraction_settings() -> dict:
+    """Settings the stored vectors depend on; features saved under others are stale."""
+    return {
+        'schema': EXTRACTOR_SCHEMA,
+        'feature_dim': config.FEATURE_DIM,
+        'frame_step': config.FRAME_STEP,
+        'crop_to_chart': config.CROP_TO_CHART
+    }
+
+
+class FeatureStore:
+    """
+    Saves and loads the feature vectors extracted from a video.
+    
+    The extraction settings are saved with the vectors; features extracted
+    under different settings count as not stored.
+    """
+    
+    def __init__(self, features_dir: str = None):
+        self.features_dir = Path(features_dir or config.FEATURES_DIR)
+        self.features_dir.mkdir(parents=True, exist_ok=True)
+    
+    def path(self, video_id: str) -> Path:
+        """Path of the stored features for a video."""
+        return self.features_dir / f"{video_id}.npz"
+    
+    def exists(self, video_id: str) -> bool:
+        return self.path(video_id).exists()
+    
+    def is_current(self, video_id: str) -> bool:
+        """Stored and extracted with the current settings."""
+        path = self.path(video_id)
+        if not path.exists():
+            return False
+        
+        try:
+            with np.load(path) as data:
+                return self._matches(data)
+        except Exception as e:
+            logger.warning(f"Failed to read stored features {path}: {e}")
+            return False
+    
+    @staticmethod
+    def _matches(data) -> bool:
+        return 'settings' in data and json.loads(str(data['settings'])) == extraction_settings()
+    
+    def save(
+        self,
+        video_id: str,
+        frame_indices: np.ndarray,
+        vectors: np.ndarray,
+        summaries: List[dict]
+    ):
+        """
+        Save the features of a video.
+        
+        Args:
+            video_id: Video identifier
+            frame_indices: Array of shape (n_frames,)
+            vectors: Array of shape (n_frames, feature_dim)
+            summaries: Per-frame features summaries (as sent with signals)
+        """
+        path = self.path(video_id)
+        np.savez_compressed(
+            path,
+            frame_indices=np.asarray(frame_indices, dtype=np.int64),
+            vectors=np.asarray(vectors, dtype=np.float32),
+            summaries=np.array(json.dumps(summaries)),
+            settings=np.array(json.dumps(extraction_settings()))
+        )
+        logger.info(f"Saved {len(frame_indices)} feature vectors: {path}")
+    
+    def load(self, video_id: str) -> Optional[Tuple[np.ndarray, np.ndarray, List[dict]]]:
+        """
+        Load the features of a video.
+        
+        Returns:
+            Tuple of (frame_indices, vectors, summaries), or None if not
+            stored or extracted with other settings
+        """
+        path = self.path(video_id)
+        
+        if not path.exists():
+            return None
+        
+        try:
+            with np.load(path) as data:
+                if not self._matches(data):
+                    logger.info(f"Stored features {path} were extracted with other settings, ignoring them")
+                    return None
+                return (
+                    data['frame_indices'],
+                    data['vectors'],
+                    json.loads(str(data['summaries']))
+                )
+        except Exception as e:
+            logger.warning(f"Failed to load stored features {path}: {e}")
+            return None
+    
+    def sample_windows(self, count: int, sequence_length: int = None, seed: int = 0) -> np.ndarray:
+        """
+        Sample sliding windows from all stored videos (e.g. for calibration).
+        
+        Args:
+            count: Maximum number of windows
+            sequence_length: Window length (default: config.SEQUENCE_LENGTH)
+            seed: Random seed for the sample
+            
+        Returns:
+            Array of shape (n, sequence_length, feature_dim)
+        """
+        sequence_length = sequence_length or config.SEQUENCE_LENGTH
+        videos = []
+        
+        for path in sorted(self.features_dir.glob('*.npz')):
+            stored = self.load(path.stem)
+            if stored is None or len(stored[1]) < sequence_length:
+                continue
+            videos.append(stored[1])
+        
+        if not videos:
+            logger.warning(f"No stored feature windows in {self.features_dir}")
+            return np.zeros((0, sequence_length, config.FEATURE_DIM), dtype=np.float32)
+        
+        lengths = np.array([len(vectors) - sequence_length + 1 for vectors in videos])
+        ends = np.cumsum(lengths)
+        rng = np.random.default_rng(seed)
+        picks = np.sort(rng.choice(ends[-1], size=min(count, ends[-1]), replace=False))
+        
+        # Copy only the picked windows: (video, offset) per pick
+        video_of = np.searchsorted(ends, picks, side='right')
+        offsets = picks - (ends - lengths)[video_of]
+        
+        sample = np.empty((len(picks), sequence_length, config.FEATURE_DIM), dtype=np.float32)
+        for v in np.unique(video_of):
+            windows = np.lib.stride_tricks.sliding_window_view(
+                videos[v], sequence_length, axis=0
+            ).transpose(0, 2, 1)
+            rows = video_of == v
+            sample[rows] = windows[offsets[rows]]
+        return sample
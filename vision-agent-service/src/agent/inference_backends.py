@@ -0,0 +1,151 @@
+"""Lightweight inference backends (TFLite, ONNX Runtime) for exported models."""
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..utils import logger
+
+
+BACKENDS = ['keras', 'tflite', 'onnx']
+QUANTIZATIONS = [None, 'dynamic', 'int8']
+
+_EXTENSIONS = {'tflite': '.tflite', 'onnx': '.onnx'}
+
+
+def backend_path(model_path: Path, backend: str, quantization: Optional[str] = None) -> Path:
+    """
+    Path of an exported model next to its Keras file.
+
+    e.g. models/model_seq_v20251125.h5 -> models/model_seq_v20251125_int8.onnx
+    """
+    suffix = f"_{quantization}" if quantization else ""
+    return model_path.with_name(f"{model_path.stem}{suffix}{_EXTENSIONS[backend]}")
+
+
+class TFLiteBackend:
+    """Runs a TFLite model exported by ModelTrainer.export_model."""
+
+    name = 'tflite'
+
+    def __init__(self, path: Path):
+        # Prefer the standalone runtimes, which do not need full TensorFlow
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            try:
+                from tflite_runtime.interpreter import Interpreter
+            except ImportError:
+                import tensorflow as tf
+                Interpreter = tf.lite.Interpreter
+
+        self.path = Path(path)
+        self.interpreter = Interpreter(model_path=str(self.path))
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._lock = threading.Lock()  # The interpreter's tensors are shared by its callers
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for a batch of windows.
+
+        The exported graph has a fixed batch of one, so windows run one by one.
+        Calls from several threads are serialized.
+        """
+        results = np.empty((len(batch), self._output['shape'][-1]), dtype=np.float32)
+
+        for i, window in enumerate(batch):
+            x = window[np.newaxis]
+            scale, zero_point = self._input['quantization']
+            if scale:
+                x = np.round(x / scale + zero_point)
+            with self._lock:
+                self.interpreter.set_tensor(self._input['index'], x.astype(self._input['dtype']))
+                self.interpreter.invoke()
+                y = self.interpreter.get_tensor(self._output['index'])[0]
+
+            scale, zero_point = self._output['quantization']
+            if scale:
+                y = (y.astype(np.float32) - zero_point) * scale
+            results[i] = y
+
+        return results
+
+
+class ONNXBackend:
+    """Runs an ONNX model exported by ModelTrainer.export_model."""
+
+    name = 'onnx'
+
+    def __init__(self, path: Path):
+        import onnxruntime as ort
+
+        self.path = Path(path)
+        self.session = ort.InferenceSession(str(self.path), providers=['CPUExecutionProvider'])
+        self._input_name = self.session.get_inputs()[0].name
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """Class probabilities for a batch of windows."""
+        return self.session.run(None, {self._input_name: batch.astype(np.float32, copy=False)})[0]
+
+
+def load_backend(backend: str, path: Path):
+    """Create the inference backend for an exported model file."""
+    if backend == 'tflite':
+        return TFLiteBackend(path)
+    if backend == 'onnx':
+        return ONNXBackend(path)
+    raise ValueError(f"Unknown inference backend: {backend}")
+
+
+def parity_report(
+    reference: Callable[[np.ndarray], np.ndarray],
+    backend,
+    windows: np.ndarray,
+    latency_samples: int = 100
+) -> dict:
+    """
+    Compare an exported backend with the reference (Keras) model.
+
+    Args:
+        reference: Function mapping a batch of windows to class probabilities
+        backend: Loaded TFLiteBackend or ONNXBackend
+        windows: Validation windows of shape (n, sequence_length, feature_dim)
+        latency_samples: Number of single-window calls timed per model
+
+    Returns:
+        Dictionary with accuracy parity and single-window latency
+    """
+    windows = np.asarray(windows, dtype=np.float32)
+    expected = reference(windows)
+    actual = backend.predict(windows)
+    diff = np.abs(expected - actual)
+
+    def latency(fn) -> float:
+        samples = windows[:latency_samples]
+        fn(samples[:1])  # warm-up
+        start = time.perf_counter()
+        for i in range(len(samples)):
+            fn(samples[i:i + 1])
+        return (time.perf_counter() - start) / len(samples) * 1000.0
+
+    report = {
+        'backend': backend.name,
+        'path': str(backend.path),
+        'size_bytes': backend.path.stat().st_size,
+        'windows': len(windows),
+        'max_abs_diff': float(diff.max()),
+        'mean_abs_diff': float(diff.mean()),
+        'argmax_agreement': float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))),
+        'reference_ms': latency(reference),
+        'backend_ms': latency(backend.predict)
+    }
+
+    logger.info(
+        f"Parity {backend.path.name}: agreement {report['argmax_agreement']:.3f}, "
+        f"max |dp| {report['max_abs_diff']:.4f}, "
+        f"{report['reference_ms']:.2f} ms -> {report['backend_ms']:.2f} ms per window"
+    )
+    return report
@@ -0,0 +1,218 @@
+"""Cross-stream micro-batching of single-window predictions."""
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from typing import Dict, Hashable, Tuple
+
+from ..config import config
+from ..utils import logger
+
+
+class InferenceBroker:
+    """
+    Gathers windows submitted by many streams into one batched model call.
+
+    Each stream (live symbol, video) calls `submit` with its newest window
+    and gets a Future for its (action, confidence). A worker thread collects
+    pending windows until `max_batch` are waiting or `max_wait_ms` has passed
+    since the oldest one was submitted, then runs them as one batch.
+
+    `max_wait_ms` bounds the time any window waits for others. Streams that
+    pass a `stream_id` also let the worker dispatch early: once every stream
+    seen in the last `stream_ttl` seconds has a window pending, nobody else is
+    coming, so a single live stream is not delayed at all.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch: int = None,
+        max_wait_ms: float = None,
+        stream_ttl: float = 120.0
+    ):
+        """
+        Args:
+            model: ModelInference used for the batched calls
+            max_batch: Windows per batch (default: config.BROKER_MAX_BATCH)
+            max_wait_ms: Latency cap per window (default: config.BROKER_MAX_WAIT_MS)
+            stream_ttl: Seconds after which a silent stream no longer counts as active
+        """
+        self.model = model
+        self.max_batch = max_batch or config.BROKER_MAX_BATCH
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.BROKER_MAX_WAIT_MS) / 1000.0
+        self.stream_ttl = stream_ttl
+
+        self._queue: queue.Queue = queue.Queue()
+        self._streams: Dict[Hashable, float] = {}  # stream_id -> last submit time
+        self._streams_lock = threading.Lock()
+
+        self.stats = {
+            'batches': 0,
+            'windows': 0,
+            'max_batch': 0,
+            'max_latency_ms': 0.0
+        }
+
+        self._running = True
+        self._running_lock = threading.Lock()  # No window queued after stop() put the sentinel
+        self._worker = threading.Thread(target=self._run, name='inference-broker', daemon=True)
+        self._worker.start()
+
+    def submit(
+        self,
+        sequence: np.ndarray,
+        stream_id: Hashable = None,
+        probabilities: bool = False,
+        frame_idx: int = None
+    ) -> Future:
+        """
+        Queue a window for the next batch.
+
+        The window is copied, so callers may pass a reused buffer
+        (e.g. FrameBuffer.get_sequence).
+
+        Args:
+            sequence: Array of shape (sequence_length, feature_dim) or (1, sequence_length, feature_dim)
+            stream_id: Identifies the submitting stream (enables early dispatch)
+            probabilities: Resolve to the class probabilities instead
+            frame_idx: Frame the window ends at (for the model's shadow log)
+
+        Returns:
+            Future resolving to (action, confidence), or to an array of
+            shape (len(ACTIONS),) with `probabilities`
+        """
+        future: Future = Future()
+        window = np.array(sequence, dtype=np.float32).reshape(config.SEQUENCE_LENGTH, config.FEATURE_DIM)
+
+        with self._running_lock:
+            if not self._running:
+                future.set_exception(RuntimeError("Inference broker stopped"))
+                return future
+
+            now = time.perf_counter()
+            if stream_id is not None:
+                with self._streams_lock:
+                    self._streams[stream_id] = now
+
+            self._queue.put((window, future, now, stream_id, probabilities, frame_idx))
+        return future
+
+    def predict(
+        self,
+        sequence: np.ndarray,
+        stream_id: Hashable = None,
+        timeout: float = None,
+        frame_idx: int = None
+    ) -> Tuple[str, float]:
+        """Submit a window and wait for its result."""
+        return self.submit(sequence, stream_id, frame_idx=frame_idx).result(timeout)
+
+    def predict_proba(
+        self,
+        sequence: np.ndarray,
+        stream_id: Hashable = None,
+        timeout: float = None,
+        frame_idx: int = None
+    ) -> np.ndarray:
+        """Submit a window and wait for its class probabilities."""
+        return self.submit(sequence, stream_id, probabilities=True, frame_idx=frame_idx).result(timeout)
+
+    def _active_streams(self, now: float) -> set:
+        """Streams that submitted within the last stream_ttl seconds."""
+        with self._streams_lock:
+            for stream_id, seen in list(self._streams.items()):
+                if now - seen > self.stream_ttl:
+                    del self._streams[stream_id]
+            return set(self._streams)
+
+    def _run(self):
+        """Worker loop: gather a batch, dispatch, repeat."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = item[2] + self.max_wait
+            stopping = False
+
+            while len(batch) < self.max_batch:
+                # Windows already queued join without waiting (backlog after a slow batch)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    # Every active stream already waiting: no reason to hold the batch
+                    pending = {entry[3] for entry in batch}
+                    if None not in pending and pending >= self._active_streams(time.perf_counter()):
+                        break
+
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._dispatch(batch)
+
+            if stopping:
+                break
+
+    def _dispatch(self, batch: list):
+        """Run one batched call and resolve the futures."""
+        windows = np.stack([entry[0] for entry in batch])
+        oldest = min(entry[2] for entry in batch)
+
+        try:
+            predictions = self.model.predict_batch_proba(
+                windows,
+                frame_indices=[entry[5] for entry in batch],
+                stream_ids=[entry[3] for entry in batch]
+            )
+        except Exception as e:
+            logger.error(f"Inference broker batch error: {e}")
+            for entry in batch:
+                entry[1].set_exception(e)
+            return
+
+        for entry, prediction in zip(batch, predictions):
+            entry[1].set_result(prediction if entry[4] else self.model.to_action(prediction))
+
+        self.stats['batches'] += 1
+        self.stats['windows'] += len(batch)
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        self.stats['max_latency_ms'] = max(self.stats['max_latency_ms'], (time.perf_counter() - oldest) * 1000.0)
+
+    def stop(self):
+        """Finish pending windows and stop the worker; later submits fail."""
+        with self._running_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(None)
+
+        self._worker.join()
+
+        # Anything the worker left behind would never resolve
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("Inference broker stopped"))
+
+        if self.stats['batches']:
+            logger.info(
+                f"Inference broker: {self.stats['windows']} windows in {self.stats['batches']} batches "
+                f"(avg {self.stats['windows'] / self.stats['batches']:.1f}, max latency {self.stats['max_latency_ms']:.1f} ms)"
+            )
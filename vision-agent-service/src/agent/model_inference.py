@@ -1,12 +1,47 @@
 """Model inference module for sequence classification."""
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
 import numpy as np
 from pathlib import Path
 from typing import Tuple, Optional
-import tensorflow as tf
-import keras
 
 from ..config import config
-from ..utils import logger
+from ..utils import logger, lazy_import
+
+# TensorFlow is only needed for the Keras backend and training
+tf = lazy_import('tensorflow')
+keras = lazy_import('keras')
+
+
+class LoadedModel:
+    """
+    A loaded model version with its inference paths.
+    
+    ModelInference swaps whole instances, so a prediction always sees one
+    consistent model / compiled call / streaming state.
+    """
+    
+    def __init__(self, version: str, path: Path):
+        self.version = version
+        self.path = path
+        self.model = None  # Keras model
+        self.infer = None  # Compiled single-window call
+        self.infer_batch = None  # Compiled call for small batches (any batch size)
+        self.infer_primary_batch = None  # Same, primary model only (shadows skipped)
+        self.infer_shadow_batch = None  # Same, shadow models only (next to a backend)
+        self.streaming = None  # StreamingLSTM
+        self.backend = None  # Exported TFLite/ONNX model (replaces the Keras model when set)
+        self.shadow_versions = []  # Candidate models evaluated alongside, never acted on
+        self.shadow_models = []
+        self.gate = None  # CascadeGate deciding which windows reach the model
+        self.mtime = path.stat().st_mtime if path.exists() else None
+    
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None or self.backend is not None
 
 
 class ModelInference:
@@ -15,26 +50,475 @@ class ModelInference:
     # Action labels
     ACTIONS = ['IGNORE', 'ENTER', 'EXIT']
     
-    def __init__(self, model_path: str = None):
-        self.model_path = Path(model_path or config.MODELS_DIR) / config.MODEL_VERSION
-        self.model = None
+    def __init__(self, model_path: str = None, shadow_versions: list = None, version: str = None):
+        """
+        Args:
+            model_path: Models directory (default: MODELS_DIR)
+            shadow_versions: Candidate models evaluated alongside (default: SHADOW_MODELS)
+            version: Model filename to serve instead of MODEL_VERSION (e.g.
+                CANDLE_MODEL_VERSION). Reloads update this instance only,
+                never the global MODEL_VERSION
+        """
+        self.models_dir = Path(model_path or config.MODELS_DIR)
+        self.version = version
+        self.shadow_versions = list(shadow_versions if shadow_versions is not None else config.SHADOW_MODELS)
+        self._shadow_log = None
+        self._shadow_log_date = None
+        self._shadow_log_lock = threading.Lock()  # Written from the broker, scanner and video threads
+        
+        # Reusable input for single-window calls, one per thread: the live
+        # scanner and video processing may share this instance
+        self._input_shape = (1, config.SEQUENCE_LENGTH, config.FEATURE_DIM)
+        self._thread_input = threading.local()
+        
+        # Active model, replaced atomically on reload
+        self._active: Optional[LoadedModel] = None
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._watching = False
+        
         self.load_model()
     
+    @property
+    def model(self):
+        """Active Keras model (None with a TFLite/ONNX backend)."""
+        return self._active.model if self._active else None
+    
+    @property
+    def model_version(self) -> str:
+        return self._active.version if self._active else (self.version or config.MODEL_VERSION)
+    
+    @property
+    def model_path(self) -> Path:
+        return self.models_dir / self.model_version
+    
     def load_model(self):
         """Load trained model from disk."""
-        if not self.model_path.exists():
-            logger.warning(f"Model not found: {self.model_path}")
+        self._active = self._load(self.version or config.MODEL_VERSION, allow_dummy=True)
+    
+    def _load(self, version: str, allow_dummy: bool = False) -> LoadedModel:
+        """
+        Load a model version and prepare its inference paths.
+        
+        Does not touch the active model, so it can run in the background.
+        
+        Args:
+            version: Model filename in the models directory
+            allow_dummy: Fall back to a dummy model if loading fails
+            
+        Returns:
+            LoadedModel (not loaded if loading failed and no dummy allowed)
+        """
+        loaded = LoadedModel(version, self.models_dir / version)
+        
+        if config.INFERENCE_BACKEND != 'keras' and self._load_backend(loaded):
+            if self.shadow_versions:
+                # Shadows stay Keras models, run next to the exported primary
+                self._load_shadows(loaded)
+                if config.FAST_INFERENCE and loaded.shadow_models:
+                    loaded.infer_shadow_batch = self._compile_batch_call(loaded.shadow_models)
+            if config.CASCADE_GATE:
+                self._load_gate(loaded)
+            return loaded
+        
+        if not loaded.path.exists():
+            logger.warning(f"Model not found: {loaded.path}")
+            if not allow_dummy:
+                return loaded
             logger.warning("Using dummy model for testing. Train a model first!")
-            self.model = self._create_dummy_model()
+            loaded.model = self._create_dummy_model()
+        else:
+            try:
+                loaded.model = keras.models.load_model(str(loaded.path))
+                logger.info(f"Model loaded: {loaded.path}")
+            except Exception as e:
+                logger.error(f"Error loading model: {e}")
+                if not allow_dummy:
+                    return loaded
+                logger.warning("Using dummy model instead")
+                loaded.model = self._create_dummy_model()
+        
+        if self.shadow_versions:
+            self._load_shadows(loaded)
+        
+        if config.CASCADE_GATE:
+            self._load_gate(loaded)
+        
+        if config.FAST_INFERENCE:
+            self._build_fast_path(loaded)
+        
+        if config.STREAMING_INFERENCE:
+            if loaded.shadow_models:
+                logger.warning("Streaming inference disabled while shadow models are evaluated")
+            else:
+                self._build_streaming_path(loaded)
+        
+        return loaded
+    
+    def _load_shadows(self, loaded: LoadedModel):
+        """Load the shadow (candidate) models evaluated next to the primary."""
+        for version in self.shadow_versions:
+            path = self.models_dir / version
+            try:
+                loaded.shadow_models.append(keras.models.load_model(str(path)))
+                loaded.shadow_versions.append(version)
+                logger.info(f"Shadow model loaded: {path}")
+            except Exception as e:
+                logger.error(f"Error loading shadow model {path}: {e}")
+    
+    def _load_gate(self, loaded: LoadedModel):
+        """Load the cascade gate saved next to the model, if any."""
+        from .cascade_gate import CascadeGate, gate_path
+        
+        path = gate_path(loaded.path)
+        if not path.exists():
+            logger.warning(f"Cascade gate not found: {path} - every window runs the model")
             return
         
         try:
-            self.model = keras.models.load_model(str(self.model_path))
-            logger.info(f"Model loaded: {self.model_path}")
+            loaded.gate = CascadeGate.load(path)
+            logger.info(f"Cascade gate loaded: {path}")
+        except Exception as e:
+            logger.error(f"Error loading cascade gate {path}: {e}")
+    
+    def _load_backend(self, loaded: LoadedModel) -> bool:
+        """Load the exported TFLite/ONNX model selected by config."""
+        from .inference_backends import backend_path, load_backend
+        
+        quantization = None if config.BACKEND_QUANTIZATION == 'none' else config.BACKEND_QUANTIZATION
+        path = backend_path(loaded.path, config.INFERENCE_BACKEND, quantization)
+        
+        if not path.exists():
+            logger.warning(f"Exported model not found: {path}. Using Keras model instead")
+            return False
+        
+        try:
+            loaded.backend = load_backend(config.INFERENCE_BACKEND, path)
+            loaded.backend.predict(np.zeros(self._input_shape, dtype=np.float32))  # warm-up
+            loaded.mtime = path.stat().st_mtime
+            logger.info(f"Model loaded ({config.INFERENCE_BACKEND} backend): {path}")
+            return True
+        except Exception as e:
+            logger.error(f"Error loading {config.INFERENCE_BACKEND} model: {e}")
+            logger.warning("Using Keras model instead")
+            loaded.backend = None
+            return False
+    
+    def _build_streaming_path(self, loaded: LoadedModel):
+        """Export the LSTM weights as a stateful single-step model."""
+        from .streaming_inference import StreamingLSTM
+        
+        try:
+            loaded.streaming = StreamingLSTM(loaded.model)
+            logger.info(
+                f"Streaming inference enabled (re-sync every {loaded.streaming.resync_interval} frames)"
+            )
+        except ValueError as e:
+            logger.warning(f"Streaming inference unavailable, using full windows: {e}")
+            loaded.streaming = None
+    
+    def _build_fast_path(self, loaded: LoadedModel):
+        """
+        Compile a fixed-signature single-window call and warm it up.
+        
+        keras `predict` builds a data adapter and callback stack on every call,
+        which costs far more than the model itself for a batch of one. The
+        compiled call is traced once here, so the first real frame does not pay
+        for tracing either. Shadow models run inside the same call.
+        
+        The call returns an array of shape (n_models, 1, len(ACTIONS)), primary first.
+        A second call with a dynamic batch dimension serves small batches, its
+        output shaped (n_models, batch_size, len(ACTIONS)) the same way. With
+        shadow models a third, primary-only batch call serves callers that
+        skip them.
+        """
+        models = [loaded.model] + loaded.shadow_models
+        
+        @tf.function(
+            input_signature=[tf.TensorSpec(self._input_shape, tf.float32)],
+            reduce_retracing=True
+        )
+        def infer(x):
+            return tf.stack([model(x, training=False) for model in models])
+        
+        try:
+            infer(np.zeros(self._input_shape, dtype=np.float32))
+            loaded.infer_batch = self._compile_batch_call(models)
+            loaded.infer_primary_batch = (
+                self._compile_batch_call([loaded.model]) if loaded.shadow_models else loaded.infer_batch
+            )
+            loaded.infer = infer
+            logger.info("Fast inference path compiled and warmed up")
         except Exception as e:
-            logger.error(f"Error loading model: {e}")
-            logger.warning("Using dummy model instead")
-            self.model = self._create_dummy_model()
+            logger.warning(f"Fast inference path unavailable, using model.predict: {e}")
+            loaded.infer = None
+            loaded.infer_batch = None
+            loaded.infer_primary_batch = None
+    
+    def _compile_batch_call(self, models: list):
+        """
+        Compile and warm up a call running `models` on a batch of any size.
+        
+        The call returns an array of shape (len(models), batch_size, len(ACTIONS)).
+        """
+        @tf.function(
+            input_signature=[tf.TensorSpec((None,) + self._input_shape[1:], tf.float32)],
+            reduce_retracing=True
+        )
+        def infer_batch(x):
+            return tf.stack([model(x, training=False) for model in models])
+        
+        infer_batch(np.zeros(self._input_shape, dtype=np.float32))
+        return infer_batch
+    
+    def reload(self, version: str = None, block: bool = False) -> bool:
+        """
+        Load a model version in the background and swap it in.
+        
+        The new model is loaded and warmed up off the hot path; the swap is a
+        single reference assignment between predictions. Callers' FrameBuffers
+        are untouched, and a streaming model re-syncs on the next full window.
+        If loading fails the current model stays active.
+        
+        Args:
+            version: Model filename (default: reload the current version)
+            block: Wait for the reload to finish
+            
+        Returns:
+            True if the reload was started (or, with block=True, succeeded)
+        """
+        version = version or self.model_version
+        
+        if not block:
+            threading.Thread(
+                target=self.reload, args=(version, True), name="ModelReload", daemon=True
+            ).start()
+            return True
+        
+        with self._reload_lock:
+            logger.info(f"Reloading model: {version}")
+            loaded = self._load(version)
+            
+            if not loaded.loaded:
+                logger.error(f"Model reload failed, keeping {self.model_version}")
+                return False
+            
+            self._active = loaded
+            self._close_shadow_log()  # Reopened with the new versions' rows
+            self.version = version
+            logger.info(f"Model swapped in: {version}")
+            return True
+    
+    def watch(self, interval: float = None):
+        """
+        Watch the models directory and hot-reload on changes.
+        
+        Reloads when the active model file is rewritten, or when the pointer
+        file (config.MODEL_POINTER_FILE) names a different version.
+        
+        Args:
+            interval: Poll interval in seconds (default: config.MODEL_WATCH_INTERVAL)
+        """
+        interval = interval or config.MODEL_WATCH_INTERVAL
+        
+        if self._watcher is not None:
+            return
+        
+        def poll():
+            while self._watching:
+                time.sleep(interval)
+                try:
+                    version = self._watched_version()
+                    if version is not None:
+                        self.reload(version, block=True)
+                except Exception as e:
+                    logger.error(f"Model watcher error: {e}")
+        
+        self._watching = True
+        self._watcher = threading.Thread(target=poll, name="ModelWatcher", daemon=True)
+        self._watcher.start()
+        logger.info(f"Watching {self.models_dir} for model changes (every {interval}s)")
+    
+    def stop_watching(self):
+        self._watching = False
+        self._watcher = None
+    
+    def close(self):
+        """Stop watching the models directory and close the shadow log."""
+        self.stop_watching()
+        self._close_shadow_log()
+    
+    def _watched_version(self) -> Optional[str]:
+        """Version to reload, if the models directory changed."""
+        active = self._active
+        pointer = self.models_dir / config.MODEL_POINTER_FILE
+        
+        if pointer.exists():
+            version = pointer.read_text().strip()
+            if version and version != active.version:
+                return version
+        
+        # Active model written since it was loaded: rewritten in place (e.g.
+        # retrained), or created after a start without it (dummy model)
+        path = active.backend.path if active.backend is not None else active.path
+        if path.exists() and path.stat().st_mtime != active.mtime:
+            return active.version
+        
+        return None
+    
+    def _predict_window(self, sequence: np.ndarray, frame_idx: int = None, stream_id: str = None) -> np.ndarray:
+        """
+        Class probabilities for a single window.
+        
+        Shadow model probabilities, if any, are logged and not returned.
+        
+        Args:
+            sequence: Array of shape (sequence_length, feature_dim) or (1, sequence_length, feature_dim)
+            frame_idx: Frame the window ends at (for the shadow log)
+            stream_id: Video or live session the window belongs to (for the shadow log)
+            
+        Returns:
+            Array of shape (len(ACTIONS),)
+        """
+        active = self._active
+        
+        if active.backend is not None:
+            window = self._window_input(sequence)
+            outputs = active.backend.predict(window)[np.newaxis]
+            if active.shadow_models:
+                outputs = np.concatenate([outputs, self._shadow_outputs(active, window)])
+                self._log_shadow_predictions(active, outputs, [frame_idx], [stream_id])
+            return outputs[0, 0]
+        
+        if active.infer is not None and sequence.size == np.prod(self._input_shape):
+            window = self._window_input(sequence)
+            outputs = active.infer(window).numpy()[:, 0]
+        else:
+            # Add batch dimension
+            if len(sequence.shape) == 2:
+                sequence = np.expand_dims(sequence, axis=0)
+            
+            models = [active.model] + active.shadow_models
+            outputs = np.stack([model.predict(sequence, verbose=0)[0] for model in models])
+        
+        if len(outputs) > 1:
+            self._log_shadow_predictions(active, outputs[:, np.newaxis], [frame_idx], [stream_id])
+        
+        return outputs[0]
+    
+    def _window_input(self, sequence: np.ndarray) -> np.ndarray:
+        """Copy a window into the calling thread's reusable input."""
+        window = getattr(self._thread_input, 'window', None)
+        if window is None:
+            window = self._thread_input.window = np.zeros(self._input_shape, dtype=np.float32)
+        np.copyto(window, sequence.reshape(self._input_shape))
+        return window
+    
+    def _log_shadow_predictions(
+        self,
+        active: LoadedModel,
+        outputs: np.ndarray,
+        frame_indices=None,
+        stream_ids=None
+    ):
+        """
+        Append primary and shadow probabilities to the shadow log.
+        
+        One CSV row per window and model: time, stream_id, frame_idx,
+        model_version, role, then one probability column per action. The
+        file is per day (logs/shadow_predictions_YYYYMMDD.csv).
+        
+        Args:
+            active: Model whose primary and shadows produced `outputs`
+            outputs: Array of shape (n_models, n_windows, len(ACTIONS)), primary first
+            frame_indices: Frame each window ends at (None: unknown)
+            stream_ids: Video or live session of each window (None: unknown)
+        """
+        count = outputs.shape[1]
+        frame_indices = [None] * count if frame_indices is None else frame_indices
+        stream_ids = [None] * count if stream_ids is None else stream_ids
+        versions = [active.version] + active.shadow_versions
+        now = f"{time.time():.3f}"
+        
+        lines = []
+        for stream_id, frame_idx, window_outputs in zip(stream_ids, frame_indices, outputs.transpose(1, 0, 2)):
+            stream = '' if stream_id is None else str(stream_id)
+            frame = '' if frame_idx is None else str(frame_idx)
+            for i, (version, probabilities) in enumerate(zip(versions, window_outputs)):
+                role = 'primary' if i == 0 else 'shadow'
+                values = ",".join(f"{p:.6f}" for p in probabilities)
+                lines.append(f"{now},{stream},{frame},{version},{role},{values}\n")
+        
+        with self._shadow_log_lock:
+            today = time.strftime('%Y%m%d')
+            if self._shadow_log is None or self._shadow_log_date != today:
+                self._open_shadow_log(today)
+            self._shadow_log.write("".join(lines))
+    
+    def _open_shadow_log(self, date: str):
+        """Open the shadow log of a day (closing the previous day's)."""
+        if self._shadow_log is not None:
+            self._shadow_log.close()
+        
+        log_dir = Path(config.LOGS_DIR)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        path = log_dir / f"shadow_predictions_{date}.csv"
+        is_new = not path.exists()
+        self._shadow_log = open(path, 'a', buffering=1)
+        self._shadow_log_date = date
+        if is_new:
+            self._shadow_log.write(
+                "time,stream_id,frame_idx,model_version,role," + ",".join(a.lower() for a in self.ACTIONS) + "\n"
+            )
+    
+    def _close_shadow_log(self):
+        with self._shadow_log_lock:
+            if self._shadow_log is not None:
+                self._shadow_log.close()
+                self._shadow_log = None
+    
+    def _predict_probabilities(
+        self,
+        sequences: np.ndarray,
+        frame_indices=None,
+        stream_ids=None,
+        shadows: bool = True
+    ) -> np.ndarray:
+        """
+        Class probabilities for a batch of windows.
+        
+        Shadow model probabilities, if any, are logged and not returned.
+        
+        Args:
+            sequences: Array of shape (batch_size, sequence_length, feature_dim)
+            frame_indices: Frame each window ends at (for the shadow log)
+            stream_ids: Video or live session of each window (for the shadow log)
+            shadows: Evaluate the shadow models too
+        """
+        active = self._active
+        
+        if active.backend is not None:
+            outputs = active.backend.predict(sequences)[np.newaxis]
+            if shadows and active.shadow_models:
+                outputs = np.concatenate([outputs, self._shadow_outputs(active, sequences)])
+        # keras `predict` overhead dominates small batches (e.g. from InferenceBroker)
+        elif active.infer_batch is not None and len(sequences) <= config.INFERENCE_BATCH_SIZE:
+            infer_batch = active.infer_batch if shadows else active.infer_primary_batch
+            outputs = infer_batch(np.asarray(sequences, dtype=np.float32)).numpy()
+        else:
+            models = [active.model] + (active.shadow_models if shadows else [])
+            outputs = np.stack([model.predict(sequences, verbose=0) for model in models])
+        
+        if shadows and len(outputs) > 1:
+            self._log_shadow_predictions(active, outputs, frame_indices, stream_ids)
+        
+        return outputs[0]
+    
+    def _shadow_outputs(self, active: LoadedModel, sequences: np.ndarray) -> np.ndarray:
+        """Shadow probabilities next to an exported primary, shaped (n_shadows, batch_size, len(ACTIONS))."""
+        if active.infer_shadow_batch is not None and len(sequences) <= config.INFERENCE_BATCH_SIZE:
+            return active.infer_shadow_batch(np.asarray(sequences, dtype=np.float32)).numpy()
+        return np.stack([model.predict(sequences, verbose=0) for model in active.shadow_models])
     
     def _create_dummy_model(self) -> keras.Model:
         """Create a dummy model for testing."""
@@ -57,43 +541,155 @@ class ModelInference:
         logger.warning("Dummy model created - predictions will be random!")
         return model
     
-    def predict(self, sequence: np.ndarray) -> Tuple[str, float]:
+    def to_action(self, probabilities: np.ndarray) -> Tuple[str, float]:
+        """
+        Action with the highest probability.
+        
+        An all-zero vector (no prediction: model not loaded, error, or
+        window rejected by the cascade gate) maps to ('IGNORE', 0.0).
+        """
+        if not probabilities.any():
+            return 'IGNORE', 0.0
+        
+        action_idx = int(np.argmax(probabilities))
+        return self.ACTIONS[action_idx], float(probabilities[action_idx])
+    
+    def _no_prediction(self, count: int = None) -> np.ndarray:
+        """All-zero probabilities for windows without a prediction."""
+        shape = (len(self.ACTIONS),) if count is None else (count, len(self.ACTIONS))
+        return np.zeros(shape, dtype=np.float32)
+    
+    def predict_proba(self, sequence: np.ndarray, frame_idx: int = None, stream_id: str = None) -> np.ndarray:
+        """
+        Class probabilities for a sequence of frames.
+        
+        Args:
+            sequence: Array of shape (sequence_length, feature_dim)
+            frame_idx: Frame the window ends at (used for logging only)
+            stream_id: Video or live session id (used for logging only)
+            
+        Returns:
+            Array of shape (len(ACTIONS),); all zeros if there is no prediction
+        """
+        if not self._active.loaded:
+            logger.error("Model not loaded")
+            return self._no_prediction()
+        
+        try:
+            gate = self._active.gate
+            if gate is not None and not gate.passes_window(sequence):
+                return self._no_prediction()
+            
+            probabilities = self._predict_window(sequence, frame_idx, stream_id)
+            logger.debug(f"All probabilities: {dict(zip(self.ACTIONS, probabilities))}")
+            
+            return probabilities
+            
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            return self._no_prediction()
+    
+    def predict(self, sequence: np.ndarray, frame_idx: int = None) -> Tuple[str, float]:
         """
         Predict action from sequence of frames.
         
         Args:
             sequence: Array of shape (sequence_length, feature_dim)
+            frame_idx: Frame the window ends at (used for logging only)
             
         Returns:
             Tuple of (action, confidence)
             action: One of ACTIONS
             confidence: Probability score (0-1)
         """
-        if self.model is None:
-            logger.error("Model not loaded")
-            return 'IGNORE', 0.0
+        action, confidence = self.to_action(self.predict_proba(sequence, frame_idx))
+        logger.debug(f"Prediction: {action} ({confidence:.2f})")
+        
+        return action, confidence
+    
+    def predict_frame_proba(self, frame_buffer, stream_id: str = None) -> np.ndarray:
+        """
+        Class probabilities for the newest frame of a FrameBuffer.
+        
+        Uses the streaming single-step path when enabled, otherwise the
+        full window. Call once per frame added to the buffer. Windows the
+        cascade gate rejects get no prediction (all zeros); the streaming
+        state then re-syncs on the next window that passes.
+        
+        Args:
+            frame_buffer: A ready FrameBuffer
+            stream_id: Video or live session id (used for logging only)
+            
+        Returns:
+            Array of shape (len(ACTIONS),)
+        """
+        active = self._active  # One snapshot, so a reload can't mix models
+        streaming = active.streaming
+        
+        if streaming is None:
+            return self.predict_proba(frame_buffer.get_sequence(), frame_buffer.last_frame_idx, stream_id)
         
         try:
-            # Add batch dimension
-            if len(sequence.shape) == 2:
-                sequence = np.expand_dims(sequence, axis=0)
+            gate = active.gate
+            if gate is not None and not gate.passes_window(frame_buffer.get_sequence()):
+                return self._no_prediction()
             
-            # Predict
-            predictions = self.model.predict(sequence, verbose=0)
+            return streaming.update(frame_buffer)
             
-            # Get action with highest probability
-            action_idx = np.argmax(predictions[0])
-            confidence = float(predictions[0][action_idx])
-            action = self.ACTIONS[action_idx]
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            return self._no_prediction()
+    
+    def predict_frame(self, frame_buffer) -> Tuple[str, float]:
+        """
+        Predict action for the newest frame of a FrameBuffer.
+        
+        See predict_frame_proba.
+        
+        Args:
+            frame_buffer: A ready FrameBuffer
+            
+        Returns:
+            Tuple of (action, confidence)
+        """
+        return self.to_action(self.predict_frame_proba(frame_buffer))
+    
+    def predict_batch_proba(self, sequences: np.ndarray, frame_indices=None, stream_ids=None) -> np.ndarray:
+        """
+        Class probabilities for multiple sequences.
+        
+        With a cascade gate only the windows it passes reach the model; the
+        others get all-zero rows.
+        
+        Args:
+            sequences: Array of shape (batch_size, sequence_length, feature_dim)
+            frame_indices: Frame each window ends at (used for logging only)
+            stream_ids: Video or live session id of each window (used for logging only)
             
-            logger.debug(f"Prediction: {action} ({confidence:.2f})")
-            logger.debug(f"All probabilities: {dict(zip(self.ACTIONS, predictions[0]))}")
+        Returns:
+            Array of shape (batch_size, len(ACTIONS))
+        """
+        if not self._active.loaded:
+            return self._no_prediction(len(sequences))
+        
+        try:
+            gate = self._active.gate
+            if gate is None:
+                return self._predict_probabilities(sequences, frame_indices, stream_ids)
             
-            return action, confidence
+            passed = gate.passes(sequences)
+            predictions = self._no_prediction(len(sequences))
+            if passed.any():
+                predictions[passed] = self._predict_probabilities(
+                    sequences[passed],
+                    None if frame_indices is None else np.asarray(frame_indices, dtype=object)[passed],
+                    None if stream_ids is None else np.asarray(stream_ids, dtype=object)[passed]
+                )
+            return predictions
             
         except Exception as e:
-            logger.error(f"Prediction error: {e}")
-            return 'IGNORE', 0.0
+            logger.error(f"Batch prediction error: {e}")
+            return self._no_prediction(len(sequences))
     
     def predict_batch(self, sequences: np.ndarray) -> list:
         """
@@ -105,65 +701,115 @@ class ModelInference:
         Returns:
             List of (action, confidence) tuples
         """
-        if self.model is None:
-            return [('IGNORE', 0.0)] * len(sequences)
+        return [self.to_action(pred) for pred in self.predict_batch_proba(sequences)]
+    
+    def predict_windows_proba(
+        self,
+        vectors: np.ndarray,
+        batch_size: int = None,
+        frame_indices: np.ndarray = None,
+        stream_id: str = None
+    ) -> np.ndarray:
+        """
+        Class probabilities for every sliding window over a sequence of frames.
         
-        try:
-            predictions = self.model.predict(sequences, verbose=0)
-            
-            results = []
-            for pred in predictions:
-                action_idx = np.argmax(pred)
-                confidence = float(pred[action_idx])
-                action = self.ACTIONS[action_idx]
-                results.append((action, confidence))
+        Windows are strided views of `vectors` (no copy); each batch is copied
+        once into a contiguous array for the model.
+        
+        Args:
+            vectors: Array of shape (n_frames, feature_dim)
+            batch_size: Windows per model call (default: config.INFERENCE_BATCH_SIZE)
+            frame_indices: Frame index of each row of `vectors` (used for logging only)
+            stream_id: Video id (used for logging only)
             
-            return results
+        Returns:
+            Array of shape (n_windows, len(ACTIONS)); row i is the window
+            ending at frame i + sequence_length - 1
+        """
+        batch_size = batch_size or config.INFERENCE_BATCH_SIZE
+        
+        if len(vectors) < config.SEQUENCE_LENGTH:
+            return self._no_prediction(0)
+        
+        # (n_windows, feature_dim, sequence_length) -> (n_windows, sequence_length, feature_dim)
+        windows = np.lib.stride_tricks.sliding_window_view(
+            vectors, config.SEQUENCE_LENGTH, axis=0
+        ).transpose(0, 2, 1)
+        
+        # Window i ends at frame i + SEQUENCE_LENGTH - 1
+        ends = None if frame_indices is None else frame_indices[config.SEQUENCE_LENGTH - 1:]
+        
+        probabilities = self._no_prediction(len(windows))
+        for start in range(0, len(windows), batch_size):
+            batch = np.ascontiguousarray(windows[start:start + batch_size], dtype=np.float32)
+            probabilities[start:start + len(batch)] = self.predict_batch_proba(
+                batch,
+                None if ends is None else ends[start:start + len(batch)],
+                None if stream_id is None else [stream_id] * len(batch)
+            )
+        
+        logger.info(f"Predicted {len(probabilities)} windows in batches of {batch_size}")
+        return probabilities
+    
+    def predict_windows(self, vectors: np.ndarray, batch_size: int = None) -> list:
+        """
+        Predict actions for every sliding window over a sequence of frames.
+        
+        Args:
+            vectors: Array of shape (n_frames, feature_dim)
+            batch_size: Windows per model call (default: config.INFERENCE_BATCH_SIZE)
             
-        except Exception as e:
-            logger.error(f"Batch prediction error: {e}")
-            return [('IGNORE', 0.0)] * len(sequences)
+        Returns:
+            List of (action, confidence) tuples; entry i is the window ending
+            at frame i + sequence_length - 1
+        """
+        return [self.to_action(pred) for pred in self.predict_windows_proba(vectors, batch_size)]
     
-    def evaluate(self, X_test: np.ndarray, y_test: np.ndarray) -> dict:
+    def evaluate(
+        self,
+        X_test,
+        y_test,
+        chunk_size: int = 4096,
+        thresholds: list = None
+    ) -> dict:
         """
-        Evaluate model on test data.
+        Evaluate model on test data in a single inference pass.
+        
+        Data is read in chunks, so memory-mapped datasets larger than RAM
+        work; metrics are accumulated by StreamingEvaluator.
         
         Args:
-            X_test: Test sequences
-            y_test: True labels (one-hot encoded)
+            X_test: Test sequences, or path to an .npy file (memory-mapped)
+            y_test: True labels (one-hot or class indices), or path to an .npy file
+            chunk_size: Windows read and predicted per step
+            thresholds: CONFIDENCE_THRESHOLD values to sweep (default 0.50-0.95)
             
         Returns:
-            Dictionary with metrics
+            Dictionary with metrics and the threshold sweep
         """
-        if self.model is None:
+        from .evaluation import StreamingEvaluator, load_array
+        
+        if not self._active.loaded:
             return {'error': 'Model not loaded'}
         
         try:
-            loss, accuracy = self.model.evaluate(X_test, y_test, verbose=0)
-            
-            # Get predictions
-            predictions = self.model.predict(X_test, verbose=0)
-            y_pred = np.argmax(predictions, axis=1)
-            y_true = np.argmax(y_test, axis=1)
+            X_test = load_array(X_test)
+            y_test = load_array(y_test)
+            evaluator = StreamingEvaluator(self.ACTIONS, thresholds)
             
-            # Calculate per-class metrics
-            from sklearn.metrics import classification_report, confusion_matrix
+            for start in range(0, len(X_test), chunk_size):
+                chunk = np.ascontiguousarray(X_test[start:start + chunk_size], dtype=np.float32)
+                evaluator.update(
+                    self._predict_probabilities(chunk, shadows=False),
+                    np.asarray(y_test[start:start + chunk_size])
+                )
             
-            report = classification_report(
-                y_true,
-                y_pred,
-                target_names=self.ACTIONS,
-                output_dict=True
+            results = evaluator.result()
+            logger.info(
+                f"Evaluated {results['samples']} windows: accuracy {results['accuracy']:.3f}, "
+                f"loss {results['loss']:.4f}"
             )
-            
-            cm = confusion_matrix(y_true, y_pred)
-            
-            return {
-                'loss': float(loss),
-                'accuracy': float(accuracy),
-                'report': report,
-                'confusion_matrix': cm.tolist()
-            }
+            return results
             
         except Exception as e:
             logger.error(f"Evaluation error: {e}")
@@ -175,21 +821,30 @@ class ModelTrainer:
     
     def __init__(self):
         self.model = None
+        self.gate = None
+        self.version = None  # Default save_model filename (None: MODEL_VERSION)
     
     def build_model(self, architecture: str = 'lstm') -> keras.Model:
         """
         Build model architecture.
         
         Args:
-            architecture: 'lstm' or 'transformer'
+            architecture: 'lstm' or 'transformer' (chart features), or
+                'candles' for numeric candle windows
+                (NumericFeatureExtractor.training_windows), saved as
+                CANDLE_MODEL_VERSION
             
         Returns:
             Compiled Keras model
         """
+        self.version = None
         if architecture == 'lstm':
             model = self._build_lstm_model()
         elif architecture == 'transformer':
             model = self._build_transformer_model()
+        elif architecture == 'candles':
+            model = self._build_candle_model()
+            self.version = config.CANDLE_MODEL_VERSION
         else:
             raise ValueError(f"Unknown architecture: {architecture}")
         
@@ -219,6 +874,32 @@ class ModelTrainer:
         logger.info(f"LSTM model built: {model.count_params()} parameters")
         return model
     
+    def _build_candle_model(self) -> keras.Model:
+        """
+        Build the model for numeric candle windows (LIVE_FEATURES=candles).
+        
+        Smaller than the chart LSTM: the candle features are dense and
+        already normalized, and the padding columns stay zero.
+        """
+        model = keras.Sequential([
+            keras.layers.Input(shape=(config.SEQUENCE_LENGTH, config.FEATURE_DIM)),
+            keras.layers.LSTM(64, return_sequences=True),
+            keras.layers.Dropout(0.2),
+            keras.layers.LSTM(32),
+            keras.layers.Dense(32, activation='relu'),
+            keras.layers.Dropout(0.2),
+            keras.layers.Dense(3, activation='softmax')  # IGNORE, ENTER, EXIT
+        ], name='candles')
+        
+        model.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=0.001),
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        logger.info(f"Candle model built: {model.count_params()} parameters")
+        return model
+    
     def _build_transformer_model(self) -> keras.Model:
         """Build Transformer-based model."""
         # Simplified transformer architecture
@@ -307,13 +988,388 @@ class ModelTrainer:
         
         return history.history
     
+    def train_gate(
+        self,
+        X_train: np.ndarray,
+        X_val: np.ndarray,
+        target_recall: float = None
+    ) -> dict:
+        """
+        Train the cascade gate against the trained model.
+        
+        The gate target is whether the model's own prediction for a window is
+        actionable (ENTER/EXIT at or above CONFIDENCE_THRESHOLD), so no labels
+        are needed. Saved next to the model by save_model.
+        
+        Args:
+            X_train: Training sequences
+            X_val: Held-out sequences for the report
+            target_recall: Fraction of actionable windows the gate must pass
+                (default: config.CASCADE_TARGET_RECALL)
+            
+        Returns:
+            Held-out report (recall loss, pass rate, compute saved)
+        """
+        from .cascade_gate import CascadeGate
+        
+        if self.model is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        
+        target_recall = target_recall or config.CASCADE_TARGET_RECALL
+        
+        train_targets = self._actionable(self.model.predict(X_train, verbose=0))
+        val_targets = self._actionable(self.model.predict(X_val, verbose=0))
+        
+        logger.info(
+            f"Training cascade gate: {int(train_targets.sum())}/{len(X_train)} actionable windows, "
+            f"target recall {target_recall:.3f}"
+        )
+        self.gate = CascadeGate.fit(X_train, train_targets, target_recall=target_recall)
+        
+        # Single-window model latency, to express skipped windows as time saved
+        model_ms = self._window_latency_ms(self.model, X_val)
+        
+        return self.gate.report(X_val, val_targets, model_ms=model_ms)
+    
+    @staticmethod
+    def _window_latency_ms(model: keras.Model, windows: np.ndarray, samples: int = 50) -> float:
+        """Mean single-window latency of a model's compiled call, in milliseconds."""
+        infer = tf.function(lambda x: model(x, training=False))
+        infer(tf.constant(windows[:1], dtype=tf.float32))  # trace
+        
+        samples = min(len(windows), samples)
+        start = time.perf_counter()
+        for i in range(samples):
+            infer(tf.constant(windows[i:i + 1], dtype=tf.float32))
+        return (time.perf_counter() - start) / max(samples, 1) * 1000.0
+    
+    @staticmethod
+    def _actionable(probabilities: np.ndarray) -> np.ndarray:
+        """Windows whose prediction would produce a signal."""
+        actions = np.argmax(probabilities, axis=1)
+        return (actions != ModelInference.ACTIONS.index('IGNORE')) & (
+            probabilities.max(axis=1) >= config.CONFIDENCE_THRESHOLD
+        )
+    
+    def _build_student_model(self, architecture: str = 'gru') -> keras.Model:
+        """
+        Build a small student model for distillation.
+        
+        The student ends in a 'logits' Dense layer followed by softmax, so it
+        is a drop-in replacement for the teacher (same input, probabilities
+        out) while distillation can train on temperature-scaled logits.
+        """
+        if architecture == 'gru':
+            body = [keras.layers.GRU(32)]
+        elif architecture == 'conv1d':
+            body = [
+                keras.layers.Conv1D(32, kernel_size=5, activation='relu'),
+                keras.layers.Conv1D(32, kernel_size=5, strides=2, activation='relu'),
+                keras.layers.GlobalAveragePooling1D()
+            ]
+        else:
+            raise ValueError(f"Unknown student architecture: {architecture}")
+        
+        model = keras.Sequential([
+            keras.layers.Input(shape=(config.SEQUENCE_LENGTH, config.FEATURE_DIM)),
+            *body,
+            keras.layers.Dense(len(ModelInference.ACTIONS), name='logits'),
+            keras.layers.Activation('softmax')
+        ])
+        
+        logger.info(f"Student model built ({architecture}): {model.count_params()} parameters")
+        return model
+    
+    def distill(
+        self,
+        X_train: np.ndarray = None,
+        X_val: np.ndarray = None,
+        y_val: np.ndarray = None,
+        architecture: str = 'gru',
+        temperature: float = 2.0,
+        epochs: int = 30,
+        batch_size: int = 64,
+        student_version: str = None
+    ) -> dict:
+        """
+        Distill the trained model into a small CPU-lean student.
+        
+        The student learns the teacher's temperature-softened predictions,
+        so unlabeled windows (e.g. from the FeatureStore) are enough. It is
+        saved under MODELS_DIR as a model version that can replace
+        MODEL_VERSION directly.
+        
+        Args:
+            X_train: Training windows (default: sampled from the FeatureStore)
+            X_val: Held-out windows for the report (default: 20% of X_train)
+            y_val: Optional one-hot labels for X_val, to report true accuracy
+            architecture: 'gru' or 'conv1d'
+            temperature: Softening temperature for teacher and student
+            epochs: Number of training epochs
+            batch_size: Batch size
+            student_version: Filename for the student (default: <model>_student_<architecture>.h5)
+            
+        Returns:
+            Report with the student version, parameter counts, single-window
+            latencies and agreement/accuracy of teacher and student
+        """
+        if self.model is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        
+        if X_train is None:
+            from .feature_store import FeatureStore
+            X_train = FeatureStore().sample_windows(100000)
+            if not len(X_train):
+                raise ValueError("No training windows given and none stored in FEATURES_DIR")
+        
+        if X_val is None:
+            split = int(len(X_train) * 0.8)
+            X_train, X_val = X_train[:split], X_train[split:]
+        
+        teacher = self.model
+        student = self._build_student_model(architecture)
+        
+        # Temperature-softened teacher targets: softmax(log p / T)
+        teacher_probs = teacher.predict(X_train, verbose=0)
+        soft_targets = np.exp(np.log(np.clip(teacher_probs, 1e-7, 1.0)) / temperature)
+        soft_targets /= soft_targets.sum(axis=1, keepdims=True)
+        
+        # Train through softmax(logits / T); the saved student keeps plain softmax
+        logits = student.get_layer('logits').output
+        softened = keras.layers.Activation('softmax')(keras.layers.Rescaling(1.0 / temperature)(logits))
+        distiller = keras.Model(student.inputs, softened)
+        distiller.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=0.003),
+            loss='kl_divergence'
+        )
+        
+        logger.info(
+            f"Distilling {teacher.count_params()} -> {student.count_params()} parameters "
+            f"on {len(X_train)} windows (T={temperature})"
+        )
+        distiller.fit(
+            X_train,
+            soft_targets,
+            validation_split=0.1,
+            epochs=epochs,
+            batch_size=batch_size,
+            callbacks=[keras.callbacks.EarlyStopping(patience=5, restore_best_weights=True)],
+            verbose=1
+        )
+        
+        student.compile(
+            optimizer='adam',
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+        
+        teacher_val = teacher.predict(X_val, verbose=0)
+        student_val = student.predict(X_val, verbose=0)
+        
+        report = {
+            'architecture': architecture,
+            'teacher_params': int(teacher.count_params()),
+            'student_params': int(student.count_params()),
+            'teacher_ms': self._window_latency_ms(teacher, X_val),
+            'student_ms': self._window_latency_ms(student, X_val),
+            'agreement': float(np.mean(np.argmax(teacher_val, axis=1) == np.argmax(student_val, axis=1))),
+            'max_abs_diff': float(np.abs(teacher_val - student_val).max())
+        }
+        
+        if y_val is not None:
+            labels = np.argmax(y_val, axis=1)
+            report['teacher_accuracy'] = float(np.mean(np.argmax(teacher_val, axis=1) == labels))
+            report['student_accuracy'] = float(np.mean(np.argmax(student_val, axis=1) == labels))
+        
+        stem = Path(config.MODEL_VERSION).stem
+        student_version = student_version or f"{stem}_student_{architecture}.h5"
+        student_path = Path(config.MODELS_DIR) / student_version
+        student_path.parent.mkdir(parents=True, exist_ok=True)
+        student.save(str(student_path))
+        report['model_version'] = student_version
+        
+        logger.info(
+            f"Student saved: {student_path} - agreement {report['agreement']:.3f}, "
+            f"{report['teacher_ms']:.2f} ms -> {report['student_ms']:.2f} ms per window"
+        )
+        return report
+    
     def save_model(self, model_path: Path = None):
-        """Save trained model."""
+        """
+        Save trained model (and its cascade gate, if trained).
+        
+        A gate left next to an earlier model at the same path is removed, so
+        inference never pairs the new model with a gate fitted for the old one.
+        """
+        from .cascade_gate import gate_path
+        
         if self.model is None:
             raise ValueError("No model to save")
         
-        model_path = model_path or (Path(config.MODELS_DIR) / config.MODEL_VERSION)
+        model_path = model_path or (Path(config.MODELS_DIR) / (self.version or config.MODEL_VERSION))
         model_path.parent.mkdir(parents=True, exist_ok=True)
         
         self.model.save(str(model_path))
         logger.info(f"Model saved: {model_path}")
+        
+        if self.gate is not None:
+            self.gate.save(gate_path(model_path))
+        elif gate_path(model_path).exists():
+            gate_path(model_path).unlink()
+            logger.info(f"Removed stale cascade gate: {gate_path(model_path)}")
+    
+    def export_model(
+        self,
+        formats: tuple = ('tflite', 'onnx'),
+        quantization: Optional[str] = None,
+        calibration_windows: np.ndarray = None,
+        validation_windows: np.ndarray = None,
+        model_path: Path = None
+    ) -> dict:
+        """
+        Export the model for the lightweight TFLite / ONNX Runtime backends.
+        
+        Files are written next to the Keras model (see backend_path), so that
+        INFERENCE_BACKEND and BACKEND_QUANTIZATION select them at load time.
+        Each format is exported on its own: one failing does not stop the others.
+        
+        Args:
+            formats: Any of 'tflite', 'onnx'
+            quantization: None, 'dynamic' (int8 weights) or 'int8' (weights and
+                activations, calibrated on `calibration_windows`; for TFLite
+                not supported on recurrent models)
+            calibration_windows: Windows of shape (n, sequence_length, feature_dim);
+                default: sampled from the stored feature vectors
+            validation_windows: Windows for the parity report (default: calibration windows)
+            model_path: Keras model path the exports are named after
+            
+        Returns:
+            Dictionary mapping each format to its path and parity report, or
+            to {'error': message} if its export failed
+        """
+        from .inference_backends import backend_path, load_backend, parity_report
+        
+        if self.model is None:
+            raise ValueError("No model to export")
+        
+        if quantization not in (None, 'dynamic', 'int8'):
+            raise ValueError(f"Unknown quantization: {quantization}")
+        
+        for fmt in formats:
+            if fmt not in ('tflite', 'onnx'):
+                raise ValueError(f"Unknown export format: {fmt}")
+        
+        model_path = model_path or (Path(config.MODELS_DIR) / (self.version or config.MODEL_VERSION))
+        model_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if calibration_windows is None and (quantization == 'int8' or validation_windows is None):
+            from .feature_store import FeatureStore
+            calibration_windows = FeatureStore().sample_windows(config.CALIBRATION_WINDOWS)
+        
+        if validation_windows is None:
+            validation_windows = calibration_windows
+        
+        model = self.model
+        signature = [tf.TensorSpec((None, config.SEQUENCE_LENGTH, config.FEATURE_DIM), tf.float32, name='input')]
+        reference_fn = tf.function(lambda x: model(x, training=False), input_signature=signature)
+        
+        results = {}
+        for fmt in formats:
+            path = backend_path(model_path, fmt, quantization)
+            
+            # The TFLite converter crashes the process (not an exception) calibrating LSTM/GRU layers
+            if fmt == 'tflite' and quantization == 'int8' and self._is_recurrent():
+                error = "int8 TFLite export of recurrent models is not supported, use quantization='dynamic'"
+                logger.error(f"Model export skipped ({fmt}): {error}")
+                results[fmt] = {'error': error}
+                continue
+            
+            try:
+                if fmt == 'tflite':
+                    self._export_tflite(path, quantization, calibration_windows)
+                else:
+                    self._export_onnx(reference_fn, signature, path, quantization, calibration_windows)
+                
+                logger.info(f"Model exported: {path}")
+                results[fmt] = {'path': str(path)}
+                
+                if validation_windows is not None and len(validation_windows):
+                    results[fmt]['report'] = parity_report(
+                        lambda x: reference_fn(x).numpy(),
+                        load_backend(fmt, path),
+                        validation_windows
+                    )
+            except Exception as e:
+                logger.error(f"Model export failed ({fmt}): {e}")
+                results[fmt] = {'error': str(e)}
+        
+        return results
+    
+    def _is_recurrent(self) -> bool:
+        return any(isinstance(layer, keras.layers.RNN) for layer in self.model.layers)
+    
+    def _export_tflite(self, path: Path, quantization: Optional[str], calibration_windows: np.ndarray):
+        """Convert to TFLite with a fixed batch of one (fused LSTM kernels)."""
+        inputs = keras.Input(batch_shape=(1, config.SEQUENCE_LENGTH, config.FEATURE_DIM))
+        fixed_batch_model = keras.Model(inputs, self.model(inputs))
+        
+        converter = tf.lite.TFLiteConverter.from_keras_model(fixed_batch_model)
+        
+        if quantization:
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        
+        if quantization == 'int8':
+            if calibration_windows is None or not len(calibration_windows):
+                raise ValueError("int8 quantization needs calibration windows")
+            
+            def representative_dataset():
+                for window in calibration_windows:
+                    yield [np.asarray(window, dtype=np.float32)[np.newaxis]]
+            
+            converter.representative_dataset = representative_dataset
+        
+        path.write_bytes(converter.convert())
+    
+    def _export_onnx(
+        self,
+        fn,
+        signature: list,
+        path: Path,
+        quantization: Optional[str],
+        calibration_windows: np.ndarray
+    ):
+        """
+        Convert to ONNX, then quantize with ONNX Runtime if requested.
+        
+        The float model a quantized export starts from is a temporary file.
+        """
+        import tf2onnx
+        
+        if quantization is None:
+            tf2onnx.convert.from_function(fn, input_signature=signature, opset=13, output_path=str(path))
+            return
+        
+        from onnxruntime.quantization import CalibrationDataReader, QuantType, quantize_dynamic, quantize_static
+        
+        if quantization == 'int8' and (calibration_windows is None or not len(calibration_windows)):
+            raise ValueError("int8 quantization needs calibration windows")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            float_path = Path(tmp) / 'float.onnx'
+            tf2onnx.convert.from_function(fn, input_signature=signature, opset=13, output_path=str(float_path))
+            
+            if quantization == 'dynamic':
+                quantize_dynamic(str(float_path), str(path), weight_type=QuantType.QInt8)
+                return
+            
+            class WindowReader(CalibrationDataReader):
+                def __init__(self):
+                    self.windows = iter(calibration_windows)
+                
+                def get_next(self):
+                    window = next(self.windows, None)
+                    if window is None:
+                        return None
+                    return {'input': np.asarray(window, dtype=np.float32)[np.newaxis]}
+            
+            quantize_static(str(float_path), str(path), WindowReader())
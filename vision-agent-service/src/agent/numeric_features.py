@@ -0,0 +1,321 @@
+"""Numeric features computed straight from OHLCV candle arrays (no chart rendering)."""
+import numpy as np
+from typing import Dict, Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..config import config
+from ..market.smc import smc_feature_columns
+
+
+# Feature schema of the candle model (LIVE_FEATURES=candles); bump when the
+# columns below change, models trained on another schema do not transfer
+FEATURE_SCHEMA = 'candles_v2'
+
+# One row per candle, in this column order, zero-padded to FEATURE_DIM
+CANDLE_FEATURES = (
+    # Returns, in ATR units over 1..20 candles, and the 1-candle log return (%)
+    'return_1', 'return_3', 'return_5', 'return_10', 'return_20', 'log_return_pct',
+    # Range and candle shape
+    'range_atr', 'range_pct', 'body', 'upper_wick', 'lower_wick', 'close_position',
+    # Volume
+    'volume_z', 'volume_ratio',
+    # Volatility
+    'volatility_pct', 'atr_pct',
+    # Position in the recent range and against moving averages (ATR units)
+    'high_20_distance', 'low_20_distance', 'sma_10_distance', 'sma_30_distance',
+    # Swing structure (fractal swing points, confirmed SWING_ORDER candles later)
+    'swing_high_distance', 'swing_low_distance', 'swing_high_age', 'swing_low_age',
+    'swing_high_structure', 'swing_low_structure', 'break_up', 'break_down',
+    # Smart Money Concepts (src/market/smc.py): trend of the last swings, position in
+    # their range, gaps completed by the candle, order blocks of the latest swings
+    'smc_trend', 'premium_discount', 'fvg_bullish', 'fvg_bearish',
+    'ob_bullish_distance', 'ob_bearish_distance'
+)
+
+# Sent with signals as the features summary
+SUMMARY_FEATURES = (
+    'return_1', 'range_atr', 'body', 'volume_z', 'atr_pct',
+    'swing_high_distance', 'swing_low_distance', 'swing_high_structure', 'swing_low_structure',
+    'break_up', 'break_down', 'smc_trend', 'premium_discount'
+)
+
+ATR_PERIOD = 14
+VOLUME_PERIOD = 20
+SWING_ORDER = 2  # A swing high is the highest high of the SWING_ORDER candles on each side
+MAX_SWING_AGE = 50  # Candles; older swings count as this old
+
+# Candles of history a row depends on (swing points aside); the window of a
+# store this much longer than SEQUENCE_LENGTH matches the full-history rows
+WARMUP = 50
+
+CLIP = 10.0
+
+
+def _columns(candles) -> Tuple[np.ndarray, ...]:
+    """(open, high, low, close, volume) float64 arrays of a CandleStore or a dict of columns."""
+    if isinstance(candles, dict):
+        get = candles.__getitem__
+    else:
+        get = lambda name: getattr(candles, name)
+    return tuple(np.asarray(get(name), dtype=np.float64) for name in ('open', 'high', 'low', 'close', 'volume'))
+
+
+def _lag(x: np.ndarray, periods: int) -> np.ndarray:
+    """x shifted `periods` candles back; the first candles repeat the first value."""
+    if periods >= len(x):
+        return np.full_like(x, x[0])
+    return np.concatenate([np.full(periods, x[0]), x[:-periods]])
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` candles (fewer at the start)."""
+    sums = np.cumsum(np.concatenate([[0.0], x]))
+    end = np.arange(1, len(x) + 1)
+    start = np.maximum(end - window, 0)
+    return (sums[end] - sums[start]) / (end - start)
+
+
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    mean = _rolling_mean(x, window)
+    return np.sqrt(np.maximum(_rolling_mean(x * x, window) - mean * mean, 0.0))
+
+
+def _rolling_extreme(x: np.ndarray, window: int, reduce) -> np.ndarray:
+    """Trailing max/min over `window` candles (edge-padded at the start)."""
+    padded = np.concatenate([np.full(window - 1, x[0]), x])
+    return reduce(sliding_window_view(padded, window), axis=1)
+
+
+def _swings(values: np.ndarray, reduce) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Last confirmed swing point per candle.
+
+    Returns:
+        (index of the last swing known at each candle, its value, the value
+        of the swing before it); index -1 and NaN values where none is known
+    """
+    n = len(values)
+    index = np.arange(n)
+    width = 2 * SWING_ORDER + 1
+
+    is_swing = np.zeros(n, dtype=bool)
+    if n >= width:
+        centre = values[SWING_ORDER:n - SWING_ORDER]
+        is_swing[SWING_ORDER:n - SWING_ORDER] = centre == reduce(sliding_window_view(values, width), axis=1)
+
+    # Known SWING_ORDER candles after the swing itself
+    confirmed = np.full(n, -1)
+    confirmed[SWING_ORDER:] = np.where(is_swing, index, -1)[:n - SWING_ORDER]
+    last = np.maximum.accumulate(confirmed)
+
+    positions = np.flatnonzero(is_swing)
+    rank = np.searchsorted(positions, last)  # Position of `last` among the swings
+    previous = np.where((last >= 0) & (rank >= 1), positions[np.maximum(rank - 1, 0)] if len(positions) else -1, -1)
+
+    nan = np.full(n, np.nan)
+    last_value = np.where(last >= 0, values[np.maximum(last, 0)], nan)
+    previous_value = np.where(previous >= 0, values[np.maximum(previous, 0)], nan)
+    return last, last_value, previous_value
+
+
+def candle_feature_matrix(candles) -> np.ndarray:
+    """
+    Feature rows of every candle, computed column-wise over the whole array.
+
+    Args:
+        candles: CandleStore, or dict with open/high/low/close/volume arrays
+
+    Returns:
+        Array of shape (candles, FEATURE_DIM), float32, columns as in CANDLE_FEATURES
+    """
+    open_, high, low, close, volume = _columns(candles)
+    n = len(close)
+    matrix = np.zeros((n, config.FEATURE_DIM), dtype=np.float32)
+    if not n:
+        return matrix
+
+    previous_close = _lag(close, 1)
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = np.maximum(_rolling_mean(true_range, ATR_PERIOD), close * 1e-8)
+    candle_range = high - low
+    safe_range = np.where(candle_range > 0, candle_range, np.inf)
+
+    log_returns = np.log(close / previous_close)
+    log_volume = np.log1p(volume)
+    volume_mean = _rolling_mean(log_volume, VOLUME_PERIOD)
+    volume_std = _rolling_std(log_volume, VOLUME_PERIOD)
+
+    swing_high, swing_high_value, previous_swing_high = _swings(high, np.max)
+    swing_low, swing_low_value, previous_swing_low = _swings(low, np.min)
+    index = np.arange(n)
+
+    columns = {
+        'return_1': (close - previous_close) / atr,
+        'return_3': (close - _lag(close, 3)) / atr,
+        'return_5': (close - _lag(close, 5)) / atr,
+        'return_10': (close - _lag(close, 10)) / atr,
+        'return_20': (close - _lag(close, 20)) / atr,
+        'log_return_pct': log_returns * 100.0,
+        'range_atr': candle_range / atr,
+        'range_pct': candle_range / close * 100.0,
+        'body': (close - open_) / safe_range,
+        'upper_wick': (high - np.maximum(open_, close)) / safe_range,
+        'lower_wick': (np.minimum(open_, close) - low) / safe_range,
+        'close_position': np.where(candle_range > 0, (close - low) / safe_range, 0.5),
+        'volume_z': np.where(volume_std > 0, (log_volume - volume_mean) / np.where(volume_std > 0, volume_std, 1.0), 0.0),
+        'volume_ratio': log_volume - volume_mean,
+        'volatility_pct': _rolling_std(log_returns, VOLUME_PERIOD) * 100.0,
+        'atr_pct': atr / close * 100.0,
+        'high_20_distance': (_rolling_extreme(high, 20, np.max) - close) / atr,
+        'low_20_distance': (close - _rolling_extreme(low, 20, np.min)) / atr,
+        'sma_10_distance': (close - _rolling_mean(close, 10)) / atr,
+        'sma_30_distance': (close - _rolling_mean(close, 30)) / atr,
+        'swing_high_distance': (swing_high_value - close) / atr,
+        'swing_low_distance': (close - swing_low_value) / atr,
+        'swing_high_age': np.where(swing_high >= 0, np.minimum(index - swing_high, MAX_SWING_AGE), MAX_SWING_AGE) / MAX_SWING_AGE,
+        'swing_low_age': np.where(swing_low >= 0, np.minimum(index - swing_low, MAX_SWING_AGE), MAX_SWING_AGE) / MAX_SWING_AGE,
+        # +1 higher high / higher low, -1 lower high / lower low, 0 unknown
+        'swing_high_structure': np.sign(swing_high_value - previous_swing_high),
+        'swing_low_structure': np.sign(swing_low_value - previous_swing_low),
+        'break_up': close > swing_high_value,
+        'break_down': close < swing_low_value,
+        **smc_feature_columns(open_, high, low, close, atr)
+    }
+
+    for i, name in enumerate(CANDLE_FEATURES):
+        matrix[:, i] = columns[name]
+
+    # NaN: no swing known yet; inf: degenerate candles
+    np.nan_to_num(matrix, copy=False, nan=0.0, posinf=CLIP, neginf=-CLIP)
+    np.clip(matrix, -CLIP, CLIP, out=matrix)
+    return matrix
+
+
+def forward_return_labels(close: np.ndarray, horizon: int = 10, threshold: float = 0.005) -> np.ndarray:
+    """
+    Baseline labels from the move over the next `horizon` candles.
+
+    ENTER when the close `horizon` candles later is at least `threshold`
+    (fraction) higher, EXIT when it is that much lower, IGNORE otherwise.
+    Use labels of your own (e.g. annotated setups) where available.
+
+    Returns:
+        Class index per candle in ModelInference.ACTIONS order
+        (0 IGNORE, 1 ENTER, 2 EXIT); -1 for the last `horizon` candles
+    """
+    close = np.asarray(close, dtype=np.float64)
+    labels = np.full(len(close), -1, dtype=np.int64)
+    if len(close) <= horizon:
+        return labels
+
+    change = close[horizon:] / close[:-horizon] - 1.0
+    labels[:-horizon] = np.where(change >= threshold, 1, np.where(change <= -threshold, 2, 0))
+    return labels
+
+
+class NumericFeatureExtractor:
+    """
+    Feature extractor for the live scanners that works on candles, not charts.
+
+    Replaces rendering plus FeatureExtractor (Canny, Hough, optical flow,
+    MediaPipe, OCR on a synthetic picture) with vectorized features of the
+    candle arrays: returns, ranges, wick ratios, volume z-scores, swing
+    structure and Smart Money Concepts state (CANDLE_FEATURES). Each timestep of a window is one candle, so
+    a window is ready as soon as the store holds SEQUENCE_LENGTH candles.
+
+    Predictions need a model trained on FEATURE_SCHEMA windows
+    (ModelTrainer.build_model('candles'), CANDLE_MODEL_VERSION).
+    """
+
+    schema = FEATURE_SCHEMA
+
+    def extract_features(self, candles, frame_idx: int) -> Dict:
+        """
+        Features of the newest candle and the window ending at it.
+
+        Args:
+            candles: CandleStore, or dict with open/high/low/close/volume arrays
+            frame_idx: Index recorded with the prediction (live: unix time)
+
+        Returns:
+            Dictionary with 'vector' (FEATURE_DIM), 'window'
+            (SEQUENCE_LENGTH x FEATURE_DIM, None until enough candles) and
+            'candles' (named values of the newest candle)
+        """
+        matrix = candle_feature_matrix(candles)
+        vector = matrix[-1] if len(matrix) else np.zeros(config.FEATURE_DIM, dtype=np.float32)
+
+        return {
+            'frame_idx': frame_idx,
+            'schema': self.schema,
+            'vector': vector,
+            'window': matrix[-config.SEQUENCE_LENGTH:] if len(matrix) >= config.SEQUENCE_LENGTH else None,
+            'candles': {name: float(vector[i]) for i, name in enumerate(CANDLE_FEATURES)}
+        }
+
+    @staticmethod
+    def summary(features: Dict) -> Dict:
+        """Compact features summary sent with a signal."""
+        values = features['candles']
+        return {
+            'feature_schema': features['schema'],
+            **{name: round(values[name], 4) for name in SUMMARY_FEATURES}
+        }
+
+    def training_windows(
+        self,
+        candles,
+        labels: Optional[np.ndarray] = None,
+        horizon: int = 10,
+        threshold: float = 0.005
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Training windows over a candle history, for ModelTrainer.train.
+
+        Window t holds the rows of candles t-SEQUENCE_LENGTH+1..t and is
+        labelled with labels[t]. Windows inside the first WARMUP candles and
+        unlabelled ones (label -1) are dropped.
+
+        Args:
+            candles: CandleStore, or dict with open/high/low/close/volume arrays
+            labels: Class index per candle (default: forward_return_labels)
+            horizon, threshold: forward_return_labels parameters
+
+        Returns:
+            (X, y): windows (N, SEQUENCE_LENGTH, FEATURE_DIM) and one-hot labels (N, 3)
+        """
+        matrix = candle_feature_matrix(candles)
+        if labels is None:
+            labels = forward_return_labels(_columns(candles)[3], horizon, threshold)
+        labels = np.asarray(labels, dtype=np.int64)
+        if len(labels) != len(matrix):
+            raise ValueError(f"{len(labels)} labels for {len(matrix)} candles")
+
+        length = config.SEQUENCE_LENGTH
+        if len(matrix) < length:
+            return (
+                np.zeros((0, length, config.FEATURE_DIM), dtype=np.float32),
+                np.zeros((0, 3), dtype=np.float32)
+            )
+
+        # (N, FEATURE_DIM, length) view -> (N, length, FEATURE_DIM)
+        windows = sliding_window_view(matrix, length, axis=0).transpose(0, 2, 1)
+        ends = np.arange(length - 1, len(matrix))
+        keep = (ends >= WARMUP) & (labels[ends] >= 0)
+
+        X = np.ascontiguousarray(windows[keep])
+        y = np.eye(3, dtype=np.float32)[labels[ends[keep]]]
+        return X, y
+
+    def get_state(self) -> None:
+        """Stateless: features depend on the candles only (scanner compatibility)."""
+        return None
+
+    def set_state(self, state: Optional[Dict]):
+        pass
+
+    def reset_state(self):
+        pass
+
+    def cleanup(self):
+        pass
@@ -0,0 +1,376 @@
+"""Append-only columnar log of every prediction, for offline replay."""
+import json
+import re
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ..config import config
+from ..utils import logger
+
+
+FORMAT_VERSION = 1
+
+# Column name -> (dtype, per-row shape); probabilities get len(actions) values
+COLUMNS = {
+    'frame_idx': ('<i8', ()),
+    'timestamp': ('<f8', ()),
+    'model': ('<u2', ()),  # Index into meta.json "models"
+    'probabilities': ('<f4', None)
+}
+
+
+def _safe_name(stream_id: str) -> str:
+    """Stream id usable as a directory name."""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', str(stream_id))
+
+
+class _Segment:
+    """One directory of column files (<column>.bin) plus meta.json."""
+
+    def __init__(self, path: Path, stream_id: str, actions: List[str]):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.stream_id = stream_id
+        self.actions = actions
+        self.models: List[str] = []
+        self.created = time.time()
+        self.rows = 0
+        self.last_flush = time.monotonic()
+        self._pending: Dict[str, list] = {name: [] for name in COLUMNS}
+        self._write_meta()
+
+    def _write_meta(self):
+        columns = {
+            name: {'dtype': dtype, 'shape': list(shape) if shape is not None else [len(self.actions)]}
+            for name, (dtype, shape) in COLUMNS.items()
+        }
+        meta = {
+            'format': FORMAT_VERSION,
+            'stream': self.stream_id,
+            'actions': self.actions,
+            'columns': columns,
+            'models': self.models,
+            'created': self.created
+        }
+        tmp = self.path / 'meta.json.tmp'
+        tmp.write_text(json.dumps(meta, indent=2))
+        tmp.replace(self.path / 'meta.json')
+
+    def append(self, frame_idx: int, timestamp: float, model_version: str, probabilities: np.ndarray):
+        if model_version not in self.models:
+            self.models.append(model_version)
+            self._write_meta()
+
+        self._pending['frame_idx'].append(frame_idx)
+        self._pending['timestamp'].append(timestamp)
+        self._pending['model'].append(self.models.index(model_version))
+        self._pending['probabilities'].append(probabilities)
+        self.rows += 1
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending['frame_idx'])
+
+    def append_block(self, frame_indices: np.ndarray, timestamps, model_version: str, probabilities: np.ndarray):
+        """Write many rows at once (after any buffered rows); `timestamps` is one value or one per row."""
+        self.flush()
+        if model_version not in self.models:
+            self.models.append(model_version)
+            self._write_meta()
+
+        count = len(frame_indices)
+        self._write({
+            'frame_idx': frame_indices,
+            'timestamp': np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (count,)),
+            'model': np.full(count, self.models.index(model_version)),
+            'probabilities': probabilities
+        })
+        self.rows += count
+
+    def _write(self, columns: Dict[str, np.ndarray]):
+        for name, (dtype, _) in COLUMNS.items():
+            with open(self.path / f'{name}.bin', 'ab') as f:
+                np.asarray(columns[name], dtype=dtype).tofile(f)
+
+    def flush(self):
+        if self.pending:
+            self._write(self._pending)
+            self._pending = {name: [] for name in COLUMNS}
+        self.last_flush = time.monotonic()
+
+
+class PredictionLog:
+    """
+    Append-only log of the class probabilities of every predicted window.
+
+    Per stream (video id, live session) rows of frame index, timestamp,
+    model version and probabilities are buffered and appended to one raw
+    little-endian file per column:
+
+        <root>/<stream>/<segment>/{frame_idx,timestamp,model,probabilities}.bin
+        <root>/<stream>/<segment>/meta.json  (dtypes, actions, model versions)
+
+    A segment rotates after `rotate_rows` rows. Files are plain arrays, so
+    `read_predictions` memory-maps them and a threshold or debounce policy
+    can be replayed over long histories without decoding or inference.
+    Rows are counted from the file sizes, so a crash loses at most the
+    unflushed buffer.
+    """
+
+    def __init__(
+        self,
+        root: Path = None,
+        actions: Sequence[str] = ('IGNORE', 'ENTER', 'EXIT'),
+        rotate_rows: int = None,
+        flush_rows: int = 256,
+        flush_seconds: float = 10.0
+    ):
+        self.root = Path(root or Path(config.LOGS_DIR) / 'predictions')
+        self.actions = list(actions)
+        self.rotate_rows = rotate_rows or config.PREDICTION_LOG_ROTATE_ROWS
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+
+        self._segments: Dict[str, _Segment] = {}
+        self._lock = threading.Lock()
+
+    def _segment(self, stream_id: str) -> _Segment:
+        segment = self._segments.get(stream_id)
+
+        if segment is None or segment.rows >= self.rotate_rows:
+            if segment is not None:
+                segment.flush()
+            stream_dir = self.root / _safe_name(stream_id)
+            sequence = len(list(stream_dir.glob('*/meta.json'))) if stream_dir.exists() else 0
+            name = f"{time.strftime('%Y%m%d_%H%M%S')}_{sequence:04d}"
+            segment = _Segment(stream_dir / name, str(stream_id), self.actions)
+            self._segments[stream_id] = segment
+            logger.debug(f"Prediction log segment: {segment.path}")
+
+        return segment
+
+    def append(
+        self,
+        stream_id: str,
+        frame_idx: int,
+        model_version: str,
+        probabilities: np.ndarray,
+        timestamp: float = None
+    ):
+        """
+        Log one prediction.
+
+        Args:
+            stream_id: Video id or live session id
+            frame_idx: Frame the window ends at
+            model_version: Model that produced the probabilities
+            probabilities: Array of shape (len(actions),); zeros mean no prediction
+            timestamp: Unix time (default: now)
+        """
+        with self._lock:
+            segment = self._segment(stream_id)
+            segment.append(
+                int(frame_idx if frame_idx is not None else -1),
+                time.time() if timestamp is None else timestamp,
+                model_version,
+                np.asarray(probabilities, dtype=np.float32)
+            )
+
+            if segment.pending >= self.flush_rows or time.monotonic() - segment.last_flush > self.flush_seconds:
+                segment.flush()
+
+    def append_many(
+        self,
+        stream_id: str,
+        frame_indices: np.ndarray,
+        model_version: str,
+        probabilities: np.ndarray,
+        timestamps=None
+    ):
+        """
+        Log a batch of predictions (e.g. the windows of an offline pass).
+
+        Args:
+            stream_id: Video id or live session id
+            frame_indices: Frame each window ends at
+            model_version: Model that produced the probabilities
+            probabilities: Array of shape (n, len(actions))
+            timestamps: Unix time per row, or one for all rows (default: now).
+                Rows sharing one timestamp cannot be debounced by seconds.
+        """
+        timestamps = np.full(len(frame_indices), time.time()) if timestamps is None else timestamps
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (len(frame_indices),))
+
+        with self._lock:
+            start = 0
+            while start < len(frame_indices):
+                segment = self._segment(stream_id)
+                end = start + max(self.rotate_rows - segment.rows, 1)
+                segment.append_block(
+                    frame_indices[start:end], timestamps[start:end], model_version, probabilities[start:end]
+                )
+                start = end
+
+    def flush(self):
+        """Write all buffered rows."""
+        with self._lock:
+            for segment in self._segments.values():
+                segment.flush()
+
+    def close(self):
+        """Flush and forget the open segments."""
+        self.flush()
+        with self._lock:
+            self._segments.clear()
+
+
+def iter_segments(root: Path = None, stream: str = None) -> Iterator[dict]:
+    """
+    Memory-map the logged segments, per stream in time order.
+
+    Args:
+        root: Log directory (default: LOGS_DIR/predictions)
+        stream: Only this stream id
+
+    Yields:
+        Dictionary with 'stream', 'actions', 'models' and one read-only
+        array per column
+    """
+    root = Path(root or Path(config.LOGS_DIR) / 'predictions')
+    pattern = f"{_safe_name(stream)}/*/meta.json" if stream else "*/*/meta.json"
+
+    # Stream by stream, segments in time order
+    for meta_path in sorted(root.glob(pattern)):
+        meta = json.loads(meta_path.read_text())
+        segment = {'stream': meta['stream'], 'actions': meta['actions'], 'models': meta['models']}
+
+        columns = {}
+        rows: Optional[int] = None
+        for name, spec in meta['columns'].items():
+            path = meta_path.parent / f'{name}.bin'
+            dtype = np.dtype(spec['dtype'])
+            width = int(np.prod(spec['shape'])) if spec['shape'] else 1
+            count = path.stat().st_size // (dtype.itemsize * width) if path.exists() else 0
+            columns[name] = (path, dtype, tuple(spec['shape']))
+            rows = count if rows is None else min(rows, count)
+
+        if not rows:
+            continue
+
+        for name, (path, dtype, shape) in columns.items():
+            segment[name] = np.memmap(path, dtype=dtype, mode='r', shape=(rows,) + shape)
+
+        yield segment
+
+
+def read_predictions(root: Path = None, stream: str = None) -> dict:
+    """
+    Concatenate all logged segments.
+
+    Returns:
+        Dictionary with 'frame_idx', 'timestamp', 'probabilities',
+        'model' (index into 'models'), 'stream' (index into 'streams'),
+        'models', 'streams' and 'actions'
+    """
+    models: List[str] = []
+    streams: List[str] = []
+    parts: Dict[str, list] = {name: [] for name in ('frame_idx', 'timestamp', 'probabilities', 'model', 'stream')}
+    actions = None
+
+    for segment in iter_segments(root, stream):
+        actions = actions or segment['actions']
+        if segment['stream'] not in streams:
+            streams.append(segment['stream'])
+
+        # Segment-local model indices -> global
+        for model in segment['models']:
+            if model not in models:
+                models.append(model)
+        mapping = np.array([models.index(model) for model in segment['models']], dtype=np.uint16)
+        rows = len(segment['frame_idx'])
+
+        parts['frame_idx'].append(np.asarray(segment['frame_idx']))
+        parts['timestamp'].append(np.asarray(segment['timestamp']))
+        parts['probabilities'].append(np.asarray(segment['probabilities']))
+        parts['model'].append(mapping[np.asarray(segment['model'])])
+        parts['stream'].append(np.full(rows, streams.index(segment['stream']), dtype=np.uint16))
+
+    if not parts['frame_idx']:
+        actions = ['IGNORE', 'ENTER', 'EXIT']
+        parts = {
+            'frame_idx': [np.zeros(0, dtype=np.int64)],
+            'timestamp': [np.zeros(0, dtype=np.float64)],
+            'probabilities': [np.zeros((0, len(actions)), dtype=np.float32)],
+            'model': [np.zeros(0, dtype=np.uint16)],
+            'stream': [np.zeros(0, dtype=np.uint16)]
+        }
+
+    data = {name: np.concatenate(values) for name, values in parts.items()}
+    data.update(models=models, streams=streams, actions=actions)
+    return data
+
+
+def replay(
+    data: dict,
+    thresholds: Sequence[float],
+    debounce_seconds: float = 0.0,
+    debounce_frames: int = 0,
+    ignore_label: str = 'IGNORE'
+) -> List[dict]:
+    """
+    Re-run the signal policy over logged predictions.
+
+    A row produces a signal when its argmax is not IGNORE and its
+    confidence reaches the threshold. With debouncing, a signal is dropped
+    if the same stream emitted the same action less than `debounce_seconds`
+    or `debounce_frames` before. Live rows carry wall-clock time, so seconds
+    suit live streams; video rows are best debounced by frames (offline
+    passes log video time, streaming video passes processing time).
+
+    Args:
+        data: Output of read_predictions
+        thresholds: CONFIDENCE_THRESHOLD values to evaluate
+        debounce_seconds: Minimum time between repeated signals per stream/action
+        debounce_frames: Minimum frame distance between repeated signals per stream/action
+
+    Returns:
+        One dictionary per threshold with total signals and signals per action
+    """
+    probabilities = data['probabilities']
+    actions = data['actions']
+    ignore = actions.index(ignore_label)
+
+    predicted = np.argmax(probabilities, axis=1)
+    confidence = probabilities.max(axis=1)
+    candidate = (predicted != ignore) & (confidence > 0)
+
+    results = []
+    for threshold in thresholds:
+        selected = np.flatnonzero(candidate & (confidence >= threshold))
+
+        if (debounce_seconds > 0 or debounce_frames > 0) and len(selected):
+            keep = np.zeros(len(selected), dtype=bool)
+            last: Dict[tuple, tuple] = {}
+            for k, row in enumerate(selected):
+                key = (int(data['stream'][row]), int(predicted[row]))
+                timestamp, frame = float(data['timestamp'][row]), int(data['frame_idx'][row])
+                previous = last.get(key)
+                if (
+                    previous is None
+                    or (timestamp - previous[0] >= debounce_seconds and frame - previous[1] >= debounce_frames)
+                ):
+                    keep[k] = True
+                    last[key] = (timestamp, frame)
+            selected = selected[keep]
+
+        counts = np.bincount(predicted[selected], minlength=len(actions))
+        results.append({
+            'threshold': float(threshold),
+            'signals': int(len(selected)),
+            **{action: int(counts[i]) for i, action in enumerate(actions) if i != ignore}
+        })
+
+    return results
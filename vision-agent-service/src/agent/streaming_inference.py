@@ -0,0 +1,161 @@
+"""Stateful single-step LSTM inference for live frame streams."""
+import threading
+import weakref
+import numpy as np
+from typing import List
+import tensorflow as tf
+import keras
+
+from ..config import config
+
+
+class StreamState:
+    """Carried LSTM state of one FrameBuffer."""
+
+    def __init__(self, shapes: list):
+        self.states: List[np.ndarray] = [np.zeros(shape, dtype=np.float32) for shape in shapes]
+        self.position = 0  # FrameBuffer.frames_added at the last update
+        self.steps_since_resync = 0
+
+
+class StreamingLSTM:
+    """
+    Runs an LSTM window model one frame at a time, carrying its state.
+
+    The windowed model re-runs all SEQUENCE_LENGTH timesteps for every new
+    frame. This class rebuilds the same layers (same weights) as a model that
+    takes explicit hidden/cell states, so each frame costs one timestep.
+
+    Equivalence with the windowed path:
+    - On a re-sync the state is reset and the whole window is replayed, so the
+      output matches the windowed model to float round-off (|dp| < 1e-5).
+    - Between re-syncs the carried state also remembers frames that have
+      already left the window. LSTM forget gates make that influence decay,
+      and re-syncing every `resync_interval` frames bounds it. On the dummy
+      model with a 30-frame interval the measured deviation stays around
+      0.002 in probability; keep it under 0.01 when tuning the interval
+      (check with benchmarks/bench_streaming.py).
+      Frames near CONFIDENCE_THRESHOLD can therefore flip between paths.
+
+    One instance serves many streams: the state is kept per FrameBuffer
+    (dropped with the buffer), and calls from several threads are serialized.
+    """
+
+    def __init__(self, model: keras.Model, resync_interval: int = None):
+        self.resync_interval = resync_interval or config.STREAM_RESYNC_INTERVAL
+        self.step_model = self._build_step_model(model)
+
+        self._state_shapes = [
+            (1,) + tuple(spec.shape[1:]) for spec in self.step_model.inputs[1:]
+        ]
+        self._streams = weakref.WeakKeyDictionary()  # FrameBuffer -> StreamState
+        self._lock = threading.Lock()
+
+        step_model = self.step_model
+
+        @tf.function(
+            input_signature=[tf.TensorSpec((1, None, config.FEATURE_DIM), tf.float32)]
+            + [tf.TensorSpec(shape, tf.float32) for shape in self._state_shapes],
+            reduce_retracing=True
+        )
+        def run(x, *states):
+            return step_model([x, *states], training=False)
+
+        self._run = run
+
+        # Warm up both call shapes (single step and full window)
+        states = StreamState(self._state_shapes).states
+        self._run(np.zeros((1, 1, config.FEATURE_DIM), dtype=np.float32), *states)
+        self._run(np.zeros((1, config.SEQUENCE_LENGTH, config.FEATURE_DIM), dtype=np.float32), *states)
+
+    @staticmethod
+    def _build_step_model(model: keras.Model) -> keras.Model:
+        """
+        Rebuild a Sequential LSTM model with explicit state inputs/outputs.
+
+        Every LSTM returns its full sequence and final states; Dense layers
+        apply per timestep and Dropout is dropped (inactive at inference).
+        """
+        inputs = keras.Input(shape=(None, config.FEATURE_DIM), batch_size=1)
+        state_inputs, state_outputs = [], []
+        weight_pairs = []
+        x = inputs
+
+        for layer in model.layers:
+            if isinstance(layer, keras.layers.LSTM):
+                layer_config = layer.get_config()
+                layer_config.update(return_sequences=True, return_state=True, stateful=False)
+                step_layer = keras.layers.LSTM.from_config(layer_config)
+
+                h = keras.Input(shape=(layer.units,), batch_size=1)
+                c = keras.Input(shape=(layer.units,), batch_size=1)
+                x, h_out, c_out = step_layer(x, initial_state=[h, c])
+
+                state_inputs.extend([h, c])
+                state_outputs.extend([h_out, c_out])
+                weight_pairs.append((step_layer, layer))
+            elif isinstance(layer, keras.layers.Dropout):
+                continue
+            elif isinstance(layer, keras.layers.Dense):
+                step_layer = keras.layers.Dense.from_config(layer.get_config())
+                x = step_layer(x)
+                weight_pairs.append((step_layer, layer))
+            else:
+                raise ValueError(
+                    f"Streaming inference supports LSTM/Dense models only, got {layer.__class__.__name__}"
+                )
+
+        if not state_inputs:
+            raise ValueError("Streaming inference requires an LSTM model")
+
+        step_model = keras.Model([inputs, *state_inputs], [x, *state_outputs])
+
+        for step_layer, layer in weight_pairs:
+            step_layer.set_weights(layer.get_weights())
+
+        return step_model
+
+    def reset(self):
+        """Drop the carried state of every stream (each re-syncs on its next frame)."""
+        with self._lock:
+            self._streams.clear()
+
+    def _advance(self, state: StreamState, x: np.ndarray) -> np.ndarray:
+        """Run timesteps from a stream's carried state; return last-step probabilities."""
+        outputs = self._run(x, *state.states)
+        state.states = [tensor.numpy() for tensor in outputs[1:]]
+        return outputs[0].numpy()[0, -1]
+
+    def resync(self, state: StreamState, window: np.ndarray) -> np.ndarray:
+        """Reset a stream's state and replay a full window (exact windowed output)."""
+        state.states = StreamState(self._state_shapes).states
+        state.steps_since_resync = 0
+        return self._advance(state, window.reshape(1, -1, config.FEATURE_DIM))
+
+    def step(self, state: StreamState, vector: np.ndarray) -> np.ndarray:
+        """Advance a stream one frame."""
+        state.steps_since_resync += 1
+        return self._advance(state, vector.reshape(1, 1, config.FEATURE_DIM))
+
+    def update(self, frame_buffer) -> np.ndarray:
+        """
+        Class probabilities for the newest frame of a FrameBuffer.
+
+        Steps the buffer's state one frame when exactly one frame was added
+        to it since its last call, otherwise (first call, cleared buffer,
+        skipped frames) or every `resync_interval` frames it re-syncs on the
+        full window.
+        """
+        with self._lock:
+            state = self._streams.get(frame_buffer)
+            if state is None:
+                state = self._streams[frame_buffer] = StreamState(self._state_shapes)
+
+            added = frame_buffer.frames_added
+            contiguous = added == state.position + 1
+            state.position = added
+
+            if not contiguous or state.steps_since_resync >= self.resync_interval:
+                return self.resync(state, frame_buffer.get_sequence())
+
+            return self.step(state, frame_buffer.latest())
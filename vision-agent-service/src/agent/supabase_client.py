@@ -199,11 +199,14 @@ class SupabaseClient:
         youtube_url: str,
         title: str = None,
         channel: str = None,
-        total_frames: int = None
+        total_frames: int = None,
+        model_version: str = None
     ) -> Optional[str]:
         """
         Create video record in database.
         
+        `model_version` is the model serving the video (default: MODEL_VERSION).
+        
         Returns:
             Record UUID or None if failed
         """
@@ -217,7 +220,7 @@ class SupabaseClient:
             'channel': channel,
             'status': 'pending',
             'total_frames': total_frames,
-            'model_version': config.MODEL_VERSION
+            'model_version': model_version or config.MODEL_VERSION
         }
         
         try:
@@ -2,10 +2,11 @@
 import cv2
 import numpy as np
 from pathlib import Path
-from typing import Generator, Tuple, Optional, Dict
-import yt_dlp
+from typing import Generator, Tuple, Optional, Dict, List
 from ..config import config
-from ..utils import logger
+from ..utils import logger, lazy_import
+
+yt_dlp = lazy_import('yt_dlp')
 
 
 class VideoProcessor:
@@ -123,6 +124,48 @@ class VideoProcessor:
             cap.release()
             logger.info(f"Processed {processed} frames from {total_frames} total frames")
     
+    def sample_frames(
+        self,
+        video_path: Path,
+        count: int,
+        start_frame: int = 0,
+        frame_step: int = None
+    ) -> List[np.ndarray]:
+        """
+        Read a small sample of frames, e.g. for a layout pass.
+        
+        Args:
+            video_path: Path to video file
+            count: Number of frames to sample
+            start_frame: Index of the first sampled frame
+            frame_step: Distance between samples (default: config.FRAME_STEP)
+            
+        Returns:
+            List of frame arrays (may be shorter near the end of the video)
+        """
+        frame_step = frame_step or config.FRAME_STEP
+        frames = []
+        
+        cap = cv2.VideoCapture(str(video_path))
+        
+        if not cap.isOpened():
+            logger.error(f"Failed to open video: {video_path}")
+            return frames
+        
+        try:
+            for i in range(count):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame + i * frame_step)
+                ret, frame = cap.read()
+                
+                if not ret:
+                    break
+                
+                frames.append(frame)
+        finally:
+            cap.release()
+        
+        return frames
+    
     def get_video_info(self, video_path: Path) -> Dict:
         """
         Get video metadata.
@@ -179,41 +222,102 @@ class VideoProcessor:
 
 
 class FrameBuffer:
-    """Manages a sliding window buffer of frames for sequence processing."""
+    """
+    Manages a sliding window buffer of frames for sequence processing.
+    
+    Backed by a preallocated ring of feature vectors: adding a frame writes one
+    row in place and reading the window copies it, in order, into a reusable
+    batch buffer with at most two slice copies.
+    """
     
-    def __init__(self, sequence_length: int = None):
+    def __init__(self, sequence_length: int = None, feature_dim: int = None):
         self.sequence_length = sequence_length or config.SEQUENCE_LENGTH
-        self.buffer = []
+        self.feature_dim = feature_dim or config.FEATURE_DIM
+        
+        # Ring storage
+        self._features = np.zeros((self.sequence_length, self.feature_dim), dtype=np.float32)
+        self._frame_indices = np.full(self.sequence_length, -1, dtype=np.int64)
+        self._head = 0  # Next row to write
+        self._count = 0
+        self._added = 0  # Frames added since the last clear
+        
+        # Reusable output buffer, shaped as a batch of one for the model
+        self._batch = np.zeros((1, self.sequence_length, self.feature_dim), dtype=np.float32)
         
     def add(self, frame_data: dict):
         """Add frame features to buffer."""
-        self.buffer.append(frame_data)
+        self._features[self._head] = frame_data['features']
+        self._frame_indices[self._head] = frame_data.get('frame_idx', -1)
         
-        # Keep only last N frames
-        if len(self.buffer) > self.sequence_length:
-            self.buffer.pop(0)
+        self._head = (self._head + 1) % self.sequence_length
+        self._added += 1
+        if self._count < self.sequence_length:
+            self._count += 1
     
     def is_ready(self) -> bool:
         """Check if buffer has enough frames for inference."""
-        return len(self.buffer) >= self.sequence_length
+        return self._count >= self.sequence_length
     
     def get_sequence(self) -> np.ndarray:
         """
         Get sequence as numpy array.
         
+        The returned array is a view of a reusable buffer and is overwritten by
+        the next call; copy it if it must outlive the current frame.
+        
         Returns:
             Array of shape (sequence_length, feature_dim)
         """
+        batch = self.get_batch()
+        return None if batch is None else batch[0]
+    
+    def get_batch(self) -> np.ndarray:
+        """
+        Get sequence as a batch of one, ready for the model.
+        
+        Returns:
+            Array of shape (1, sequence_length, feature_dim), reused between calls
+        """
         if not self.is_ready():
             return None
         
-        # Stack feature vectors from last N frames
-        features = [frame['features'] for frame in self.buffer[-self.sequence_length:]]
-        return np.array(features)
+        # Oldest row is at head once the ring is full
+        tail = self.sequence_length - self._head
+        self._batch[0, :tail] = self._features[self._head:]
+        self._batch[0, tail:] = self._features[:self._head]
+        return self._batch
+    
+    def latest(self) -> np.ndarray:
+        """Feature vector of the newest frame (view into the ring)."""
+        if self._count == 0:
+            return None
+        
+        return self._features[(self._head - 1) % self.sequence_length]
+    
+    @property
+    def last_frame_idx(self) -> Optional[int]:
+        """Frame index of the newest frame."""
+        if self._count == 0:
+            return None
+        
+        return int(self._frame_indices[(self._head - 1) % self.sequence_length])
+    
+    @property
+    def frames_added(self) -> int:
+        """Number of frames added since the last clear."""
+        return self._added
+    
+    def frame_indices(self) -> np.ndarray:
+        """Frame indices of the buffered frames, oldest first."""
+        order = np.arange(self._head - self._count, self._head) % self.sequence_length
+        return self._frame_indices[order]
     
     def clear(self):
         """Clear the buffer."""
-        self.buffer = []
+        self._head = 0
+        self._count = 0
+        self._added = 0
+        self._frame_indices[:] = -1
     
     def __len__(self):
-        return len(self.buffer)
+        return self._count
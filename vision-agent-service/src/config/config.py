@@ -1,6 +1,6 @@
 """Configuration module for Vision Trading Agent."""
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -22,6 +22,14 @@ class VisionAgentConfig:
     MIN_VIDEO_DURATION: int = int(os.getenv("MIN_VIDEO_DURATION", "60"))  # seconds
     MAX_VIDEO_DURATION: int = int(os.getenv("MAX_VIDEO_DURATION", "3600"))  # seconds
     
+    # Chart Region (crop extraction to the chart area of the video layout)
+    CROP_TO_CHART: bool = os.getenv("CROP_TO_CHART", "false").lower() == "true"
+    LAYOUT_SAMPLE_FRAMES: int = int(os.getenv("LAYOUT_SAMPLE_FRAMES", "8"))  # Frames sampled per layout pass
+    SCENE_CUT_THRESHOLD: float = 0.5  # Histogram correlation below this is a scene cut
+    CHART_EDGE_DENSITY: float = 0.04  # Minimum mean edge density of chart pixels
+    CHART_MAX_CHANGE: float = 0.03  # Maximum temporal change of chart pixels
+    CHART_MIN_AREA: float = 0.2  # Minimum chart area as a fraction of the frame
+    
     # Feature Extraction
     SEQUENCE_LENGTH: int = int(os.getenv("SEQUENCE_LENGTH", "30"))  # Number of frames in sequence
     FEATURE_DIM: int = 128  # Fixed feature vector dimension
@@ -29,6 +37,26 @@ class VisionAgentConfig:
     # Model Configuration
     MODEL_VERSION: str = os.getenv("MODEL_VERSION", "model_seq_v20251125.h5")
     CONFIDENCE_THRESHOLD: float = float(os.getenv("CONFIDENCE_THRESHOLD", "0.70"))
+    FAST_INFERENCE: bool = os.getenv("FAST_INFERENCE", "true").lower() == "true"  # Compiled call instead of model.predict
+    OFFLINE_BATCH: bool = os.getenv("OFFLINE_BATCH", "false").lower() == "true"  # Extract whole video, then predict in batches
+    INFERENCE_BATCH_SIZE: int = int(os.getenv("INFERENCE_BATCH_SIZE", "256"))
+    STREAMING_INFERENCE: bool = os.getenv("STREAMING_INFERENCE", "false").lower() == "true"  # Stateful single-step LSTM
+    STREAM_RESYNC_INTERVAL: int = int(os.getenv("STREAM_RESYNC_INTERVAL", "30"))  # Frames between full-window re-syncs
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "keras")  # keras, tflite, onnx
+    BACKEND_QUANTIZATION: str = os.getenv("BACKEND_QUANTIZATION", "none")  # none, dynamic, int8
+    CALIBRATION_WINDOWS: int = int(os.getenv("CALIBRATION_WINDOWS", "500"))  # Windows for int8 calibration
+    MODEL_WATCH_INTERVAL: float = float(os.getenv("MODEL_WATCH_INTERVAL", "0"))  # Seconds between model dir polls (0 = off)
+    MODEL_POINTER_FILE: str = "ACTIVE_MODEL"  # File in MODELS_DIR naming the version to hot-reload
+    SHADOW_MODELS: list = field(
+        default_factory=lambda: [v for v in os.getenv("SHADOW_MODELS", "").split(",") if v]
+    )  # Candidate models evaluated on the same windows, logged only
+    CASCADE_GATE: bool = os.getenv("CASCADE_GATE", "false").lower() == "true"  # Skip the model on windows the gate rejects
+    PREDICTION_LOG: bool = os.getenv("PREDICTION_LOG", "true").lower() == "true"  # Log every window's probabilities
+    PREDICTION_LOG_ROTATE_ROWS: int = int(os.getenv("PREDICTION_LOG_ROTATE_ROWS", "1000000"))  # Rows per log segment
+    INFERENCE_BROKER: bool = os.getenv("INFERENCE_BROKER", "false").lower() == "true"  # Micro-batch windows across streams
+    BROKER_MAX_BATCH: int = int(os.getenv("BROKER_MAX_BATCH", "64"))  # Windows per broker batch
+    BROKER_MAX_WAIT_MS: float = float(os.getenv("BROKER_MAX_WAIT_MS", "5"))  # Max time a window waits for others
+    CASCADE_TARGET_RECALL: float = float(os.getenv("CASCADE_TARGET_RECALL", "0.99"))  # Actionable windows the gate must pass
     
     # OCR Configuration
     TESSERACT_PATH: Optional[str] = os.getenv("TESSERACT_PATH", None)
@@ -49,12 +77,37 @@ class VisionAgentConfig:
     DEFAULT_ASSET: str = os.getenv("TRADING_SYMBOL", "BTCUSDT")
     TIMEFRAME: str = os.getenv("TRADING_INTERVAL", "1m")
     PLATFORM: str = os.getenv("TRADING_PLATFORM", "BINANCE")
+    LIVE_FEED: str = os.getenv("LIVE_FEED", "poll")  # poll (REST after each candle close) or stream (kline WebSocket, Binance)
+    LIVE_TRIGGER: str = os.getenv("LIVE_TRIGGER", "close")  # Streamed feed: analyse on candle close or on every update
+    LIVE_CADENCE_SECONDS: float = float(os.getenv("LIVE_CADENCE_SECONDS", "0"))  # Polled feed: seconds between analyses within a candle (0 = on close only)
+    LIVE_CLOSE_DELAY: float = float(os.getenv("LIVE_CLOSE_DELAY", "0.2"))  # Seconds after a candle close before fetching it
+    LIVE_FEATURES: str = os.getenv("LIVE_FEATURES", "chart")  # chart (render + vision model) or candles (numeric OHLCV features)
+    CANDLE_MODEL_VERSION: str = os.getenv("CANDLE_MODEL_VERSION", "model_candles_v2.h5")  # Model for LIVE_FEATURES=candles
+    BINANCE_REST_URL: str = os.getenv("BINANCE_REST_URL", "https://api.binance.com")
+    BINANCE_WS_URL: str = os.getenv("BINANCE_WS_URL", "wss://stream.binance.com:9443")
+    # Multi-stream scanner: every symbol x interval (empty = DEFAULT_ASSET / TIMEFRAME)
+    LIVE_SYMBOLS: list = field(
+        default_factory=lambda: [v.strip().upper() for v in os.getenv("LIVE_SYMBOLS", "").split(",") if v.strip()]
+    )
+    LIVE_INTERVALS: list = field(
+        default_factory=lambda: [v.strip() for v in os.getenv("LIVE_INTERVALS", "").split(",") if v.strip()]
+    )
+    SCANNER_POLL_SECONDS: float = float(os.getenv("SCANNER_POLL_SECONDS", "5"))  # REST poll period per stream (LIVE_TRIGGER=update)
+    SCANNER_HTTP_CONNECTIONS: int = int(os.getenv("SCANNER_HTTP_CONNECTIONS", "20"))  # Pooled connections shared by all streams
+    SCANNER_WORKERS: int = int(os.getenv("SCANNER_WORKERS", "4"))  # Threads rendering/extracting/predicting
+    SCANNER_REPORT_SECONDS: float = float(os.getenv("SCANNER_REPORT_SECONDS", "60"))  # Lag report period (0 = off)
+    MARKET_WEIGHT_PER_MINUTE: int = int(os.getenv("MARKET_WEIGHT_PER_MINUTE", "6000"))  # Binance REST request weight budget (0 = unlimited)
+    SCANNER_RESAMPLE: bool = os.getenv("SCANNER_RESAMPLE", "true").lower() == "true"  # Build higher intervals from the finest one per symbol
     DEFAULT_RR: float = 2.0  # Risk:Reward ratio
     
     # Directories
     VIDEOS_DIR: str = "videos"
     FEATURES_DIR: str = "data/features"
     TRAINING_DIR: str = "data/training"
+    LABELS_DIR: str = "data/labels"  # <video_id>.csv with frame_idx,action rows
+    DATASET_SHARD_SIZE: int = int(os.getenv("DATASET_SHARD_SIZE", "10000"))  # Windows per training shard
+    DATASET_WORKERS: int = int(os.getenv("DATASET_WORKERS", "0"))  # Dataset build processes (0 = CPU count)
+    HISTORY_DIR: str = "data/history"  # Cached OHLCV per symbol/interval (live fills, backtests)
     MODELS_DIR: str = "models"
     LOGS_DIR: str = "logs"
     
@@ -72,9 +125,24 @@ class VisionAgentConfig:
         if self.MODE not in ["SHADOW", "PAPER", "LIVE"]:
             raise ValueError(f"Invalid MODE: {self.MODE}. Must be SHADOW, PAPER, or LIVE")
         
+        if self.INFERENCE_BACKEND not in ["keras", "tflite", "onnx"]:
+            raise ValueError(f"Invalid INFERENCE_BACKEND: {self.INFERENCE_BACKEND}. Must be keras, tflite, or onnx")
+        
+        if self.BACKEND_QUANTIZATION not in ["none", "dynamic", "int8"]:
+            raise ValueError(f"Invalid BACKEND_QUANTIZATION: {self.BACKEND_QUANTIZATION}. Must be none, dynamic, or int8")
+        
         if self.CONFIDENCE_THRESHOLD < 0.5 or self.CONFIDENCE_THRESHOLD > 1.0:
             raise ValueError("CONFIDENCE_THRESHOLD must be between 0.5 and 1.0")
         
+        if self.LIVE_FEED not in ["poll", "stream"]:
+            raise ValueError(f"Invalid LIVE_FEED: {self.LIVE_FEED}. Must be poll or stream")
+        
+        if self.LIVE_TRIGGER not in ["close", "update"]:
+            raise ValueError(f"Invalid LIVE_TRIGGER: {self.LIVE_TRIGGER}. Must be close or update")
+        
+        if self.LIVE_FEATURES not in ["chart", "candles"]:
+            raise ValueError(f"Invalid LIVE_FEATURES: {self.LIVE_FEATURES}. Must be chart or candles")
+        
         return True
 
 
@@ -3,23 +3,22 @@ import argparse
 import sys
 import time
 import threading
-import requests
-import cv2
 import numpy as np
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Dict, Optional
 from datetime import datetime
-import yfinance as yf
 
 from .config import config
-from .utils import logger
-from .agent import (
-    VideoProcessor,
-    FrameBuffer,
-    FeatureExtractor,
-    ModelInference
-)
-from .agent.supabase_client import SupabaseClient
+from .market.candle_store import get_store
+from .market.chart import ChartRenderer
+from .market.clock import CandleClock, CLOSE_RETRIES, CLOSE_RETRY_SECONDS
+from .market.history import HistoryCache
+from .market.smc import SMCEngine
+from .utils import logger, lazy_import
+
+# Heavy dependencies load on first use, so --help and config checks stay fast
+requests = lazy_import('requests')
+cv2 = lazy_import('cv2')
 
 
 class LiveMarketScanner:
@@ -32,6 +31,21 @@ class LiveMarketScanner:
         self.interval = config.TIMEFRAME  # e.g., '1m', '5m', '1h'
         self.platform = config.PLATFORM # e.g., 'BINANCE', 'FOREX'
         self.limit = 100  # Number of candles to fetch
+        self.store = get_store(self.symbol, self.interval, self.limit)  # Updated incrementally
+        self.renderer = ChartRenderer()  # Redraws only the candles that changed
+        self.smc = SMCEngine()  # SMC analysis of the store, updated per new candle
+        self.history = HistoryCache()  # On-disk candles (Yahoo Finance feed)
+        self.close_lag_ms = None  # ms from the last candle close to its decision
+        self._retry_at = 0.0  # Epoch seconds before which the exchange asked not to be polled
+        self._throttled = 0  # Consecutive throttled responses
+        self._budget = None  # WeightBudget of the REST polls (created on the first fetch)
+        self._no_new_data = False  # Yahoo Finance returned nothing new (e.g. market closed)
+        self._wake = threading.Event()  # Set by stop() to end the polling wait
+        self._stream = None  # KlineStream (LIVE_FEED=stream)
+        self._loop = None
+        self._executor = None  # Processes streamed candles off the event loop
+        self._busy = False  # A processing job is running
+        self._pending = False  # Candles changed while it ran: process once more
 
     def start(self):
         """Start the live scanner loop."""
@@ -50,196 +64,281 @@ class LiveMarketScanner:
                 youtube_url="LIVE_FEED",
                 title=f"Live Trading Session {session_id}",
                 channel="Vision Agent",
-                total_frames=0 # Indefinite
+                total_frames=0, # Indefinite
+                model_version=(self.agent.candle_model if config.LIVE_FEATURES == 'candles' else self.agent.model).model_version
             )
             logger.info(f"Created live session record: {video_id}")
         except Exception as e:
             logger.error(f"Failed to create live session record: {e}")
             # We continue, but signals might fail if FK is strict
         
+        if self.platform == 'BINANCE' and config.LIVE_FEED == 'stream':
+            self._run_stream(video_id)
+            return
+        
+        self._run_polling(video_id)
+    
+    def _run_polling(self, video_id: str):
+        """
+        Poll on a schedule aligned to the candle closes of the interval.
+        
+        Wakes LIVE_CLOSE_DELAY after each close (and every
+        LIVE_CADENCE_SECONDS within a candle when set), fetches until the
+        new candle is visible and analyses the candles. The schedule is
+        absolute, so processing time does not push it back. Each close is
+        logged with its close -> decision latency.
+        """
+        clock = CandleClock(self.interval, cadence=config.LIVE_CADENCE_SECONDS, delay=config.LIVE_CLOSE_DELAY)
+        wake_ms, closing = int(time.time() * 1000), False  # First fetch fills the window at once
+        
         while self.running:
+            wake_ms = max(wake_ms, int(self._retry_at * 1000))  # Honour a Retry-After
+            if self._wake.wait(max(0.0, wake_ms / 1000.0 - time.time())):
+                break  # stop()
+            
             try:
-                # 1. Fetch live data
-                candles = []
-                if self.platform == 'BINANCE':
-                    candles = self._fetch_binance_data()
-                elif self.platform in ['FOREX', 'B3']:
-                    candles = self._fetch_yfinance_data()
-                else:
-                    logger.warning(f"Unknown platform: {self.platform}. Defaulting to Binance logic.")
-                    candles = self._fetch_binance_data()
-                
-                if candles:
-                    # 2. Render chart to image
-                    frame = self._render_chart(candles)
-                    
-                    # 3. Process frame through agent
-                    
-                    # Extract features
-                    # We use a rolling frame index based on time
-                    frame_idx = int(time.time()) 
-                    
-                    features = self.agent.feature_extractor.extract_features(frame, frame_idx)
-                    
-                    # Add to buffer
-                    self.agent.frame_buffer.add({
-                        'frame_idx': frame_idx,
-                        'features': features['vector']
-                    })
-                    
-                    self.agent.stats['frames_processed'] += 1
-                    
-                    # When buffer is ready, make prediction
-                    if self.agent.frame_buffer.is_ready():
-                        sequence = self.agent.frame_buffer.get_sequence()
-                        action, confidence = self.agent.model.predict(sequence)
-                        
-                        # Process action
-                        if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
-                            self.agent._handle_signal(
-                                action=action,
-                                confidence=confidence,
-                                video_id=video_id,
-                                frame_idx=frame_idx,
-                                features=features,
-                                direction='LONG' if action == 'ENTER' else 'SHORT' # Simplified direction inference
-                            )
+                # 1. Fetch live data (only candles changed since the last fetch)
+                updated = self._fetch_data()
+                if closing:
+                    # The exchange may not show the new candle yet: retry briefly
+                    close_ms = clock.close_time(wake_ms)
+                    for _ in range(CLOSE_RETRIES):
+                        if not updated or not self.running or (self.store.last_time or 0) >= close_ms:
+                            break
+                        time.sleep(CLOSE_RETRY_SECONDS)
+                        updated = self._fetch_data()
                 
-                # Wait for next candle/update
-                # For Forex/B3 (yfinance), we might want to poll slower to avoid rate limits
-                sleep_time = 5 if self.platform == 'BINANCE' else 60
-                time.sleep(sleep_time) 
+                if updated and len(self.store):
+                    self._process_candles(self.store.arrays(), video_id)
+                    if closing:
+                        self._report_close(clock.close_time(wake_ms), wake_ms)
                 
             except Exception as e:
+                # Fetch errors are handled (and throttling honoured) in
+                # _fetch_data; anything else waits for the next wake as usual
                 logger.error(f"Error in Live Scanner: {e}")
-                time.sleep(10)
+            
+            # Next close (or cadence tick) from now: wake-ups missed while processing are skipped
+            wake_ms, closing = clock.next_wake(int(time.time() * 1000))
+    
+    def _fetch_data(self) -> bool:
+        """Update the candle store from the platform's API; False on error."""
+        if self.platform == 'BINANCE':
+            return self._fetch_binance_data()
+        if self.platform in ['FOREX', 'B3']:
+            return self._fetch_yfinance_data()
+        logger.warning(f"Unknown platform: {self.platform}. Defaulting to Binance logic.")
+        return self._fetch_binance_data()
+    
+    def _report_close(self, close_ms: int, wake_ms: int):
+        """Log the latency from a candle close to its decision."""
+        now_ms = time.time() * 1000.0
+        self.close_lag_ms = now_ms - close_ms
+        logger.info(
+            f"⏱️ {self.symbol} {self.interval} candle close -> decision: {self.close_lag_ms:.0f} ms "
+            f"(fetch + processing {now_ms - wake_ms:.0f} ms)"
+        )
+    
+    def _run_stream(self, video_id: str):
+        """
+        Run on the kline WebSocket stream instead of polling.
+        
+        Candles are analysed on every update or, with LIVE_TRIGGER=close,
+        only when a candle closes. Analysis runs in a worker thread on a
+        copy of the candles, so the WebSocket keeps being read meanwhile.
+        """
+        import asyncio
+        from concurrent.futures import ThreadPoolExecutor
+        from .market import KlineStream
+        
+        def on_candle(store, closed):
+            if not self.running or (config.LIVE_TRIGGER == 'close' and not closed):
+                return
+            self._dispatch(video_id)
+        
+        self._stream = KlineStream(self.symbol, self.interval, limit=self.limit, on_candle=on_candle, store=self.store)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='live-scanner')
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._stream.run())
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._loop.close()
+            self._loop = None
+    
+    def _dispatch(self, video_id: str):
+        """Process the current candles in the worker (or once more after the running job)."""
+        import asyncio
+        
+        if self._busy:
+            self._pending = True  # Events arriving meanwhile coalesce into one run
+            return
+        
+        self._busy = True
+        candles = self.store.arrays(copy=True)  # The stream keeps updating the store
+        job = asyncio.get_running_loop().run_in_executor(self._executor, self._process_candles, candles, video_id)
+        job.add_done_callback(lambda future: self._done(video_id, future))
+    
+    def _done(self, video_id: str, future):
+        self._busy = False
+        
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Error in Live Scanner: {future.exception()}")
+        
+        if self._pending and self.running:
+            self._pending = False
+            self._dispatch(video_id)
+    
+    def _process_candles(self, candles: Dict[str, np.ndarray], video_id: str):
+        """
+        Extract features, predict and handle the signal for the current candles.
+        
+        Renders the chart for the vision model, or with LIVE_FEATURES=candles
+        computes numeric features from the candle arrays for the candle model.
+        The SMC analysis of the candles goes into the signal's features summary.
+        """
+        # We use a rolling frame index based on time
+        frame_idx = int(time.time()) 
+        self.smc.update(candles)
+        
+        if config.LIVE_FEATURES == 'candles':
+            # Numeric features straight from the candle arrays, no chart
+            features = self.agent.candle_features.extract_features(candles, frame_idx)
+            self.agent.stats['frames_processed'] += 1
+            
+            if features['window'] is None:
+                return
+            action, confidence = self.agent.predict_candles(features['window'], frame_idx, stream_id=video_id)
+            model_version = self.agent.candle_model.model_version
+        else:
+            # 2. Render chart to image
+            frame = self._render_chart(candles)
+            
+            # 3. Process frame through agent
+            features = self.agent.feature_extractor.extract_features(frame, frame_idx)
+            
+            # Add to buffer
+            self.agent.frame_buffer.add({
+                'frame_idx': frame_idx,
+                'features': features['vector']
+            })
+            
+            self.agent.stats['frames_processed'] += 1
+            
+            # When buffer is ready, make prediction
+            if not self.agent.frame_buffer.is_ready():
+                return
+            action, confidence = self.agent.predict_frame(self.agent.frame_buffer, stream_id=video_id)
+            model_version = None
+        
+        features['smc'] = self.smc.summary()
+        
+        # Process action
+        if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
+            self.agent._handle_signal(
+                action=action,
+                confidence=confidence,
+                video_id=video_id,
+                frame_idx=frame_idx,
+                features_summary=self.agent._build_features_summary(features),
+                direction='LONG' if action == 'ENTER' else 'SHORT', # Simplified direction inference
+                model_version=model_version
+            )
 
     def stop(self):
         self.running = False
+        self._wake.set()
+        if self._loop is not None:
+            import asyncio
+            asyncio.run_coroutine_threadsafe(self._stream.stop(), self._loop)
 
-    def _fetch_binance_data(self) -> List[Dict]:
-        """Fetch OHLCV data from Binance."""
-        url = "https://api.binance.com/api/v3/klines"
+    def _fetch_binance_data(self) -> bool:
+        """
+        Update the candle store from Binance.
+        
+        The first call fills the window; later calls fetch only the
+        candles from the newest held one onwards. Requests spend request
+        weight from a WeightBudget (MARKET_WEIGHT_PER_MINUTE), as the
+        scanner's MarketDataClient does, waiting when it is used up.
+        
+        Returns:
+            False if the request failed or was throttled (polling then
+            resumes after the response's Retry-After)
+        """
+        from .market.client import ENDPOINT_WEIGHTS, THROTTLED, USED_WEIGHT_HEADER, WeightBudget, retry_delay
+        
+        path = '/api/v3/klines'
+        weight = ENDPOINT_WEIGHTS[path]
+        if self._budget is None:
+            self._budget = WeightBudget(config.MARKET_WEIGHT_PER_MINUTE)
+        
+        delay = self._budget.delay(weight)
+        if delay > 0:
+            logger.warning(f"Binance request weight used up, waiting {delay:.1f}s")
+            if self._wake.wait(delay):
+                return False  # stop()
+        self._budget.spend(weight)
+        
+        url = f"{config.BINANCE_REST_URL}{path}"
         params = {
             "symbol": self.symbol,
             "interval": self.interval,
-            "limit": self.limit
+            **self.store.next_fetch()
         }
         try:
             response = requests.get(url, params=params, timeout=10)
+            if USED_WEIGHT_HEADER in response.headers:
+                self._budget.sync(int(response.headers[USED_WEIGHT_HEADER]))
+            if response.status_code in THROTTLED:
+                delay = retry_delay(response.headers, self._throttled)
+                self._throttled += 1
+                self._retry_at = time.time() + delay
+                self._budget.block(delay)
+                logger.warning(f"Binance rate limit ({response.status_code}), pausing polls for {delay:.0f}s")
+                return False
+            self._throttled = 0
             response.raise_for_status()
-            data = response.json()
-            
-            # Parse data: [Open time, Open, High, Low, Close, Volume, ...]
-            candles = []
-            for c in data:
-                candles.append({
-                    'time': c[0],
-                    'open': float(c[1]),
-                    'high': float(c[2]),
-                    'low': float(c[3]),
-                    'close': float(c[4]),
-                    'volume': float(c[5])
-                })
-            return candles
+            
+            # Rows: [Open time, Open, High, Low, Close, Volume, ...]
+            self.store.update_rows(response.json())
+            return True
         except Exception as e:
             logger.error(f"Binance API error: {e}")
-            return []
+            return False
 
-    def _fetch_yfinance_data(self) -> List[Dict]:
-        """Fetch OHLCV data from Yahoo Finance (Forex/Stocks)."""
+    def _fetch_yfinance_data(self) -> bool:
+        """
+        Update the candle store from Yahoo Finance (Forex/Stocks) through
+        the history cache: the window comes from the cache, each refresh
+        fetches only the candles after the newest cached one.
+        
+        Returns:
+            False on error or when nothing new was fetched
+        """
         try:
-            # Map interval to yfinance format if needed
-            # yfinance supports: 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
-            yf_interval = self.interval
-            
-            # Fetch data
-            ticker = yf.Ticker(self.symbol)
-            # period='1d' is usually enough for recent candles, but for '1m' we might need 'max' or specific logic
-            # For live scanning, we just need the last N candles.
-            # yfinance 'period' depends on interval.
-            period = "1d"
-            if self.interval in ['1m', '5m', '15m']:
-                period = "1d"
-            elif self.interval in ['1h', '4h']:
-                period = "5d"
-            else:
-                period = "1mo"
-                
-            df = ticker.history(period=period, interval=yf_interval)
+            if not len(self.store):
+                self.store.update(**self.history.load(self.symbol, self.interval, last=self.limit))
             
-            if df.empty:
-                logger.warning(f"No data found for {self.symbol} on Yahoo Finance")
-                return []
-                
-            # Take last N candles
-            df = df.tail(self.limit)
-            
-            candles = []
-            for index, row in df.iterrows():
-                candles.append({
-                    'time': int(index.timestamp() * 1000), # Convert to ms timestamp
-                    'open': float(row['Open']),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'close': float(row['Close']),
-                    'volume': float(row['Volume'])
-                })
-            return candles
+            columns = self.history.refresh(self.symbol, self.interval)
+            if not len(columns['time']):
+                # Every poll while the market is closed: say so once per stretch
+                log = logger.debug if self._no_new_data else logger.info
+                log(f"No new data for {self.symbol} on Yahoo Finance (market closed?)")
+                self._no_new_data = True
+                return False
+            
+            self._no_new_data = False
+            self.store.update(**columns)
+            return True
             
         except Exception as e:
             logger.error(f"Yahoo Finance API error: {e}")
-            return []
+            return False
 
-    def _render_chart(self, candles: List[Dict]) -> np.ndarray:
-        """Render candles to an OpenCV image (BGR)."""
-        width = 1280
-        height = 720
-        background_color = (0, 0, 0) # Black
-        
-        # Create blank image
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        img[:] = background_color
-        
-        if not candles:
-            return img
-            
-        # Determine scale
-        min_price = min(c['low'] for c in candles)
-        max_price = max(c['high'] for c in candles)
-        price_range = max_price - min_price if max_price > min_price else 1.0
-        
-        candle_width = width // len(candles)
-        padding = 2
-        
-        for i, c in enumerate(candles):
-            x_center = i * candle_width + candle_width // 2
-            
-            # Y coordinates (inverted because image origin is top-left)
-            y_high = height - int((c['high'] - min_price) / price_range * (height - 50)) - 25
-            y_low = height - int((c['low'] - min_price) / price_range * (height - 50)) - 25
-            y_open = height - int((c['open'] - min_price) / price_range * (height - 50)) - 25
-            y_close = height - int((c['close'] - min_price) / price_range * (height - 50)) - 25
-            
-            # Color: Green for bullish, Red for bearish
-            color = (0, 255, 0) if c['close'] >= c['open'] else (0, 0, 255)
-            
-            # Draw wick
-            cv2.line(img, (x_center, y_high), (x_center, y_low), color, 1)
-            
-            # Draw body
-            top = min(y_open, y_close)
-            bottom = max(y_open, y_close)
-            left = x_center - (candle_width // 2) + padding
-            right = x_center + (candle_width // 2) - padding
-            
-            # Ensure body has at least 1px height
-            if bottom == top:
-                bottom += 1
-                
-            cv2.rectangle(img, (left, top), (right, bottom), color, -1)
-            
-        return img
+    def _render_chart(self, candles: Dict[str, np.ndarray]) -> np.ndarray:
+        """Render candles to an OpenCV image (BGR; the renderer's canvas, valid until the next render)."""
+        return self.renderer.render(candles['open'], candles['high'], candles['low'], candles['close'])
 
 
 class VisionTradingAgent:
@@ -249,12 +348,43 @@ class VisionTradingAgent:
         # Validate configuration
         config.validate()
         
+        from .agent import (
+            VideoProcessor,
+            FrameBuffer,
+            FeatureExtractor,
+            NumericFeatureExtractor,
+            ModelInference,
+            ChartRegionDetector,
+            FeatureStore,
+            InferenceBroker,
+            PredictionLog
+        )
+        from .agent.supabase_client import SupabaseClient
+        
         # Initialize components
         self.video_processor = VideoProcessor()
         self.feature_extractor = FeatureExtractor()
         self.model = ModelInference()
         self.supabase = SupabaseClient()
         self.frame_buffer = FrameBuffer()
+        self.feature_store = FeatureStore()
+        
+        if config.MODEL_WATCH_INTERVAL > 0:
+            self.model.watch()
+        # Batches predictions of concurrent streams (live scanner + videos)
+        self.broker = InferenceBroker(self.model) if config.INFERENCE_BROKER else None
+        # Probabilities of every window, for replaying thresholds offline
+        self.prediction_log = PredictionLog(actions=self.model.ACTIONS) if config.PREDICTION_LOG else None
+        self.chart_detector = ChartRegionDetector() if config.CROP_TO_CHART else None
+        
+        # Live scanners on numeric candle features use their own model
+        self.candle_features = None
+        self.candle_model = None
+        self.candle_broker = None
+        if config.LIVE_FEATURES == 'candles':
+            self.candle_features = NumericFeatureExtractor()
+            self.candle_model = ModelInference(shadow_versions=[], version=config.CANDLE_MODEL_VERSION)
+            self.candle_broker = InferenceBroker(self.candle_model) if config.INFERENCE_BROKER else None
         
         # Statistics
         self.stats = {
@@ -263,20 +393,26 @@ class VisionTradingAgent:
             'signals_sent': 0,
             'signals_executed': 0
         }
+        self._signal_lock = threading.Lock()  # MarketScanner workers emit signals concurrently
         
         logger.info(f"Vision Trading Agent initialized in {config.MODE} mode")
     
-    def process_video(self, youtube_url: str, video_id: str = None) -> bool:
+    def process_video(self, youtube_url: str, video_id: str = None, offline: bool = None) -> bool:
         """
         Process a single video.
         
         Args:
             youtube_url: YouTube video URL
             video_id: Optional video ID (will be extracted from URL if not provided)
+            offline: Extract first, then predict all windows in batches
+                (default: config.OFFLINE_BATCH)
             
         Returns:
             True if successful, False otherwise
         """
+        if offline is None:
+            offline = config.OFFLINE_BATCH
+        
         # Extract video ID from URL if not provided
         if video_id is None:
             import re
@@ -311,48 +447,10 @@ class VisionTradingAgent:
             
             logger.info(f"Video info: {video_info}")
             
-            # Reset buffer and stats for this video
-            self.frame_buffer.clear()
-            video_signals = 0
-            
-            # Process frames
-            for frame_idx, frame in self.video_processor.extract_frames(video_path):
-                # Extract features
-                features = self.feature_extractor.extract_features(frame, frame_idx)
-                
-                # Add to buffer
-                self.frame_buffer.add({
-                    'frame_idx': frame_idx,
-                    'features': features['vector']
-                })
-                
-                self.stats['frames_processed'] += 1
-                
-                # Update progress periodically
-                if frame_idx % (config.FRAME_STEP * 10) == 0:
-                    self.supabase.update_video_status(
-                        video_id,
-                        'processing',
-                        processed_frames=frame_idx,
-                        signals_generated=video_signals
-                    )
-                
-                # When buffer is ready, make prediction
-                if self.frame_buffer.is_ready():
-                    sequence = self.frame_buffer.get_sequence()
-                    action, confidence = self.model.predict(sequence)
-                    
-                    # Process action
-                    if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
-                        self._handle_signal(
-                            action=action,
-                            confidence=confidence,
-                            video_id=video_id,
-                            frame_idx=frame_idx,
-                            features=features,
-                            direction='LONG' # Default, logic should infer direction
-                        )
-                        video_signals += 1
+            if offline:
+                video_signals = self._process_video_offline(video_path, video_id)
+            else:
+                video_signals = self._process_video_streaming(video_path, video_id)
             
             # Mark video as completed
             self.supabase.update_video_status(
@@ -381,10 +479,266 @@ class VisionTradingAgent:
             # Do not cleanup feature extractor here as it is shared across videos
             pass
     
+    def _extract_video_features(self, video_path: Path, video_id: str):
+        """
+        Extract features from every processed frame of a video.
+        
+        Handles the chart layout pass and progress updates.
+        
+        Yields:
+            Tuple of (frame_index, features)
+        """
+        self.feature_extractor.reset_state()
+        
+        # Layout pass: find the chart region to crop extraction to
+        if self.chart_detector:
+            self.chart_detector.reset()
+            self.chart_detector.detect(
+                self.video_processor.sample_frames(video_path, config.LAYOUT_SAMPLE_FRAMES)
+            )
+        
+        for frame_idx, frame in self.video_processor.extract_frames(video_path):
+            if self.chart_detector:
+                # Re-detect the layout when the scene changes
+                if self.chart_detector.is_scene_cut(frame):
+                    logger.info(f"Scene cut at frame {frame_idx}, re-detecting chart region")
+                    self.chart_detector.detect(
+                        self.video_processor.sample_frames(
+                            video_path,
+                            config.LAYOUT_SAMPLE_FRAMES,
+                            start_frame=frame_idx
+                        )
+                    )
+                    self.feature_extractor.reset_state()
+                
+                frame = self.chart_detector.crop(frame)
+            
+            # Extract features
+            features = self.feature_extractor.extract_features(frame, frame_idx)
+            
+            self.stats['frames_processed'] += 1
+            
+            yield frame_idx, features
+    
+    def _report_progress(self, video_id: str, frame_idx: int, video_signals: int):
+        """Update video progress in the database periodically."""
+        if frame_idx % (config.FRAME_STEP * 10) == 0:
+            self.supabase.update_video_status(
+                video_id,
+                'processing',
+                processed_frames=frame_idx,
+                signals_generated=video_signals
+            )
+    
+    def _process_video_streaming(self, video_path: Path, video_id: str) -> int:
+        """
+        Extract and predict frame by frame.
+        
+        Returns:
+            Number of signals generated
+        """
+        # Reset buffer for this video
+        self.frame_buffer.clear()
+        video_signals = 0
+        
+        for frame_idx, features in self._extract_video_features(video_path, video_id):
+            # Add to buffer
+            self.frame_buffer.add({
+                'frame_idx': frame_idx,
+                'features': features['vector']
+            })
+            
+            self._report_progress(video_id, frame_idx, video_signals)
+            
+            # When buffer is ready, make prediction
+            if self.frame_buffer.is_ready():
+                action, confidence = self.predict_frame(self.frame_buffer, stream_id=video_id)
+                
+                # Process action
+                if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
+                    self._handle_signal(
+                        action=action,
+                        confidence=confidence,
+                        video_id=video_id,
+                        frame_idx=frame_idx,
+                        features_summary=self._build_features_summary(features),
+                        direction='LONG' # Default, logic should infer direction
+                    )
+                    video_signals += 1
+        
+        return video_signals
+    
+    def _video_fps(self, video_path: Path) -> float:
+        """Frame rate of a video file (30 if it cannot be read)."""
+        try:
+            fps = self.video_processor.get_video_info(video_path)['fps']
+        except Exception:
+            fps = 0
+        return fps if fps and fps > 0 else 30.0
+    
+    def _process_video_offline(self, video_path: Path, video_id: str) -> int:
+        """
+        Extract all frames first, then predict every window in batches.
+        
+        Produces the same signals as the streaming pass (up to float
+        round-off between the single-window and batched calls), but runs
+        inference through a few large `predict_batch` calls.
+        
+        Returns:
+            Number of signals generated
+        """
+        stored = self.feature_store.load(video_id)
+        
+        if stored is not None:
+            frame_indices, vectors, summaries = stored
+            logger.info(f"Loaded {len(frame_indices)} stored feature vectors for {video_id}")
+        else:
+            frame_indices, vectors, summaries = [], [], []
+            
+            for frame_idx, features in self._extract_video_features(video_path, video_id):
+                frame_indices.append(frame_idx)
+                vectors.append(features['vector'])
+                summaries.append(self._build_features_summary(features))
+                
+                self._report_progress(video_id, frame_idx, 0)
+            
+            frame_indices = np.array(frame_indices, dtype=np.int64)
+            vectors = (
+                np.stack(vectors).astype(np.float32)
+                if vectors else np.zeros((0, config.FEATURE_DIM), dtype=np.float32)
+            )
+            self.feature_store.save(video_id, frame_indices, vectors, summaries)
+        
+        # Window i ends at frame i + SEQUENCE_LENGTH - 1, as in the streaming pass
+        probabilities = self.model.predict_windows_proba(vectors, frame_indices=frame_indices, stream_id=video_id)
+        video_signals = 0
+        
+        if self.prediction_log is not None and len(probabilities):
+            # Rows are timestamped in video time from the start of the pass,
+            # so they stay apart for a seconds-based debounce replay
+            window_ends = frame_indices[config.SEQUENCE_LENGTH - 1:]
+            self.prediction_log.append_many(
+                video_id,
+                window_ends,
+                self.model.model_version,
+                probabilities,
+                timestamps=time.time() + window_ends / self._video_fps(video_path)
+            )
+        
+        for i, prediction in enumerate(probabilities):
+            action, confidence = self.model.to_action(prediction)
+            if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
+                end = i + config.SEQUENCE_LENGTH - 1
+                self._handle_signal(
+                    action=action,
+                    confidence=confidence,
+                    video_id=video_id,
+                    frame_idx=int(frame_indices[end]),
+                    features_summary=summaries[end],
+                    direction='LONG' # Default, logic should infer direction
+                )
+                video_signals += 1
+        
+        return video_signals
+    
+    def predict_frame(self, frame_buffer, stream_id: str = None, windowed: bool = False) -> tuple:
+        """
+        Predict the newest window of a stream's FrameBuffer.
+        
+        Goes through the inference broker when enabled, so concurrent streams
+        share batched model calls; otherwise straight to the model. The
+        probabilities go to the prediction log.
+        
+        Args:
+            frame_buffer: A ready FrameBuffer
+            stream_id: Video id or live session id
+            windowed: Always predict the full window (the streaming LSTM
+                carries the state of a single stream)
+        """
+        if self.broker is not None:
+            probabilities = self.broker.predict_proba(
+                frame_buffer.get_sequence(), stream_id, frame_idx=frame_buffer.last_frame_idx
+            )
+        elif windowed:
+            probabilities = self.model.predict_proba(frame_buffer.get_sequence(), frame_buffer.last_frame_idx, stream_id)
+        else:
+            probabilities = self.model.predict_frame_proba(frame_buffer, stream_id)
+        
+        if self.prediction_log is not None:
+            self.prediction_log.append(
+                stream_id,
+                frame_buffer.last_frame_idx,
+                self.model.model_version,
+                probabilities
+            )
+        
+        return self.model.to_action(probabilities)
+    
+    def predict_candles(self, window: np.ndarray, frame_idx: int, stream_id: str = None) -> tuple:
+        """
+        Predict a numeric candle window with the candle model (LIVE_FEATURES=candles).
+        
+        Like predict_frame: batched through the candle model's broker when
+        enabled, logged to the prediction log under CANDLE_MODEL_VERSION.
+        
+        Args:
+            window: NumericFeatureExtractor window (SEQUENCE_LENGTH x FEATURE_DIM)
+            frame_idx: Index the window ends at (live: unix time)
+            stream_id: Live session id
+        """
+        if self.candle_broker is not None:
+            probabilities = self.candle_broker.predict_proba(window, stream_id, frame_idx=frame_idx)
+        else:
+            probabilities = self.candle_model.predict_proba(window, frame_idx, stream_id)
+        
+        if self.prediction_log is not None:
+            self.prediction_log.append(
+                stream_id,
+                frame_idx,
+                self.candle_model.model_version,
+                probabilities
+            )
+        
+        return self.candle_model.to_action(probabilities)
+    
     def cleanup(self):
         """Release resources."""
         if hasattr(self, 'feature_extractor'):
             self.feature_extractor.cleanup()
+        if getattr(self, 'broker', None) is not None:
+            self.broker.stop()
+        if getattr(self, 'candle_broker', None) is not None:
+            self.candle_broker.stop()
+        if getattr(self, 'prediction_log', None) is not None:
+            self.prediction_log.close()
+        if getattr(self, 'model', None) is not None:
+            self.model.close()
+        if getattr(self, 'candle_model', None) is not None:
+            self.candle_model.close()
+    
+    @staticmethod
+    def _build_features_summary(features: dict) -> dict:
+        """Build the compact features summary sent with a signal."""
+        if 'candles' in features:
+            from .agent.numeric_features import NumericFeatureExtractor
+            summary = NumericFeatureExtractor.summary(features)
+        else:
+            summary = {
+                'hands_detected': features['hands']['detected'],
+                'hand_count': features['hands']['count'],
+                'lines_detected': features['drawings']['lines_detected'],
+                'line_count': features['drawings']['line_count'],
+                'text_detected': features['text']['text_detected'],
+                'text_words': len(features['text']['words']),
+                'arrows_detected': features['arrows']['arrows_detected'],
+                'motion_detected': features['motion']['motion_detected']
+            }
+        
+        # SMC analysis of the candles (live scanners)
+        if features.get('smc') is not None:
+            summary['smc'] = features['smc']
+        
+        return summary
     
     def _handle_signal(
         self,
@@ -392,76 +746,69 @@ class VisionTradingAgent:
         confidence: float,
         video_id: str,
         frame_idx: int,
-        features: dict,
-        direction: str = 'LONG'
+        features_summary: dict,
+        direction: str = 'LONG',
+        asset: str = None,
+        model_version: str = None
     ):
         """
         Handle a trading signal.
         
         Applies mode-specific logic and sends to Supabase if appropriate.
+        `asset` defaults to DEFAULT_ASSET, `model_version` to the served model.
+        Thread-safe: concurrent calls (scanner workers) are serialized.
         """
-        self.stats['signals_generated'] += 1
-        
-        logger.info(f"Signal: {action} ({direction}) | Confidence: {confidence:.2f} | Frame: {frame_idx}")
-        
-        # Build features summary for logging
-        features_summary = {
-            'hands_detected': features['hands']['detected'],
-            'hand_count': features['hands']['count'],
-            'lines_detected': features['drawings']['lines_detected'],
-            'line_count': features['drawings']['line_count'],
-            'text_detected': features['text']['text_detected'],
-            'text_words': len(features['text']['words']),
-            'arrows_detected': features['arrows']['arrows_detected'],
-            'motion_detected': features['motion']['motion_detected']
-        }
-        
-        # Calculate entry, SL, TP (simplified - in real scenario, would be extracted from features)
-        # Here we use dummy values for demonstration
-        entry_price = 50000.0  # Would come from OCR text extraction
-        risk_reward = config.DEFAULT_RR
-        stop_distance = entry_price * 0.01  # 1% stop
-        
-        if action == 'ENTER':
-            stop_loss = entry_price - stop_distance if direction == 'LONG' else entry_price + stop_distance
-            take_profit = entry_price + (stop_distance * risk_reward) if direction == 'LONG' else entry_price - (stop_distance * risk_reward)
-        else:  # EXIT
-            stop_loss = None
-            take_profit = None
-            entry_price = None
-            risk_reward = None
-        
-        # Send signal based on mode
-        if config.MODE in ['PAPER', 'LIVE']:
-            try:
-                result = self.supabase.send_signal(
-                    action=action,
-                    confidence=confidence,
-                    asset=config.DEFAULT_ASSET,
-                    video_id=video_id,
-                    frame_index=frame_idx,
-                    features_summary=features_summary,
-                    model_version=config.MODEL_VERSION,
-                    entry_price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    risk_reward=risk_reward,
-                    direction=direction
-                )
-                
-                if 'error' not in result:
-                    self.stats['signals_sent'] += 1
+        with self._signal_lock:
+            self.stats['signals_generated'] += 1
+            
+            logger.info(f"Signal: {action} ({direction}) | Confidence: {confidence:.2f} | Frame: {frame_idx}")
+            
+            # Calculate entry, SL, TP (simplified - in real scenario, would be extracted from features)
+            # Here we use dummy values for demonstration
+            entry_price = 50000.0  # Would come from OCR text extraction
+            risk_reward = config.DEFAULT_RR
+            stop_distance = entry_price * 0.01  # 1% stop
+            
+            if action == 'ENTER':
+                stop_loss = entry_price - stop_distance if direction == 'LONG' else entry_price + stop_distance
+                take_profit = entry_price + (stop_distance * risk_reward) if direction == 'LONG' else entry_price - (stop_distance * risk_reward)
+            else:  # EXIT
+                stop_loss = None
+                take_profit = None
+                entry_price = None
+                risk_reward = None
+            
+            # Send signal based on mode
+            if config.MODE in ['PAPER', 'LIVE']:
+                try:
+                    result = self.supabase.send_signal(
+                        action=action,
+                        confidence=confidence,
+                        asset=asset or config.DEFAULT_ASSET,
+                        video_id=video_id,
+                        frame_index=frame_idx,
+                        features_summary=features_summary,
+                        model_version=model_version or self.model.model_version,
+                        entry_price=entry_price,
+                        stop_loss=stop_loss,
+                        take_profit=take_profit,
+                        risk_reward=risk_reward,
+                        direction=direction
+                    )
                     
-                    if result.get('status') == 'executed':
-                        self.stats['signals_executed'] += 1
-                        logger.info("Signal executed successfully!")
-                
-            except Exception as e:
-                logger.error(f"Error sending signal: {e}")
-        
-        else:  # SHADOW mode
-            logger.info(f"SHADOW mode: Signal logged but not sent")
-            logger.info(f"Features: {features_summary}")
+                    if 'error' not in result:
+                        self.stats['signals_sent'] += 1
+                        
+                        if result.get('status') == 'executed':
+                            self.stats['signals_executed'] += 1
+                            logger.info("Signal executed successfully!")
+                    
+                except Exception as e:
+                    logger.error(f"Error sending signal: {e}")
+            
+            else:  # SHADOW mode
+                logger.info(f"SHADOW mode: Signal logged but not sent")
+                logger.info(f"Features: {features_summary}")
     
     def process_playlist(self, playlist_url: str) -> int:
         """
@@ -525,6 +872,30 @@ class VisionTradingAgent:
         logger.info("=" * 40)
 
 
+def replay_predictions(thresholds: list, debounce_seconds: float = 0.0, debounce_frames: int = 0):
+    """Print the signals the prediction log yields per threshold."""
+    from .agent.evaluation import default_thresholds
+    from .agent.prediction_log import read_predictions, replay
+    
+    start = time.time()
+    data = read_predictions()
+    thresholds = thresholds or list(default_thresholds())
+    results = replay(data, thresholds, debounce_seconds=debounce_seconds, debounce_frames=debounce_frames)
+    
+    print(
+        f"{len(data['frame_idx'])} logged predictions, {len(data['streams'])} streams, "
+        f"models: {', '.join(data['models']) or '-'}"
+    )
+    actions = [a for a in data['actions'] if a != 'IGNORE']
+    print("threshold  signals  " + "  ".join(f"{a:>7s}" for a in actions))
+    for row in results:
+        print(
+            f"{row['threshold']:9.2f}  {row['signals']:7d}  "
+            + "  ".join(f"{row[a]:7d}" for a in actions)
+        )
+    print(f"Replayed in {time.time() - start:.2f}s")
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Vision Trading Agent")
@@ -554,8 +925,82 @@ def main():
         help='Model version to use'
     )
     
+    parser.add_argument(
+        '--shadow-model',
+        action='append',
+        default=None,
+        help='Candidate model evaluated on the same windows and logged only (repeatable)'
+    )
+    
+    parser.add_argument(
+        '--replay-predictions',
+        nargs='*',
+        type=float,
+        metavar='THRESHOLD',
+        default=None,
+        help='Replay the prediction log at these confidence thresholds (default sweep) and exit'
+    )
+    
+    parser.add_argument(
+        '--debounce',
+        type=float,
+        default=0.0,
+        help='With --replay-predictions: min seconds between repeated signals (live streams)'
+    )
+    
+    parser.add_argument(
+        '--debounce-frames',
+        type=int,
+        default=0,
+        help='With --replay-predictions: min frames between repeated signals (videos)'
+    )
+    
+    parser.add_argument(
+        '--build-dataset',
+        action='store_true',
+        help='Build training windows from stored features and data/labels/ (new/changed videos only) and exit'
+    )
+    
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='With --build-dataset: rebuild every video'
+    )
+    
+    parser.add_argument(
+        '--fetch-history',
+        nargs=2,
+        metavar=('SYMBOL', 'INTERVAL'),
+        help='Fill or extend the Yahoo Finance history cache of a symbol/interval (for backtests) and exit'
+    )
+    
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Extract whole videos first, then predict all windows in batches'
+    )
+    
     args = parser.parse_args()
     
+    if args.replay_predictions is not None:
+        replay_predictions(args.replay_predictions, args.debounce, args.debounce_frames)
+        return
+    
+    if args.fetch_history:
+        symbol, interval = args.fetch_history
+        cache = HistoryCache()
+        before = cache.rows(symbol, interval)
+        cache.refresh(symbol, interval)
+        candles = cache.load(symbol, interval)
+        print(f"{symbol} {interval}: {len(candles['time'])} candles cached ({len(candles['time']) - before} new) "
+              f"in {cache.path(symbol, interval)}")
+        return
+    
+    if args.build_dataset:
+        from .agent.dataset_builder import DatasetBuilder
+        DatasetBuilder().build(rebuild=args.rebuild)
+        return
+    
     # Override config with CLI arguments
     if args.mode:
         config.MODE = args.mode
@@ -563,13 +1008,24 @@ def main():
     if args.model:
         config.MODEL_VERSION = args.model
     
+    if args.offline:
+        config.OFFLINE_BATCH = True
+    
+    if args.shadow_model:
+        config.SHADOW_MODELS = args.shadow_model
+    
     try:
         agent = VisionTradingAgent()
         
         # If in LIVE mode and no specific video/playlist, start Live Scanner
         if config.MODE == 'LIVE' and not args.video and not args.playlist:
-            logger.info("Starting Live Market Scanner...")
-            scanner = LiveMarketScanner(agent)
+            if (config.LIVE_SYMBOLS or config.LIVE_INTERVALS) and config.PLATFORM == 'BINANCE':
+                from .market import MarketScanner
+                logger.info("Starting Market Scanner...")
+                scanner = MarketScanner(agent)
+            else:
+                logger.info("Starting Live Market Scanner...")
+                scanner = LiveMarketScanner(agent)
             scanner_thread = threading.Thread(target=scanner.start)
             scanner_thread.daemon = True
             scanner_thread.start()
@@ -589,7 +1045,11 @@ def main():
                     
                     logger.info(f"Received command: {line}")
                     
-                    if "list=" in line or "@" in line or "channel/" in line:
+                    if line.startswith("reload"):
+                        # reload [model_version]: hot-swap the model in the background
+                        parts = line.split()
+                        agent.model.reload(parts[1] if len(parts) > 1 else None)
+                    elif "list=" in line or "@" in line or "channel/" in line:
                          agent.process_playlist(line)
                     elif line.startswith("http"):
                          agent.process_video(line)
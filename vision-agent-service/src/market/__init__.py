@@ -0,0 +1,32 @@
+"""Market data package.
+
+Candle storage and history, live candle feeds, resampling, SMC analytics
+and the multi-stream market scanner. Some submodules depend on aiohttp, so
+they are imported on first access to the names below.
+"""
+import importlib
+
+_EXPORTS = {
+    "CandleStore": ".candle_store",
+    "get_store": ".candle_store",
+    "parse_klines": ".candle_store",
+    "KlineStream": ".kline_stream",
+    "MarketDataClient": ".client",
+    "MarketScanner": ".scanner",
+    "ChartRenderer": ".chart",
+    "render_chart": ".chart",
+    "SMCEngine": ".smc",
+    "CandleResampler": ".resampler",
+    "HistoryCache": ".history",
+    "interval_ms": ".intervals"
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
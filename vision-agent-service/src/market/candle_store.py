@@ -0,0 +1,214 @@
+"""In-memory OHLCV window per symbol/interval, backed by NumPy arrays."""
+import threading
+import time
+import numpy as np
+from typing import Dict, Optional, Sequence, Tuple
+
+from .intervals import interval_ms
+
+
+FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+# Binance serves at most this many klines per request
+MAX_FETCH = 1000
+
+
+def parse_klines(rows: Sequence[Sequence]) -> Dict[str, np.ndarray]:
+    """
+    REST kline rows -> column arrays in one conversion.
+
+    Rows are [open time, open, high, low, close, volume, ...] with prices
+    and volumes as strings, as served by /api/v3/klines.
+    """
+    if not len(rows):
+        return {name: np.zeros(0, dtype=np.int64 if name == 'time' else np.float64) for name in FIELDS}
+
+    table = np.array([row[:6] for row in rows], dtype=np.float64)
+    columns = {name: table[:, i] for i, name in enumerate(FIELDS)}
+    columns['time'] = columns['time'].astype(np.int64)  # ms timestamps are exact in float64
+    return columns
+
+
+class CandleStore:
+    """
+    The last `capacity` candles of one symbol/interval as column arrays.
+
+    `update` merges fetched candles: a candle with the open time of the
+    newest one replaces it in place (the still-open candle), newer ones are
+    appended and the oldest drop out; older ones are ignored. `next_fetch`
+    gives the request parameters that fetch only what changed since.
+
+    Columns are exposed as read-only views in time order (`store.close`,
+    `store.time`, ...), without copying. Storage is twice the capacity and
+    is compacted only when the end is reached, so appends are amortized
+    O(1) and views stay contiguous. A view is valid until the next update.
+    """
+
+    def __init__(self, symbol: str, interval: str, capacity: int = 100):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.interval_ms = interval_ms(interval)
+        self.capacity = capacity
+
+        self._data = {
+            name: np.zeros(2 * capacity, dtype=np.int64 if name == 'time' else np.float64)
+            for name in FIELDS
+        }
+        self._start = 0
+        self._end = 0
+        self.version = 0  # Incremented on every change
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _view(self, name: str) -> np.ndarray:
+        view = self._data[name][self._start:self._end]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._view('time')
+
+    @property
+    def open(self) -> np.ndarray:
+        return self._view('open')
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._view('high')
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._view('low')
+
+    @property
+    def close(self) -> np.ndarray:
+        return self._view('close')
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self._view('volume')
+
+    def arrays(self, copy: bool = False) -> Dict[str, np.ndarray]:
+        """All columns as read-only views, or as copies (snapshot for another thread)."""
+        if copy:
+            return {name: self._data[name][self._start:self._end].copy() for name in FIELDS}
+        return {name: self._view(name) for name in FIELDS}
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Open time of the newest candle (None when empty)."""
+        return int(self._data['time'][self._end - 1]) if len(self) else None
+
+    def clear(self):
+        self._start = self._end = 0
+        self.version += 1
+
+    def next_fetch(self, now_ms: int = None) -> dict:
+        """
+        kline request parameters for bringing the store up to date.
+
+        From the newest held candle onwards (it may have changed or closed
+        since) when that fits one request, the whole window otherwise.
+        """
+        if not len(self):
+            return {'limit': self.capacity}
+
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        missing = (now_ms - self.last_time) // self.interval_ms + 1
+        if missing >= min(self.capacity, MAX_FETCH):
+            return {'limit': self.capacity}
+        return {'startTime': self.last_time, 'limit': int(missing) + 1}
+
+    def update(self, time, open, high, low, close, volume) -> int:
+        """
+        Merge candles in ascending time order.
+
+        Returns:
+            Number of candles appended
+        """
+        columns = {
+            'time': np.asarray(time, dtype=np.int64),
+            'open': np.asarray(open, dtype=np.float64),
+            'high': np.asarray(high, dtype=np.float64),
+            'low': np.asarray(low, dtype=np.float64),
+            'close': np.asarray(close, dtype=np.float64),
+            'volume': np.asarray(volume, dtype=np.float64)
+        }
+        times = columns['time']
+        if not len(times):
+            return 0
+
+        changed = False
+        if len(self):
+            last = self.last_time
+            current = np.flatnonzero(times == last)
+            if len(current):
+                # Still-open (or just closed) candle: replace in place
+                row = current[-1]
+                for name in FIELDS:
+                    self._data[name][self._end - 1] = columns[name][row]
+                changed = True
+
+            newer = times > last
+            columns = {name: values[newer] for name, values in columns.items()}
+
+        appended = self._append(columns)
+        if changed or appended:
+            self.version += 1
+        return appended
+
+    def update_rows(self, rows: Sequence[Sequence]) -> int:
+        """Merge REST kline rows (see parse_klines)."""
+        return self.update(**parse_klines(rows))
+
+    def apply(self, candle: Dict) -> int:
+        """Merge one candle dict (time, open, high, low, close, volume)."""
+        if len(self) and candle['time'] == self._data['time'][self._end - 1]:
+            # The open candle changed (most stream events): replace it without the array merge
+            for name in FIELDS:
+                self._data[name][self._end - 1] = candle[name]
+            self.version += 1
+            return 0
+        return self.update(*([candle[name]] for name in FIELDS))
+
+    def _append(self, columns: Dict[str, np.ndarray]) -> int:
+        count = len(columns['time'])
+        if not count:
+            return 0
+
+        size = 2 * self.capacity
+        if count >= self.capacity:
+            columns = {name: values[-self.capacity:] for name, values in columns.items()}
+            self._start = self._end = 0
+            added, count = count, self.capacity
+        else:
+            added = count
+            if self._end + count > size:
+                # Move the candles that stay to the front
+                keep = min(len(self), self.capacity - count)
+                for values in self._data.values():
+                    values[:keep] = values[self._end - keep:self._end]
+                self._start, self._end = 0, keep
+
+        for name in FIELDS:
+            self._data[name][self._end:self._end + count] = columns[name]
+        self._end += count
+        self._start = max(self._start, self._end - self.capacity)
+        return added
+
+
+_stores: Dict[Tuple[str, str], CandleStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(symbol: str, interval: str, capacity: int = 100) -> CandleStore:
+    """Shared store of a symbol/interval (created on first use)."""
+    key = (symbol.upper(), interval)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None or store.capacity < capacity:
+            store = CandleStore(symbol, interval, capacity)
+            _stores[key] = store
+        return store
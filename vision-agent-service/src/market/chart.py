@@ -0,0 +1,172 @@
+"""Candlestick chart rendering for the market scanners."""
+import numpy as np
+from typing import Optional, Tuple
+
+
+WIDTH = 1280
+HEIGHT = 720
+MARGIN = 25  # Vertical margin above the highest high and below the lowest low
+PADDING = 2  # Horizontal gap between bodies
+
+# Colors as the one BGR channel set to 255: green (bullish), red (bearish)
+BULL_CHANNEL = 1
+BEAR_CHANNEL = 2
+
+
+class ChartRenderer:
+    """
+    Renders candles to a 1280x720 BGR image on a persistent canvas.
+
+    All coordinates come from one NumPy pass over the price arrays; wicks
+    and bodies are filled by slicing. Each candle owns a column of
+    `width // len(candles)` pixels, so when the layout and price scale are
+    unchanged only the candles whose geometry changed are redrawn (usually
+    just the still-open last one), and a new candle that pushes the oldest
+    out shifts the canvas by one column. The scale is the window's lowest
+    low and highest high, so it changes only when a new high or low appears
+    or the extreme leaves the window; then the chart is redrawn in full.
+
+    Output is pixel-identical to drawing each candle with cv2.line and
+    cv2.rectangle (benchmarks/bench_chart.py checks it). The returned image
+    is the canvas itself: it is valid until the next render, copy it to keep
+    it. Use one renderer per thread.
+    """
+
+    def __init__(self, width: int = WIDTH, height: int = HEIGHT):
+        self.width = width
+        self.height = height
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+
+        self._layout: Optional[Tuple[int, int]] = None  # (candles, candle width) on the canvas
+        self._geometry: Optional[np.ndarray] = None  # Drawn (y0, y1, top, bottom, bullish) per candle
+        self.stats = {'renders': 0, 'full': 0, 'shifted': 0, 'candles_drawn': 0}
+
+    def render(self, opens: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+        """
+        Render candles, redrawing only what changed since the last render.
+
+        Args:
+            opens, highs, lows, closes: Price arrays in time order (e.g. CandleStore views)
+
+        Returns:
+            The canvas, shape (720, 1280, 3)
+        """
+        self.stats['renders'] += 1
+        count = len(closes)
+        if not count:
+            self._clear()
+            return self.canvas
+
+        geometry = self._scale(opens, highs, lows, closes)
+        candle_width = self.width // count
+        layout = (count, candle_width)
+
+        # Narrow candles overlap their neighbours: always redraw in order
+        if layout != self._layout or candle_width < 3:
+            self._clear()
+            self._layout = layout
+            self._draw(geometry, range(count))
+            self._geometry = geometry
+            self.stats['full'] += 1
+            return self.canvas
+
+        drawn = self._geometry
+        if count > 1 and not np.array_equal(drawn, geometry) and np.array_equal(drawn[1:], geometry[:-1]):
+            # One new candle, same scale: move everything one column left
+            end = count * candle_width
+            self.canvas[:, :end - candle_width] = self.canvas[:, candle_width:end]
+            drawn = np.concatenate([drawn[1:], drawn[-1:]])  # The last column still shows the old last candle
+            self.stats['shifted'] += 1
+
+        changed = np.flatnonzero((drawn != geometry).any(axis=1))
+        if len(changed) > count // 2:
+            self.canvas[:] = 0
+            changed = range(count)
+            self.stats['full'] += 1
+        else:
+            for i in changed.tolist():
+                self.canvas[:, i * candle_width:(i + 1) * candle_width] = 0
+
+        self._draw(geometry, changed)
+        self._geometry = geometry
+        return self.canvas
+
+    def _clear(self):
+        self.canvas[:] = 0
+        self._layout = None
+        self._geometry = None
+
+    def _scale(self, opens, highs, lows, closes) -> np.ndarray:
+        """Pixel rows of every candle: (y0, y1) wick, (top, bottom) body, bullish."""
+        min_price = float(np.min(lows))
+        max_price = float(np.max(highs))
+        price_range = max_price - min_price if max_price > min_price else 1.0
+
+        # Same float64 operations and truncation as int() per price
+        prices = np.stack([highs, lows, opens, closes]).astype(np.float64)
+        plot_height = self.height - 2 * MARGIN
+        y_high, y_low, y_open, y_close = self.height - ((prices - min_price) / price_range * plot_height).astype(np.int64) - MARGIN
+
+        top = np.minimum(y_open, y_close)
+        bottom = np.maximum(y_open, y_close)
+        bottom += bottom == top  # Bodies are at least 1px tall
+
+        geometry = np.stack([
+            np.minimum(y_high, y_low),
+            np.maximum(y_high, y_low),
+            top,
+            bottom,
+            np.asarray(closes) >= np.asarray(opens)
+        ], axis=1)
+        # Rows outside the image are clipped, as OpenCV does
+        np.clip(geometry[:, :4], -1, self.height, out=geometry[:, :4])
+        return geometry
+
+    def _draw(self, geometry: np.ndarray, indices):
+        """Draw the given candles (wick, then body) in order, on cleared columns."""
+        candle_width = self._layout[1]
+        overlap = candle_width < 3  # Later candles paint over earlier ones
+        last_column = self.width - 1
+        rows = geometry.tolist()
+
+        # Scalar writes to one channel are several times faster than BGR triples
+        channels = {
+            True: (self.canvas[:, :, BULL_CHANNEL], self.canvas[:, :, BEAR_CHANNEL]),
+            False: (self.canvas[:, :, BEAR_CHANNEL], self.canvas[:, :, BULL_CHANNEL])
+        }
+
+        for i in indices:
+            y0, y1, top, bottom, bullish = rows[i]
+            color, other = channels[bool(bullish)]
+            x_center = i * candle_width + candle_width // 2
+
+            left = x_center - candle_width // 2 + PADDING
+            right = x_center + candle_width // 2 - PADDING
+            if left > right:
+                left, right = right, left
+            left, right = max(left, 0), min(right, last_column)
+
+            wick = (slice(max(y0, 0), y1 + 1), x_center)
+            body = (slice(max(top, 0), bottom + 1), slice(left, right + 1))
+            color[wick] = 255
+            color[body] = 255
+            if overlap:
+                other[wick] = 0
+                other[body] = 0
+
+        self.stats['candles_drawn'] += len(indices)
+
+
+def render_chart(opens: np.ndarray, highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    """
+    Render candles to a new OpenCV image (BGR).
+
+    Stateless; loops rendering the same stream should keep a ChartRenderer.
+
+    Args:
+        opens, highs, lows, closes: Price arrays in time order (e.g. CandleStore views)
+
+    Returns:
+        Image of shape (720, 1280, 3)
+    """
+    return ChartRenderer().render(opens, highs, lows, closes)
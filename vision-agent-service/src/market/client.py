@@ -0,0 +1,259 @@
+"""Shared, rate-limit-aware client for the Binance market data endpoints."""
+import asyncio
+import heapq
+import itertools
+import time
+import aiohttp
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from ..config import config
+from ..utils import logger
+
+# Request weight per endpoint (Binance spot API); unlisted endpoints weigh 1
+ENDPOINT_WEIGHTS = {
+    '/api/v3/klines': 2,
+    '/api/v3/ticker/price': 2,
+    '/api/v3/exchangeInfo': 20
+}
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1M'
+THROTTLED = (418, 429)  # Rate limited / banned for repeated violations; both send Retry-After
+MAX_RETRIES = 5
+MAX_BACKOFF = 60.0
+
+
+def retry_delay(headers: Mapping[str, str], attempt: int) -> float:
+    """Seconds to wait after a throttled response: its Retry-After, else exponential backoff."""
+    try:
+        return max(float(headers.get('Retry-After', '')), 0.0)
+    except ValueError:
+        return min(2.0 ** attempt, MAX_BACKOFF)
+
+
+class WeightBudget:
+    """
+    Request-weight accounting against an exchange's per-window limit.
+
+    A token bucket holding `burst` weight refills at `limit` per `window`
+    seconds, spreading requests instead of spending the whole limit at
+    once. The used weight the exchange reports in its responses caps the
+    remaining weight until its (clock-aligned) window rolls over, so other
+    clients on the same IP are accounted for too. A Retry-After blocks all
+    requests until it passes.
+    """
+
+    def __init__(self, limit: int, window: float = 60.0, burst: float = None):
+        """
+        Args:
+            limit: Weight allowed per window (0 = unlimited)
+            window: Window length in seconds
+            burst: Bucket size (default: a sixth of the limit)
+        """
+        self.limit = limit
+        self.window = window
+        self.capacity = burst if burst is not None else max(limit / 6.0, 1.0)
+        self.rate = limit / window
+
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._window_id: Optional[int] = None  # Window of `_used`
+        self._used = 0  # Weight used in that window, as far as known
+        self._blocked_until = 0.0  # Monotonic time a Retry-After expires
+
+    def delay(self, weight: int) -> float:
+        """Seconds until `weight` can be spent (0 = now)."""
+        if not self.limit:
+            return max(self._blocked_until - time.monotonic(), 0.0)
+
+        now = time.monotonic()
+        self._refill(now)
+        waits = [self._blocked_until - now, (min(weight, self.capacity) - self._tokens) / self.rate]
+        window_id = self._current_window()
+        if window_id == self._window_id and self._used + weight > self.limit:
+            waits.append((window_id + 1) * self.window - time.time())  # Until the exchange's window rolls over
+        return max(max(waits), 0.0)
+
+    def spend(self, weight: int):
+        if not self.limit:
+            return
+        self._refill(time.monotonic())
+        self._tokens -= weight
+        window_id = self._current_window()
+        if window_id != self._window_id:
+            self._window_id, self._used = window_id, 0
+        self._used += weight
+
+    def sync(self, used: int):
+        """Weight the exchange reports used in its current window."""
+        window_id = self._current_window()
+        if window_id != self._window_id:
+            self._window_id, self._used = window_id, 0
+        self._used = max(self._used, used)  # Ours not counted yet stay counted
+
+    def block(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _current_window(self) -> int:
+        return int(time.time() // self.window)
+
+
+class MarketDataClient:
+    """
+    One REST client for every market data consumer of a process.
+
+    Requests pass a priority gate: they start when the WeightBudget allows
+    their endpoint weight and a connection slot is free, lowest priority
+    value first (the scanner passes the seconds until a stream's candle
+    closes, so streams about to close, or just closed, go first).
+    Identical requests already in flight are not sent again: callers share
+    the response. Throttled responses (429/418) block all requests for
+    their Retry-After and are retried.
+
+    Usage:
+        async with aiohttp.ClientSession() as session:
+            client = MarketDataClient(session)
+            rows = await client.klines({'symbol': 'BTCUSDT', 'interval': '1m', 'limit': 100})
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        rest_url: str = None,
+        connections: int = None,
+        weight_limit: int = None,
+        weight_window: float = 60.0
+    ):
+        """
+        Args:
+            session: aiohttp session the requests are made with
+            rest_url: Exchange REST base URL (default: BINANCE_REST_URL)
+            connections: Requests in flight at once (default: SCANNER_HTTP_CONNECTIONS)
+            weight_limit: Weight per window (default: MARKET_WEIGHT_PER_MINUTE, 0 = unlimited)
+            weight_window: Weight window in seconds
+        """
+        self.session = session
+        self.rest_url = (rest_url or config.BINANCE_REST_URL).rstrip('/')
+        self.connections = connections or config.SCANNER_HTTP_CONNECTIONS
+        limit = config.MARKET_WEIGHT_PER_MINUTE if weight_limit is None else weight_limit
+        self.budget = WeightBudget(limit, weight_window)
+
+        self._active = 0
+        self._waiting: List[Tuple[float, int, int, asyncio.Future]] = []  # (priority, seq, weight, future)
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+        self.stats = {'requests': 0, 'coalesced': 0, 'queued': 0, 'throttled': 0, 'weight': 0}
+
+    async def klines(self, params: Dict, priority: float = 0.0) -> list:
+        """GET /api/v3/klines rows."""
+        return await self.get('/api/v3/klines', params, priority)
+
+    async def get(self, path: str, params: Dict, priority: float = 0.0):
+        """
+        GET a JSON endpoint through the gate.
+
+        Args:
+            path: Endpoint path, e.g. '/api/v3/klines'
+            params: Query parameters
+            priority: Lower starts first when requests wait
+        """
+        key = (path, tuple(sorted(params.items())))
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(self._request(path, params, priority))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        return await asyncio.shield(task)  # A cancelled caller leaves the request to the others
+
+    def close(self):
+        """Cancel requests in flight (before their session closes)."""
+        for task in list(self._in_flight.values()):
+            task.cancel()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _finished(self, key: tuple, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Retrieved here when every caller was cancelled
+
+    async def _request(self, path: str, params: Dict, priority: float):
+        weight = ENDPOINT_WEIGHTS.get(path, 1)
+        for attempt in itertools.count():
+            await self._acquire(weight, priority)
+            try:
+                self.stats['requests'] += 1
+                self.stats['weight'] += weight
+                async with self.session.get(f"{self.rest_url}{path}", params=params) as response:
+                    used = response.headers.get(USED_WEIGHT_HEADER)
+                    if used is not None:
+                        self.budget.sync(int(used))
+                    if response.status in THROTTLED and attempt < MAX_RETRIES:
+                        delay = retry_delay(response.headers, attempt)
+                        if self.budget.delay(0) == 0:  # Once per block, not per request in flight
+                            logger.warning(f"Market data throttled ({response.status}) on {path}, pausing requests for {delay:.1f}s")
+                        self.budget.block(delay)
+                        self.stats['throttled'] += 1
+                        continue
+                    response.raise_for_status()
+                    return await response.json()
+            finally:
+                self._release()
+
+    # Gate
+
+    async def _acquire(self, weight: int, priority: float):
+        """Wait for a connection slot and the weight budget, by priority."""
+        if not self._waiting and self._active < self.connections and self.budget.delay(weight) == 0:
+            self._start(weight)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), weight, future))
+        self.stats['queued'] += 1
+        self._grant()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # Granted just as the caller was cancelled
+            raise
+
+    def _start(self, weight: int):
+        self._active += 1
+        self.budget.spend(weight)
+
+    def _release(self):
+        self._active -= 1
+        self._grant()
+
+    def _grant(self):
+        """Start waiting requests in priority order while slots and weight allow."""
+        while self._waiting and self._active < self.connections:
+            priority, _, weight, future = self._waiting[0]
+            if future.cancelled():
+                heapq.heappop(self._waiting)
+                continue
+            delay = self.budget.delay(weight)
+            if delay > 0:
+                self._wake_in(delay)
+                return
+            heapq.heappop(self._waiting)
+            self._start(weight)
+            future.set_result(None)
+
+    def _wake_in(self, delay: float):
+        if self._timer is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._timer = loop.call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._grant()
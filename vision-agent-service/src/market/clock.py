@@ -0,0 +1,51 @@
+"""Wake-up times aligned to candle closes."""
+from typing import Tuple
+
+from .intervals import interval_ms, interval_start
+
+CLOSE_RETRY_SECONDS = 0.5  # Wait before re-fetching when a close is not visible yet
+CLOSE_RETRIES = 10
+
+
+class CandleClock:
+    """
+    Schedules the fetches of one candle interval on its closes.
+
+    Wake-ups fall `delay` seconds after each candle close and, with a
+    `cadence`, every `cadence` seconds from the candle's open in between.
+    They are absolute times, so however long processing took the next
+    wake-up stays aligned; wake-ups that passed during processing are
+    skipped rather than run late.
+    """
+
+    def __init__(self, interval: str, cadence: float = 0.0, delay: float = 0.0):
+        """
+        Args:
+            interval: Candle interval, e.g. '1m'
+            cadence: Seconds between wake-ups within a candle (0 = closes only)
+            delay: Seconds after a close before waking (exchange settle time)
+        """
+        self.interval = interval
+        self.length_ms = interval_ms(interval)
+        self.cadence_ms = int(cadence * 1000)
+        self.delay_ms = int(delay * 1000)
+
+    def next_wake(self, now_ms: int) -> Tuple[int, bool]:
+        """
+        Next wake-up after `now_ms`.
+
+        Returns:
+            (wake time in ms, True if it follows a candle close)
+        """
+        open_time = interval_start(now_ms - self.delay_ms, self.interval)
+        close_wake = open_time + self.length_ms + self.delay_ms
+        if self.cadence_ms:
+            elapsed = now_ms - open_time - self.delay_ms
+            tick = open_time + self.delay_ms + (elapsed // self.cadence_ms + 1) * self.cadence_ms
+            if tick < close_wake:
+                return tick, False
+        return close_wake, True
+
+    def close_time(self, wake_ms: int) -> int:
+        """Close time (= open time of the next candle) a close wake-up follows."""
+        return wake_ms - self.delay_ms
@@ -0,0 +1,208 @@
+"""Persistent columnar OHLCV history per symbol/interval."""
+import json
+import os
+import re
+import threading
+import time
+import numpy as np
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ..config import config
+from ..utils import logger, lazy_import
+from .intervals import interval_ms
+
+yf = lazy_import('yfinance')
+
+FORMAT_VERSION = 1
+DTYPES = {'time': '<i8', 'open': '<f8', 'high': '<f8', 'low': '<f8', 'close': '<f8', 'volume': '<f8'}
+
+# How far back Yahoo Finance serves each intraday interval (days); daily and longer: everything
+YF_LOOKBACK_DAYS = {'1m': 7, '2m': 60, '5m': 60, '15m': 60, '30m': 60, '60m': 730, '90m': 60, '1h': 730}
+DAY_MS = 24 * 60 * 60_000
+
+
+def empty_columns() -> Dict[str, np.ndarray]:
+    return {name: np.empty(0, dtype=dtype) for name, dtype in DTYPES.items()}
+
+
+def frame_columns(df) -> Dict[str, np.ndarray]:
+    """yfinance history DataFrame -> OHLCV columns (the DatetimeIndex -> UTC ms timestamps, whatever its unit)."""
+    if df.empty:
+        return empty_columns()
+    return {
+        'time': df.index.to_numpy(dtype='datetime64[ms]').astype(np.int64),
+        'open': df['Open'].to_numpy(dtype=np.float64),
+        'high': df['High'].to_numpy(dtype=np.float64),
+        'low': df['Low'].to_numpy(dtype=np.float64),
+        'close': df['Close'].to_numpy(dtype=np.float64),
+        'volume': df['Volume'].to_numpy(dtype=np.float64)
+    }
+
+
+def fetch_yfinance(symbol: str, interval: str, start_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Candles from Yahoo Finance from `start_ms` on (the whole look-back when None).
+
+    Starts older than Yahoo serves for the interval are moved up to its limit.
+    """
+    ticker = yf.Ticker(symbol)
+    days = YF_LOOKBACK_DAYS.get(interval)
+    if days is not None:
+        oldest = int(time.time() * 1000) - (days - 1) * DAY_MS
+        start_ms = oldest if start_ms is None else max(start_ms, oldest)
+
+    if start_ms is None:
+        df = ticker.history(period='max', interval=interval)
+    else:
+        df = ticker.history(start=datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc), interval=interval)
+    return frame_columns(df)
+
+
+def _safe_name(name: str) -> str:
+    """Symbol usable as a directory name (EURUSD=X -> EURUSD_X)."""
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+
+
+class HistoryCache:
+    """
+    Closed candles of each symbol/interval on disk, one raw little-endian
+    file per column:
+
+        <root>/<symbol>/<interval>/{time,open,high,low,close,volume}.bin
+        <root>/<symbol>/<interval>/meta.json  (dtypes, source)
+
+    `refresh` fetches only the candles after the newest cached one and
+    appends those that closed; the still-open candle is returned but not
+    stored. Files are plain arrays, so `load` memory-maps them: the live
+    loop fills its window from the cache, and backtests read long histories
+    without refetching or decoding. Rows are counted from the file sizes
+    and columns are trimmed to the shortest on append, so an interrupted
+    write loses at most the rows being written.
+    """
+
+    def __init__(self, root: Path = None, fetch: Callable = None, source: str = 'yfinance'):
+        """
+        Args:
+            root: Cache directory (default: HISTORY_DIR)
+            fetch: (symbol, interval, start_ms or None) -> columns (default: Yahoo Finance)
+            source: Name of the data source, recorded in meta.json
+        """
+        self.root = Path(root or config.HISTORY_DIR)
+        self.fetch = fetch or fetch_yfinance
+        self.source = source
+        self._lock = threading.Lock()
+
+    def path(self, symbol: str, interval: str) -> Path:
+        return self.root / _safe_name(symbol.upper()) / interval
+
+    def rows(self, symbol: str, interval: str) -> int:
+        """Candles cached."""
+        path = self.path(symbol, interval)
+        sizes = [
+            os.path.getsize(path / f'{name}.bin') // np.dtype(dtype).itemsize if (path / f'{name}.bin').exists() else 0
+            for name, dtype in DTYPES.items()
+        ]
+        return min(sizes)
+
+    def last_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time of the newest cached candle (None when empty)."""
+        rows = self.rows(symbol, interval)
+        if not rows:
+            return None
+        with open(self.path(symbol, interval) / 'time.bin', 'rb') as f:
+            f.seek((rows - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype=DTYPES['time'])[0])
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Cached candles as read-only memory-mapped columns.
+
+        Args:
+            start_ms: First open time included (default: oldest)
+            end_ms: Open times before this only (default: newest)
+            last: Only the newest `last` candles of the range
+        """
+        rows = self.rows(symbol, interval)
+        if not rows:
+            return empty_columns()
+
+        path = self.path(symbol, interval)
+        columns = {
+            name: np.memmap(path / f'{name}.bin', dtype=dtype, mode='r', shape=(rows,))
+            for name, dtype in DTYPES.items()
+        }
+        times = columns['time']
+        lo = int(np.searchsorted(times, start_ms)) if start_ms is not None else 0
+        hi = int(np.searchsorted(times, end_ms)) if end_ms is not None else rows
+        if last is not None:
+            lo = max(lo, hi - last)
+        return {name: values[lo:hi] for name, values in columns.items()}
+
+    def append(self, symbol: str, interval: str, columns: Dict[str, np.ndarray], now_ms: int = None) -> int:
+        """
+        Cache the closed candles newer than the newest cached one.
+
+        Returns:
+            Number of candles appended
+        """
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        times = np.asarray(columns['time'], dtype=np.int64)
+
+        with self._lock:
+            path = self.path(symbol, interval)
+            path.mkdir(parents=True, exist_ok=True)
+            rows = self.rows(symbol, interval)
+            if not (path / 'meta.json').exists():
+                self._write_meta(path, symbol, interval)
+
+            last = self.last_time(symbol, interval)
+            keep = times + interval_ms(interval) <= now_ms  # Closed
+            if last is not None:
+                keep &= times > last
+            count = int(keep.sum())
+            if not count:
+                return 0
+
+            for name, dtype in DTYPES.items():
+                with open(path / f'{name}.bin', 'ab') as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)  # Drop a partial write
+                    np.asarray(columns[name], dtype=dtype)[keep].tofile(f)
+            return count
+
+    def refresh(self, symbol: str, interval: str, now_ms: int = None) -> Dict[str, np.ndarray]:
+        """
+        Fetch the candles after the newest cached one (the source's whole
+        look-back when empty) and cache those that closed.
+
+        Returns:
+            The fetched columns, still-open candle included
+        """
+        last = self.last_time(symbol, interval)
+        start_ms = None if last is None else last + interval_ms(interval)
+        columns = self.fetch(symbol, interval, start_ms)
+        added = self.append(symbol, interval, columns, now_ms)
+        if last is None:
+            logger.info(f"History cache {symbol} {interval}: {added} candles from {self.source}")
+        return columns
+
+    def _write_meta(self, path: Path, symbol: str, interval: str):
+        meta = {
+            'format': FORMAT_VERSION,
+            'symbol': symbol.upper(),
+            'interval': interval,
+            'source': self.source,
+            'columns': {name: {'dtype': dtype} for name, dtype in DTYPES.items()},
+            'created': time.time()
+        }
+        tmp = path / 'meta.json.tmp'
+        tmp.write_text(json.dumps(meta, indent=2))
+        tmp.replace(path / 'meta.json')
@@ -0,0 +1,56 @@
+"""Candle interval helpers."""
+import numpy as np
+
+# Binance interval names -> milliseconds (fixed-length intervals only)
+INTERVAL_MS = {
+    '1s': 1_000,
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 60 * 60_000,
+    '2h': 2 * 60 * 60_000,
+    '4h': 4 * 60 * 60_000,
+    '6h': 6 * 60 * 60_000,
+    '8h': 8 * 60 * 60_000,
+    '12h': 12 * 60 * 60_000,
+    '1d': 24 * 60 * 60_000,
+    '3d': 3 * 24 * 60 * 60_000,
+    '1w': 7 * 24 * 60 * 60_000,
+    # Yahoo Finance names
+    '2m': 2 * 60_000,
+    '60m': 60 * 60_000,
+    '90m': 90 * 60_000,
+    '1wk': 7 * 24 * 60 * 60_000
+}
+
+
+def interval_ms(interval: str) -> int:
+    """Length of a candle interval in milliseconds."""
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported candle interval: {interval}") from None
+
+
+# Candles open at multiples of their length since the epoch, except weekly
+# ones, which open on Monday 00:00 UTC (the epoch was a Thursday)
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60_000
+
+
+def interval_start(time_ms, interval: str):
+    """
+    Open time of the candle of `interval` containing `time_ms`.
+
+    Args:
+        time_ms: Timestamp in ms, or an integer array of them
+
+    Returns:
+        Open time(s) in ms, same shape as `time_ms`
+    """
+    length = interval_ms(interval)
+    offset = WEEK_OFFSET_MS if interval in ('1w', '1wk') else 0
+    if isinstance(time_ms, np.ndarray):
+        return time_ms - (time_ms - offset) % length
+    return int(time_ms) - (int(time_ms) - offset) % length
@@ -0,0 +1,173 @@
+"""Binance kline WebSocket feed with REST backfill."""
+import asyncio
+import aiohttp
+from typing import Callable, Dict, Optional
+
+from ..config import config
+from ..utils import logger
+from .candle_store import CandleStore
+from .client import MarketDataClient
+
+
+def parse_ws_kline(kline: dict) -> Dict:
+    """WebSocket kline payload ("k" of a kline event) -> candle dict."""
+    return {
+        'time': int(kline['t']),
+        'open': float(kline['o']),
+        'high': float(kline['h']),
+        'low': float(kline['l']),
+        'close': float(kline['c']),
+        'volume': float(kline['v'])
+    }
+
+
+class KlineStream:
+    """
+    Keeps the last `limit` candles of a symbol/interval up to date from the
+    Binance kline WebSocket stream.
+
+    The window (a CandleStore) is filled over REST, then each kline event
+    replaces the open candle in place or appends a new one. After a
+    reconnect, or when an event skips candles, the missing candles are
+    backfilled over REST before the event is applied, so the window never
+    has holes. Disconnects are
+    retried with backoff and the stream is subscribed again.
+
+    `on_candle(store, closed)` is called after every applied event
+    (`closed` is True when the event closed its candle) and after a backfill
+    that added candles.
+    """
+
+    RECONNECT_DELAYS = (1, 2, 5, 10, 30)
+
+    def __init__(
+        self,
+        symbol: str,
+        interval: str,
+        limit: int = 100,
+        on_candle: Optional[Callable[[CandleStore, bool], None]] = None,
+        ws_url: str = None,
+        rest_url: str = None,
+        store: CandleStore = None,
+        session: aiohttp.ClientSession = None,
+        client: MarketDataClient = None
+    ):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.limit = limit
+        self.on_candle = on_candle
+        self.ws_url = (ws_url or config.BINANCE_WS_URL).rstrip('/')
+        self.rest_url = (rest_url or config.BINANCE_REST_URL).rstrip('/')
+
+        self.store = store if store is not None else CandleStore(symbol, interval, limit)
+        self.stats = {
+            'messages': 0,
+            'reconnects': 0,
+            'backfills': 0,
+            'backfilled_candles': 0
+        }
+
+        self._running = False
+        self._shared_session = session  # Pooled client of a multi-stream scanner
+        self._client = client  # Its rate-limited REST client, for backfills
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws = None
+
+    @property
+    def stream_name(self) -> str:
+        return f"{self.symbol.lower()}@kline_{self.interval}"
+
+    async def run(self):
+        """Backfill, subscribe and apply events until stop() is called."""
+        self._running = True
+
+        if self._shared_session is not None:
+            self._session = self._shared_session
+            await self._run(self._shared_session)
+        else:
+            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+                self._session = session
+                await self._run(session)
+
+        self._session = None
+
+    async def _run(self, session: aiohttp.ClientSession):
+        """Connect, subscribe and reconnect with backoff."""
+        attempt = 0
+
+        while self._running:
+            try:
+                await self.backfill()
+
+                async with session.ws_connect(f"{self.ws_url}/ws", heartbeat=30) as ws:
+                    self._ws = ws
+                    await ws.send_json({'method': 'SUBSCRIBE', 'params': [self.stream_name], 'id': 1})
+                    logger.info(f"Subscribed to {self.stream_name}")
+                    attempt = 0
+
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            await self._handle(message.json())
+                        elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Kline stream {self.stream_name} error: {e}")
+            finally:
+                self._ws = None
+
+            if not self._running:
+                break
+
+            delay = self.RECONNECT_DELAYS[min(attempt, len(self.RECONNECT_DELAYS) - 1)]
+            attempt += 1
+            self.stats['reconnects'] += 1
+            logger.info(f"Kline stream {self.stream_name} disconnected, resubscribing in {delay}s")
+            await asyncio.sleep(delay)
+
+    async def stop(self):
+        """Stop the stream and close the connection."""
+        self._running = False
+        if self._ws is not None:
+            await self._ws.close()
+
+    async def backfill(self):
+        """Fetch candles missing since the last one held (or the whole window)."""
+        params = {'symbol': self.symbol, 'interval': self.interval, **self.store.next_fetch()}
+
+        if self._client is not None:
+            rows = await self._client.klines(params)
+        else:
+            async with self._session.get(f"{self.rest_url}/api/v3/klines", params=params) as response:
+                response.raise_for_status()
+                rows = await response.json()
+
+        added = self.store.update_rows(rows)
+
+        self.stats['backfills'] += 1
+        self.stats['backfilled_candles'] += added
+
+        if added and self.on_candle is not None:
+            self.on_candle(self.store, True)
+
+    async def _handle(self, message: dict):
+        """Apply one WebSocket message."""
+        # Combined streams wrap events as {"stream": ..., "data": {...}}
+        event = message.get('data', message)
+        if event.get('e') != 'kline':
+            return
+
+        self.stats['messages'] += 1
+        kline = event['k']
+        candle = parse_ws_kline(kline)
+
+        last = self.store.last_time
+        if last is not None and candle['time'] > last + self.store.interval_ms:
+            logger.info(f"Kline stream {self.stream_name}: gap before {candle['time']}, backfilling")
+            await self.backfill()
+
+        self.store.apply(candle)
+
+        if self.on_candle is not None:
+            self.on_candle(self.store, bool(kline.get('x')))
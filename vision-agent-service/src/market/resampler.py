@@ -0,0 +1,171 @@
+"""Higher-interval candles built locally from a base interval."""
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .candle_store import FIELDS, CandleStore
+from .intervals import interval_ms, interval_start
+
+
+def aggregate(columns: Dict[str, np.ndarray], interval: str) -> Dict[str, np.ndarray]:
+    """
+    Group candles (ascending, contiguous) into candles of `interval`.
+
+    Open of the first, close of the last, extreme high/low and summed
+    volume per group; a group is only as complete as the candles given.
+    """
+    time = np.asarray(columns['time'], dtype=np.int64)
+    if not len(time):
+        return {name: np.asarray(columns[name])[:0] for name in FIELDS}
+
+    buckets = interval_start(time, interval)
+    starts = np.concatenate([[0], np.flatnonzero(buckets[1:] != buckets[:-1]) + 1])
+    ends = np.concatenate([starts[1:], [len(time)]])
+    return {
+        'time': buckets[starts],
+        'open': np.asarray(columns['open'], dtype=np.float64)[starts],
+        'high': np.maximum.reduceat(np.asarray(columns['high'], dtype=np.float64), starts),
+        'low': np.minimum.reduceat(np.asarray(columns['low'], dtype=np.float64), starts),
+        'close': np.asarray(columns['close'], dtype=np.float64)[ends - 1],
+        'volume': np.add.reduceat(np.asarray(columns['volume'], dtype=np.float64), starts)
+    }
+
+
+class CandleResampler:
+    """
+    Keeps higher-interval CandleStores up to date from a base-interval one.
+
+    Each `update` folds only the base candles that changed since the last
+    call: closed base candles go into the partial candle of each target
+    interval (emitted to its store when a base candle of the next interval
+    arrives), and the still-open base candle is merged on top to update the
+    open higher-interval candle in place. All targets are derived from the
+    same base candles, so they agree with each other at any instant.
+
+    The base store only needs to hold the candles since the previous
+    update; the partial candles cover the rest of each open interval.
+    `seed` feeds base history from the start of the open intervals (e.g.
+    fetched once at start-up), without it the first higher candles are
+    incomplete. Intervals must be whole multiples of the base interval.
+    """
+
+    def __init__(self, base: CandleStore, targets: Iterable[CandleStore]):
+        self.base = base
+        self.targets: Dict[str, CandleStore] = {}
+        for store in targets:
+            length = interval_ms(store.interval)
+            if length <= base.interval_ms or length % base.interval_ms:
+                raise ValueError(f"Cannot build {store.interval} candles from {base.interval} candles")
+            self.targets[store.interval] = store
+
+        self._last_time: Optional[int] = None  # Newest base candle folded (still open then)
+        self._partial: Dict[str, Optional[Dict[str, float]]] = {interval: None for interval in self.targets}
+        self.stats = {'updates': 0, 'base_candles': 0, 'emitted': 0, 'gaps': 0}
+
+    def open_interval_start(self, now_ms: int) -> int:
+        """Open time of the oldest open target candle: where `seed` history should start."""
+        return min(interval_start(now_ms, interval) for interval in self.targets)
+
+    def seed(self, columns: Dict[str, np.ndarray]) -> Dict[str, Tuple[int, bool]]:
+        """Fold base candles fetched outside the base store (see update)."""
+        return self._feed(columns)
+
+    def update(self) -> Dict[str, Tuple[int, bool]]:
+        """
+        Fold the base store's candles changed since the last update.
+
+        Returns:
+            {interval: (candles appended, store changed)} per target
+        """
+        return self._feed(self.base.arrays())
+
+    def _feed(self, columns: Dict[str, np.ndarray]) -> Dict[str, Tuple[int, bool]]:
+        time = columns['time']
+        self.stats['updates'] += 1
+        if not len(time):
+            return {interval: (0, False) for interval in self.targets}
+
+        # The previous newest candle may have changed or closed since: fold from it
+        start = 0
+        if self._last_time is not None:
+            start = int(np.searchsorted(time, self._last_time))
+            if start == len(time):
+                return {interval: (0, False) for interval in self.targets}
+            if start == 0 and time[0] > self._last_time + self.base.interval_ms:
+                self.stats['gaps'] += 1  # Base candles were missed: the open higher candles lack them
+        closed = {name: values[start:-1] for name, values in columns.items()}
+        current = {name: values[-1] for name, values in columns.items()}
+        self._last_time = int(time[-1])
+        self.stats['base_candles'] += len(time) - start
+
+        results = {}
+        for interval, store in self.targets.items():
+            version = store.version
+            appended = self._fold(interval, store, closed)
+            appended += self._merge_open(interval, store, current)
+            results[interval] = (appended, store.version != version)
+        return results
+
+    def _fold(self, interval: str, store: CandleStore, closed: Dict[str, np.ndarray]) -> int:
+        """Add closed base candles to the partial candle; emit the ones that completed."""
+        if not len(closed['time']):
+            return 0
+
+        groups = aggregate(closed, interval)
+        partial = self._partial[interval]
+        if partial is not None:
+            if partial['time'] == groups['time'][0]:
+                groups['open'][0] = partial['open']
+                groups['high'][0] = max(groups['high'][0], partial['high'])
+                groups['low'][0] = min(groups['low'][0], partial['low'])
+                groups['volume'][0] += partial['volume']
+            else:
+                groups = {name: np.concatenate([[partial[name]], values]) for name, values in groups.items()}
+
+        # Every group but the last is complete: a later base candle exists
+        self._partial[interval] = {name: values[-1].item() for name, values in groups.items()}
+        complete = {name: values[:-1] for name, values in groups.items()}
+        self.stats['emitted'] += len(complete['time'])
+        return store.update(**complete)
+
+    def _merge_open(self, interval: str, store: CandleStore, current: Dict) -> int:
+        """Write the open higher candle: the partial candle plus the open base candle."""
+        bucket = interval_start(int(current['time']), interval)
+        partial = self._partial[interval]
+        appended = 0
+        if partial is not None and partial['time'] != bucket:
+            # The open base candle starts a new interval: the partial one is complete
+            appended += store.update(*([partial[name]] for name in FIELDS))
+            self.stats['emitted'] += 1
+            self._partial[interval] = partial = None
+
+        candle = {
+            'time': bucket,
+            'open': float(current['open']),
+            'high': float(current['high']),
+            'low': float(current['low']),
+            'close': float(current['close']),
+            'volume': float(current['volume'])
+        }
+        if partial is not None:
+            candle['open'] = partial['open']
+            candle['high'] = max(candle['high'], partial['high'])
+            candle['low'] = min(candle['low'], partial['low'])
+            candle['volume'] += partial['volume']
+        return appended + store.apply(candle)
+
+
+def resample_groups(intervals: Iterable[str]) -> List[Tuple[str, List[str]]]:
+    """
+    Split intervals into (base, derived) groups: each derived interval is a
+    whole multiple of its base, the finest interval that divides it.
+    """
+    ordered = sorted(set(intervals), key=interval_ms)
+    groups: List[Tuple[str, List[str]]] = []
+    for interval in ordered:
+        for base, derived in groups:
+            if interval_ms(interval) % interval_ms(base) == 0:
+                derived.append(interval)
+                break
+        else:
+            groups.append((interval, []))
+    return groups
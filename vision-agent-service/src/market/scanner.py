@@ -0,0 +1,595 @@
+"""Asyncio scanner for many live symbol/interval streams."""
+import asyncio
+import collections
+import itertools
+import threading
+import time
+import aiohttp
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import config
+from ..utils import logger
+from .candle_store import get_store, parse_klines, MAX_FETCH
+from .chart import ChartRenderer
+from .client import MarketDataClient
+from .clock import CandleClock, CLOSE_RETRIES, CLOSE_RETRY_SECONDS
+from .intervals import interval_ms
+from .kline_stream import KlineStream
+from .resampler import CandleResampler, resample_groups
+from .smc import SMCEngine
+
+
+class ScannerStream:
+    """Candles, frame buffer, extractor state and SMC analysis of one symbol/interval."""
+
+    def __init__(self, symbol: str, interval: str, limit: int, video_id: str):
+        from ..agent import FrameBuffer
+
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.video_id = video_id
+        self.store = get_store(self.symbol, interval, limit)
+        self.frame_buffer = FrameBuffer()
+        self.extractor_state = None  # FeatureExtractor.get_state() of this stream
+        self.smc = SMCEngine()  # Updated with each processed window
+
+        # Higher intervals of the same symbol built locally from this one (SCANNER_RESAMPLE)
+        self.source: Optional['ScannerStream'] = None  # Stream whose candles this one is built from
+        self.derived: List['ScannerStream'] = []
+        self.resampler: Optional[CandleResampler] = None
+
+        self.busy = False
+        self.pending: Optional[float] = None  # Schedule time of an update that arrived while busy
+        self.lags = collections.deque(maxlen=100)  # ms from scheduled poll (or event) to decision
+        self.close_lag_ms: Optional[float] = None  # ms from candle close to decision, last close
+        self.stats = {'polls': 0, 'processed': 0, 'coalesced': 0, 'errors': 0, 'missed_polls': 0}
+
+    @property
+    def name(self) -> str:
+        return f"{self.symbol}@{self.interval}"
+
+
+class MarketScanner:
+    """
+    Watches many (symbol, interval) streams in one process.
+
+    All streams share one aiohttp session with a bounded connection pool and
+    one FeatureExtractor/model (through the agent). Each stream has its own
+    CandleStore, FrameBuffer and extractor state, swapped into the shared
+    extractor around each extraction.
+
+    With the polling feed each stream fetches only changed candles just
+    after each of its candle closes (a CandleClock; LIVE_TRIGGER=close), or
+    every `poll_seconds` staggered over the period so requests do not burst
+    (update); with LIVE_FEED=stream each stream follows its kline
+    WebSocket. Updates that trigger an analysis (a new candle with LIVE_TRIGGER=close, any
+    change with update) are rendered, extracted and predicted in a thread
+    pool; with LIVE_FEATURES=candles numeric candle features replace the
+    chart and the candle model predicts (no rendering, no extractor lock).
+    Each stream's SMC analysis is updated incrementally with its window and
+    sent in the signal's features summary. A stream whose previous update is
+    still being processed is coalesced: it is processed once more
+    afterwards, on its newest candles.
+    With INFERENCE_BROKER the predictions of concurrent streams are batched.
+
+    With SCANNER_RESAMPLE only the finest interval of each symbol is fetched
+    or streamed; the symbol's other intervals (whole multiples of it) are
+    built from it by a CandleResampler after every update, so they cost no
+    requests after a one-off history fetch at start-up and their open
+    candles always agree.
+
+    Lag per stream is the time from the scheduled poll (or the WebSocket
+    event) to the decision; `report()` lists it and a summary is logged
+    every SCANNER_REPORT_SECONDS.
+    """
+
+    def __init__(
+        self,
+        agent,
+        streams: Sequence[Tuple[str, str]] = None,
+        limit: int = 100,
+        poll_seconds: float = None,
+        workers: int = None,
+        connections: int = None,
+        feed: str = None,
+        trigger: str = None,
+        features: str = None,
+        resample: bool = None,
+        rest_url: str = None,
+        ws_url: str = None
+    ):
+        """
+        Args:
+            agent: VisionTradingAgent (extractor, model, broker, signals)
+            streams: (symbol, interval) pairs (default: LIVE_SYMBOLS x LIVE_INTERVALS)
+            limit: Candles per stream window
+            poll_seconds: Poll period per stream with trigger 'update' (default: SCANNER_POLL_SECONDS)
+            workers: Processing threads (default: SCANNER_WORKERS)
+            connections: Pooled HTTP connections (default: SCANNER_HTTP_CONNECTIONS)
+            feed: 'poll' or 'stream' (default: LIVE_FEED)
+            trigger: 'close' or 'update' (default: LIVE_TRIGGER)
+            features: 'chart' or 'candles' (default: LIVE_FEATURES)
+            resample: Build higher intervals from the finest (default: SCANNER_RESAMPLE)
+        """
+        self.agent = agent
+        self.limit = limit
+        self.poll_seconds = poll_seconds or config.SCANNER_POLL_SECONDS
+        self.workers = workers or config.SCANNER_WORKERS
+        self.connections = connections or config.SCANNER_HTTP_CONNECTIONS
+        self.feed = feed or config.LIVE_FEED
+        self.trigger = trigger or config.LIVE_TRIGGER
+        self.features = features or config.LIVE_FEATURES
+        self.resample = config.SCANNER_RESAMPLE if resample is None else resample
+        self.rest_url = (rest_url or config.BINANCE_REST_URL).rstrip('/')
+        self.ws_url = (ws_url or config.BINANCE_WS_URL).rstrip('/')
+
+        if streams is None:
+            streams = [
+                (symbol, interval)
+                for symbol in (config.LIVE_SYMBOLS or [config.DEFAULT_ASSET])
+                for interval in (config.LIVE_INTERVALS or [config.TIMEFRAME])
+            ]
+
+        session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self.streams: List[ScannerStream] = [
+            ScannerStream(symbol, interval, limit, f"LIVE_BINANCE_{symbol.upper()}_{interval}_{session_id}")
+            for symbol, interval in streams
+        ]
+        if self.resample:
+            self._link_resampled()
+        self.feeds = [stream for stream in self.streams if stream.source is None]
+
+        self.running = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._client: Optional[MarketDataClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self._extract_lock = threading.Lock()  # Shared extractor (MediaPipe is not thread-safe)
+        self._model_lock = threading.Lock()  # Direct model calls (the broker is thread-safe)
+        self._stats_lock = threading.Lock()
+        self._renderers = threading.local()  # One ChartRenderer (canvas) per worker thread
+
+    def _link_resampled(self):
+        """Attach each symbol's coarser streams to the finest one they can be built from."""
+        by_symbol: Dict[str, Dict[str, ScannerStream]] = collections.defaultdict(dict)
+        for stream in self.streams:
+            by_symbol[stream.symbol][stream.interval] = stream
+
+        for streams in by_symbol.values():
+            for base, derived in resample_groups(streams):
+                if not derived:
+                    continue
+                source = streams[base]
+                source.derived = [streams[interval] for interval in derived]
+                source.resampler = CandleResampler(source.store, [stream.store for stream in source.derived])
+                for stream in source.derived:
+                    stream.source = source
+
+    # Lifecycle
+
+    def start(self):
+        """Run the scanner until stop() (blocking; call from a thread)."""
+        self.running = True
+        logger.info(
+            f"🚀 Market Scanner started: {len(self.streams)} streams "
+            f"({len(self.streams) - len(self.feeds)} resampled locally), feed={self.feed}, "
+            f"trigger={self.trigger}, features={self.features}, {self.workers} workers, {self.connections} connections"
+        )
+
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self.run())
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    def stop(self):
+        self.running = False
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+
+    async def run(self, register: bool = True):
+        """
+        Scan until cancelled.
+
+        Args:
+            register: Create a live session record per stream first
+        """
+        self.running = True
+        self._task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scanner')
+
+        # WebSockets hold their connection, so they do not count against the pool
+        limit = self.connections + (len(self.feeds) if self.feed == 'stream' else 0)
+        connector = aiohttp.TCPConnector(limit=limit)
+
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=10)) as session:
+                self._session = session
+                self._client = MarketDataClient(session, self.rest_url, connections=self.connections)
+
+                if register:
+                    await asyncio.gather(*(
+                        loop.run_in_executor(self._executor, self._register, stream) for stream in self.streams
+                    ))
+
+                if self.feed == 'stream':
+                    tasks = [self._follow(stream) for stream in self.feeds]
+                elif self.trigger == 'close':
+                    tasks = [self._poll_closes(stream) for stream in self.feeds]
+                else:
+                    tasks = [
+                        self._poll(stream, self.poll_seconds * i / len(self.feeds))
+                        for i, stream in enumerate(self.feeds)
+                    ]
+                if config.SCANNER_REPORT_SECONDS > 0:
+                    tasks.append(self._report_loop())
+
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.running = False
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._session = None
+            self._executor.shutdown(wait=True)
+            self._task = None
+
+    def _register(self, stream: ScannerStream):
+        """Live session record per stream (trading_signals references processed_videos)."""
+        try:
+            self.agent.supabase.create_video_record(
+                video_id=stream.video_id,
+                youtube_url="LIVE_FEED",
+                title=f"Live Trading Session {stream.name}",
+                channel="Vision Agent",
+                total_frames=0,  # Indefinite
+                model_version=(self.agent.candle_model if self.features == 'candles' else self.agent.model).model_version
+            )
+        except Exception as e:
+            logger.error(f"Failed to create live session record {stream.video_id}: {e}")
+
+    # Feeds
+
+    async def _poll(self, stream: ScannerStream, offset: float):
+        """Poll one stream every poll_seconds, starting after `offset` seconds."""
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time() + offset
+        failing = False
+        await self._seed_derived(stream)
+
+        while True:
+            delay = next_poll - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            scheduled = next_poll
+            next_poll += self.poll_seconds
+            if next_poll < loop.time():
+                # Fell behind by more than a period: skip, do not burst
+                stream.stats['missed_polls'] += 1
+                next_poll = loop.time() + self.poll_seconds
+
+            try:
+                appended, changed = await self._fetch(stream)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stream.stats['errors'] += 1
+                if not failing:
+                    logger.warning(f"Scanner {stream.name} fetch error: {e}")
+                failing = True
+                continue
+
+            failing = False
+            stream.stats['polls'] += 1
+            if changed:
+                self._resample(stream, scheduled)
+            triggered = appended if self.trigger == 'close' else changed
+            if triggered:
+                self._dispatch(stream, scheduled)
+
+    async def _poll_closes(self, stream: ScannerStream):
+        """Poll one stream just after each of its candle closes (LIVE_TRIGGER=close)."""
+        loop = asyncio.get_running_loop()
+        clock = CandleClock(stream.interval, delay=config.LIVE_CLOSE_DELAY)
+        wake_ms, closing = int(time.time() * 1000), False  # First poll fills the window at once
+        failing = False
+        await self._seed_derived(stream)
+
+        while True:
+            delay = wake_ms / 1000.0 - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            scheduled = loop.time() + wake_ms / 1000.0 - time.time()
+            close_ms = clock.close_time(wake_ms) if closing else 0
+
+            appended, changed = 0, False
+            try:
+                appended, changed = await self._fetch(stream)
+                for _ in range(CLOSE_RETRIES):
+                    if (stream.store.last_time or 0) >= close_ms:
+                        break
+                    # The exchange does not show the new candle yet
+                    await asyncio.sleep(CLOSE_RETRY_SECONDS)
+                    more, change = await self._fetch(stream)
+                    appended, changed = appended + more, changed or change
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stream.stats['errors'] += 1
+                if not failing:
+                    logger.warning(f"Scanner {stream.name} fetch error: {e}")
+                failing = True
+            else:
+                failing = False
+                stream.stats['polls'] += 1
+
+            if changed:
+                self._resample(stream, scheduled)
+            if appended:
+                self._dispatch(stream, scheduled)
+
+            # Absolute schedule: closes that passed meanwhile are skipped, not polled late
+            wake_ms, closing = clock.next_wake(int(time.time() * 1000))
+            if close_ms:
+                stream.stats['missed_polls'] += max(0, (clock.close_time(wake_ms) - close_ms) // clock.length_ms - 1)
+
+    async def _fetch(self, stream: ScannerStream) -> Tuple[int, bool]:
+        """Fetch candles changed since the last poll; returns (appended, changed)."""
+        params = {'symbol': stream.symbol, 'interval': stream.interval, **stream.store.next_fetch()}
+        rows = await self._client.klines(params, priority=self._priority(stream))
+
+        version = stream.store.version
+        appended = stream.store.update_rows(rows)
+        return appended, stream.store.version != version
+
+    async def _follow(self, stream: ScannerStream):
+        """Follow one stream's kline WebSocket."""
+        loop = asyncio.get_running_loop()
+
+        def on_candle(store, closed):
+            self._resample(stream, loop.time())
+            if self.trigger == 'close' and not closed:
+                return
+            self._dispatch(stream, loop.time())
+
+        await self._seed_derived(stream)
+        kline_stream = KlineStream(
+            stream.symbol, stream.interval, limit=self.limit, on_candle=on_candle,
+            ws_url=self.ws_url, rest_url=self.rest_url, store=stream.store, session=self._session,
+            client=self._client
+        )
+        try:
+            await kline_stream.run()
+        finally:
+            await kline_stream.stop()
+
+    async def _seed_derived(self, stream: ScannerStream):
+        """
+        One-off start-up fetches for the streams resampled from this one:
+        their history, and the base candles of their open intervals.
+        """
+        if stream.resampler is None:
+            return
+
+        for attempt in itertools.count():
+            try:
+                await asyncio.gather(*(self._fetch(derived) for derived in stream.derived))
+                start = stream.resampler.open_interval_start(int(time.time() * 1000))
+                stream.resampler.seed(await self._fetch_since(stream, start))
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stream.stats['errors'] += 1
+                if attempt == 0:
+                    logger.warning(f"Scanner {stream.name} resampler seed error: {e}")
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _fetch_since(self, stream: ScannerStream, start_ms: int) -> Dict[str, np.ndarray]:
+        """All of a stream's candles from `start_ms` on, in MAX_FETCH pages."""
+        pages = []
+        while True:
+            params = {'symbol': stream.symbol, 'interval': stream.interval, 'startTime': start_ms, 'limit': MAX_FETCH}
+            rows = await self._client.klines(params, priority=self._priority(stream))
+            pages.append(parse_klines(rows))
+            if len(rows) < MAX_FETCH:
+                break
+            start_ms = int(rows[-1][0]) + interval_ms(stream.interval)
+        return {name: np.concatenate([page[name] for page in pages]) for name in pages[0]}
+
+    @staticmethod
+    def _priority(stream: ScannerStream) -> float:
+        """Seconds until the stream's newest candle closes (0 once closed): its place in the client's queue."""
+        last = stream.store.last_time
+        if last is None:
+            return 0.0
+        return max((last + stream.store.interval_ms) / 1000.0 - time.time(), 0.0)
+
+    def _resample(self, stream: ScannerStream, scheduled: float):
+        """Update the streams built from this one and dispatch those that triggered."""
+        if stream.resampler is None:
+            return
+
+        results = stream.resampler.update()
+        for derived in stream.derived:
+            appended, changed = results[derived.interval]
+            if appended if self.trigger == 'close' else changed:
+                self._dispatch(derived, scheduled)
+
+    # Processing
+
+    def _dispatch(self, stream: ScannerStream, scheduled: float):
+        """Process the stream's current candles in the pool (or once more after the running job)."""
+        if not self.running:
+            return
+
+        if stream.busy:
+            if stream.pending is None:
+                stream.pending = scheduled
+            stream.stats['coalesced'] += 1
+            return
+
+        stream.busy = True
+        loop = asyncio.get_running_loop()
+        candles = stream.store.arrays(copy=True)  # The loop keeps updating the store
+        job = loop.run_in_executor(self._executor, self._process, stream, candles, int(time.time()))
+        job.add_done_callback(lambda future: self._done(stream, scheduled, future))
+
+    def _done(self, stream: ScannerStream, scheduled: float, future):
+        loop = asyncio.get_running_loop()
+        stream.busy = False
+
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            stream.stats['errors'] += 1
+            logger.error(f"Scanner {stream.name} processing error: {future.exception()}")
+        else:
+            stream.stats['processed'] += 1
+            stream.lags.append((loop.time() - scheduled) * 1000.0)
+
+        if stream.pending is not None:
+            pending, stream.pending = stream.pending, None
+            self._dispatch(stream, pending)
+
+    def _process(self, stream: ScannerStream, candles: Dict[str, np.ndarray], frame_idx: int):
+        """Render, extract, predict and handle the signal (worker thread)."""
+        agent = self.agent
+        stream.smc.update(candles)
+        if self.features == 'candles':
+            self._process_numeric(stream, candles, frame_idx)
+            return
+
+        frame = self._renderer().render(candles['open'], candles['high'], candles['low'], candles['close'])
+
+        extractor = agent.feature_extractor
+        with self._extract_lock:
+            extractor.set_state(stream.extractor_state)
+            try:
+                features = extractor.extract_features(frame, frame_idx)
+            finally:
+                stream.extractor_state = extractor.get_state()
+
+        stream.frame_buffer.add({
+            'frame_idx': frame_idx,
+            'features': features['vector']
+        })
+        with self._stats_lock:
+            agent.stats['frames_processed'] += 1
+
+        if stream.frame_buffer.is_ready():
+            self._predict(stream, features, frame_idx)
+
+        self._record_close_lag(stream, candles)
+
+    def _renderer(self) -> ChartRenderer:
+        """The worker thread's renderer; its canvas is reused once the frame is extracted."""
+        renderer = getattr(self._renderers, 'renderer', None)
+        if renderer is None:
+            renderer = self._renderers.renderer = ChartRenderer()
+        return renderer
+
+    def _process_numeric(self, stream: ScannerStream, candles: Dict[str, np.ndarray], frame_idx: int):
+        """Numeric candle features and the candle model (LIVE_FEATURES=candles)."""
+        agent = self.agent
+        features = agent.candle_features.extract_features(candles, frame_idx)  # Stateless, no lock
+        with self._stats_lock:
+            agent.stats['frames_processed'] += 1
+
+        if features['window'] is not None:
+            if agent.candle_broker is not None:
+                action, confidence = agent.predict_candles(features['window'], frame_idx, stream_id=stream.video_id)
+            else:
+                with self._model_lock:
+                    action, confidence = agent.predict_candles(features['window'], frame_idx, stream_id=stream.video_id)
+            self._signal(stream, features, frame_idx, action, confidence, agent.candle_model.model_version)
+
+        self._record_close_lag(stream, candles)
+
+    def _record_close_lag(self, stream: ScannerStream, candles: Dict[str, np.ndarray]):
+        if self.trigger == 'close':
+            # The newest candle opened when the previous one closed
+            stream.close_lag_ms = time.time() * 1000.0 - float(candles['time'][-1])
+
+    def _predict(self, stream: ScannerStream, features: Dict, frame_idx: int):
+        """Predict the stream's window and handle a signal."""
+        agent = self.agent
+
+        if agent.broker is not None:
+            action, confidence = agent.predict_frame(stream.frame_buffer, stream_id=stream.video_id, windowed=True)
+        else:
+            with self._model_lock:
+                action, confidence = agent.predict_frame(stream.frame_buffer, stream_id=stream.video_id, windowed=True)
+
+        self._signal(stream, features, frame_idx, action, confidence)
+
+    def _signal(
+        self,
+        stream: ScannerStream,
+        features: Dict,
+        frame_idx: int,
+        action: str,
+        confidence: float,
+        model_version: str = None
+    ):
+        """Handle an actionable prediction of a stream."""
+        agent = self.agent
+        if action != 'IGNORE' and confidence >= config.CONFIDENCE_THRESHOLD:
+            features['smc'] = stream.smc.summary()
+            agent._handle_signal(
+                action=action,
+                confidence=confidence,
+                video_id=stream.video_id,
+                frame_idx=frame_idx,
+                features_summary=agent._build_features_summary(features),
+                direction='LONG' if action == 'ENTER' else 'SHORT',  # Simplified direction inference
+                asset=stream.symbol,
+                model_version=model_version
+            )
+
+    # Reporting
+
+    def report(self) -> List[dict]:
+        """Per-stream counters and lag (ms), worst lag first."""
+        rows = []
+        for stream in self.streams:
+            lags = np.array(stream.lags) if stream.lags else None
+            rows.append({
+                'stream': stream.name,
+                **stream.stats,
+                'candles': len(stream.store),
+                'lag_ms': float(lags[-1]) if lags is not None else None,
+                'lag_p50_ms': float(np.percentile(lags, 50)) if lags is not None else None,
+                'lag_max_ms': float(lags.max()) if lags is not None else None,
+                'close_lag_ms': stream.close_lag_ms
+            })
+        return sorted(rows, key=lambda row: -(row['lag_p50_ms'] or 0.0))
+
+    def log_report(self):
+        rows = self.report()
+        lags = np.array([row['lag_p50_ms'] for row in rows if row['lag_p50_ms'] is not None])
+        if not len(lags):
+            logger.info(f"Market Scanner: {len(rows)} streams, nothing processed yet")
+            return
+
+        worst = ", ".join(f"{row['stream']} {row['lag_p50_ms']:.0f} ms" for row in rows[:3])
+        logger.info(
+            f"Market Scanner: {len(rows)} streams, {sum(row['processed'] for row in rows)} processed, "
+            f"{sum(row['errors'] for row in rows)} errors | lag p50 {np.percentile(lags, 50):.0f} ms, "
+            f"p99 {np.percentile(lags, 99):.0f} ms | worst: {worst}"
+        )
+
+    async def _report_loop(self):
+        while True:
+            await asyncio.sleep(config.SCANNER_REPORT_SECONDS)
+            self.log_report()
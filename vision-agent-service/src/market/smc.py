@@ -0,0 +1,705 @@
+"""
+Smart Money Concepts analytics over candle arrays.
+
+NumPy port of the dashboard's analyze-multi-timeframe edge function
+(detectSwingPoints, detectBOSandCHOCH, detectFVG, detectOrderBlocks,
+calculatePremiumDiscount): the same rules evaluated column-wise instead of
+candle by candle. SMCEngine keeps the analysis of a live candle window up
+to date as candles are appended, and smc_feature_columns gives the
+per-candle view used by the numeric candle features.
+
+Labels (ALTA/BAIXA/NEUTRO, PREMIUM/EQUILIBRIUM/DISCOUNT) are the dashboard's.
+"""
+import functools
+import operator
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+LEFT_BARS = 5
+RIGHT_BARS = 5
+STRUCTURE_SWINGS = 3  # Recent swing highs/lows compared for the trend and range
+FVG_LIMIT = 5  # Most recent unfilled gaps reported
+ORDER_BLOCK_LIMIT = 3  # Strongest order blocks reported
+ORDER_BLOCK_LOOKBACK = 10  # Candles searched back from a BOS swing
+ORDER_BLOCK_SIZE_PERIOD = 20  # Candles averaged for an order block's relative size
+
+BULLISH = 0
+BEARISH = 1
+KINDS = ('bullish', 'bearish')
+
+
+def _column(candles, name: str) -> np.ndarray:
+    """A column of a CandleStore or a dict of arrays."""
+    values = candles[name] if isinstance(candles, dict) else getattr(candles, name)
+    return np.asarray(values, dtype=np.int64 if name == 'time' else np.float64)
+
+
+# Detections
+
+
+def detect_swing_points(
+    high: np.ndarray,
+    low: np.ndarray,
+    left_bars: int = LEFT_BARS,
+    right_bars: int = RIGHT_BARS
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Swing highs and lows (detectSwingPoints).
+
+    A swing high is strictly higher than the `left_bars` candles before and
+    the `right_bars` candles after it (a swing low strictly lower), so the
+    first `left_bars` and last `right_bars` candles are never swings.
+
+    Returns:
+        (swing_high, swing_low) boolean masks
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    n = len(high)
+    swing_high = np.zeros(n, dtype=bool)
+    swing_low = np.zeros(n, dtype=bool)
+    count = n - left_bars - right_bars
+    if count <= 0:
+        return swing_high, swing_low
+
+    # One shifted comparison per neighbour; cheaper than window max/min for a few bars
+    swing_high[left_bars:n - right_bars] = True
+    swing_low[left_bars:n - right_bars] = True
+    centre_high = high[left_bars:n - right_bars]
+    centre_low = low[left_bars:n - right_bars]
+    for offset in range(-left_bars, right_bars + 1):
+        if offset:
+            neighbour = slice(left_bars + offset, left_bars + offset + count)
+            swing_high[left_bars:n - right_bars] &= centre_high > high[neighbour]
+            swing_low[left_bars:n - right_bars] &= centre_low < low[neighbour]
+    return swing_high, swing_low
+
+
+def detect_structure(
+    high_prices: Sequence[float],
+    high_times: Sequence[int],
+    low_prices: Sequence[float],
+    low_times: Sequence[int]
+) -> Dict:
+    """
+    Trend, BOS and CHOCH from the swings in time order (detectBOSandCHOCH).
+
+    The last STRUCTURE_SWINGS highs and lows decide the trend: higher highs
+    and higher lows ALTA, lower highs and lower lows BAIXA. Only the recent
+    swings are used, so passing just those is enough.
+
+    Returns:
+        Dictionary with trend, last_bos / last_choch (open time of the swing
+        candle or None), confidence (30-95), bos_count, choch_count
+    """
+    highs = [float(price) for price in high_prices[-STRUCTURE_SWINGS:]]
+    lows = [float(price) for price in low_prices[-STRUCTURE_SWINGS:]]
+
+    result = {
+        'trend': 'NEUTRO',
+        'last_bos': None,
+        'last_choch': None,
+        'confidence': 30,
+        'bos_count': 0,
+        'choch_count': 0
+    }
+    if len(highs) < 2 or len(lows) < 2:
+        return result
+
+    def steps(values, compare) -> bool:
+        return all(compare(after, before) for before, after in zip(values, values[1:]))
+
+    if steps(highs, operator.gt) and steps(lows, operator.gt):
+        result['trend'] = 'ALTA'
+        if highs[-1] > highs[-2]:
+            result['last_bos'], result['bos_count'] = int(high_times[-1]), 1
+        if lows[-1] < lows[-2]:
+            result['last_choch'], result['choch_count'] = int(low_times[-1]), 1
+    elif steps(highs, operator.lt) and steps(lows, operator.lt):
+        result['trend'] = 'BAIXA'
+        if lows[-1] < lows[-2]:
+            result['last_bos'], result['bos_count'] = int(low_times[-1]), 1
+        if highs[-1] > highs[-2]:
+            result['last_choch'], result['choch_count'] = int(high_times[-1]), 1
+
+    if result['trend'] != 'NEUTRO':
+        confidence = 60
+        if result['last_bos']:
+            confidence += 20
+        if result['bos_count'] > 1:
+            confidence += 10
+        result['confidence'] = min(confidence, 95)
+
+    return result
+
+
+def calculate_premium_discount(
+    current_price: float,
+    high_prices: Sequence[float],
+    low_prices: Sequence[float]
+) -> Dict:
+    """
+    Position of the price in the range of the recent swings (calculatePremiumDiscount).
+
+    The range spans the highest of the last STRUCTURE_SWINGS swing highs to
+    the lowest of the last swing lows; at or above 60% is PREMIUM, at or
+    below 40% DISCOUNT.
+
+    Returns:
+        Dictionary with current_price, range_high, range_low,
+        range_percentage (0-100) and status
+    """
+    highs = [float(price) for price in high_prices[-STRUCTURE_SWINGS:]]
+    lows = [float(price) for price in low_prices[-STRUCTURE_SWINGS:]]
+    current_price = float(current_price)
+
+    if not highs or not lows:
+        return {
+            'current_price': current_price,
+            'range_high': current_price,
+            'range_low': current_price,
+            'range_percentage': 50.0,
+            'status': 'EQUILIBRIUM'
+        }
+
+    range_high = max(highs)
+    range_low = min(lows)
+    range_size = range_high - range_low
+    percentage = (current_price - range_low) / range_size * 100.0 if range_size > 0 else 50.0
+
+    if percentage >= 60:
+        status = 'PREMIUM'
+    elif percentage <= 40:
+        status = 'DISCOUNT'
+    else:
+        status = 'EQUILIBRIUM'
+
+    return {
+        'current_price': current_price,
+        'range_high': range_high,
+        'range_low': range_low,
+        'range_percentage': max(0.0, min(100.0, percentage)),
+        'status': status
+    }
+
+
+def fvg_arrays(high: np.ndarray, low: np.ndarray, start: int = 1, stop: int = None) -> Tuple[np.ndarray, ...]:
+    """
+    All fair value gaps centred on candles start..stop-1.
+
+    Bullish where high[i-1] < low[i+1], bearish where low[i-1] > high[i+1].
+
+    Returns:
+        (index, kind, bottom, top) arrays, ordered by index, bullish first
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    stop = len(high) - 1 if stop is None else min(stop, len(high) - 1)
+    start = max(start, 1)
+    if stop <= start:
+        empty = np.zeros(0)
+        return empty.astype(np.int64), empty.astype(np.int64), empty, empty
+
+    before_high, before_low = high[start - 1:stop - 1], low[start - 1:stop - 1]
+    after_high, after_low = high[start + 1:stop + 1], low[start + 1:stop + 1]
+    centre = np.arange(start, stop)
+
+    bullish = before_high < after_low
+    bearish = before_low > after_high
+    index = np.concatenate([centre[bullish], centre[bearish]])
+    kind = np.concatenate([np.full(bullish.sum(), BULLISH), np.full(bearish.sum(), BEARISH)])
+    bottom = np.concatenate([before_high[bullish], after_high[bearish]])
+    top = np.concatenate([after_low[bullish], before_low[bearish]])
+
+    order = np.lexsort((kind, index))
+    return index[order], kind[order], bottom[order], top[order]
+
+
+def _gap(index: int, kind: int, bottom: float, top: float) -> Dict:
+    return {
+        'index': int(index),
+        'type': KINDS[kind],
+        'top': float(top),
+        'bottom': float(bottom),
+        'midpoint': float((bottom + top) / 2),
+        'size': float(top - bottom),
+        'is_filled': False
+    }
+
+
+def detect_fvg(high: np.ndarray, low: np.ndarray, close: np.ndarray, limit: int = FVG_LIMIT) -> List[Dict]:
+    """
+    Most recent fair value gaps not filled by the current price (detectFVG).
+
+    A gap counts as filled while the last close is inside it.
+
+    Returns:
+        Up to `limit` gaps (index, type, top, bottom, midpoint, size), oldest first
+    """
+    if len(close) < 3:
+        return []
+    index, kind, bottom, top = fvg_arrays(high, low)
+    current_price = float(close[-1])
+    unfilled = ~((current_price >= bottom) & (current_price <= top))
+    return [
+        _gap(i, k, b, t)
+        for i, k, b, t in zip(*(column[unfilled][-limit:] for column in (index, kind, bottom, top)))
+    ]
+
+
+def _order_block_candles(open_: np.ndarray, close: np.ndarray, indexes: np.ndarray, is_high: np.ndarray) -> np.ndarray:
+    """
+    Order block candle of each BOS swing (-1 if none).
+
+    The last bearish candle within ORDER_BLOCK_LOOKBACK before a swing high,
+    the last bullish one before a swing low.
+    """
+    position = np.arange(len(close))
+    last_bearish = np.maximum.accumulate(np.where(close < open_, position, -1))
+    last_bullish = np.maximum.accumulate(np.where(close > open_, position, -1))
+
+    before = np.maximum(indexes - 1, 0)
+    candle = np.where(is_high, last_bearish[before], last_bullish[before])
+    valid = (indexes >= 1) & (candle >= 0) & (candle >= indexes - ORDER_BLOCK_LOOKBACK)
+    return np.where(valid, candle, -1)
+
+
+def _order_block_rows(open_, high, low, close, volume, indexes: np.ndarray, is_high: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Order block candle (-1 if none) and strength of each BOS swing."""
+    candle = _order_block_candles(open_, close, indexes, is_high)
+    strength = np.zeros(len(candle))
+    found = candle >= 0
+    block = candle[found]
+
+    # Summed in candle order, as the dashboard does, so strengths (and ranking) match exactly
+    ranges = np.abs(high - low)
+    history = np.minimum(block, ORDER_BLOCK_SIZE_PERIOD)
+    total = np.zeros(len(block))
+    for k in range(ORDER_BLOCK_SIZE_PERIOD):
+        take = k < history
+        total[take] += ranges[(block - history + k)[take]]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        size_score = np.where(history > 0, ranges[block] / (total / history) * 50.0, 0.0)
+    size_score = np.nan_to_num(size_score, nan=0.0, posinf=100.0)
+    volume_score = np.minimum(50.0, volume[block] / 1_000_000 * 10)
+    strength[found] = np.minimum(100.0, size_score + volume_score)
+    return candle, strength
+
+
+def _block_list(rows: List[Tuple], current_price: float, limit: int) -> List[Dict]:
+    """Strongest `limit` of (index, is_high, top, bottom, volume, strength) rows, in BOS order on ties."""
+    blocks = []
+    for index, is_high, top, bottom, volume, strength in sorted(rows, key=lambda row: -row[5])[:limit]:
+        blocks.append({
+            'index': int(index),
+            'type': 'bullish' if is_high else 'bearish',
+            'top': float(top),
+            'bottom': float(bottom),
+            'midpoint': float((top + bottom) / 2),
+            'volume': float(volume),
+            'strength': float(strength),
+            'confirmed': bool(current_price > top if is_high else current_price < bottom)
+        })
+    return blocks
+
+
+def detect_order_blocks(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    bos_indexes: Sequence[int],
+    bos_types: Sequence[str],
+    limit: int = ORDER_BLOCK_LIMIT
+) -> List[Dict]:
+    """
+    Strongest order blocks before BOS swings (detectOrderBlocks).
+
+    Strength is the candle's range relative to the average of the previous
+    ORDER_BLOCK_SIZE_PERIOD candles (x50) plus a volume score (up to 50),
+    capped at 100. A candle without history scores on volume only (the
+    dashboard divides by zero there). Confirmed once the price closed
+    beyond the block.
+
+    Args:
+        bos_indexes: Candle index of each BOS swing
+        bos_types: 'high' or 'low' per swing
+
+    Returns:
+        Up to `limit` blocks (index, type, top, bottom, midpoint, volume,
+        strength, confirmed), strongest first
+    """
+    open_, high, low, close, volume = (np.asarray(values, dtype=np.float64) for values in (open_, high, low, close, volume))
+    indexes = np.asarray(bos_indexes, dtype=np.int64)
+    if not len(indexes) or not len(close):
+        return []
+
+    is_high = np.asarray(bos_types) == 'high'
+    candle, strength = _order_block_rows(open_, high, low, close, volume, indexes, is_high)
+    rows = [
+        (c, h, high[c], low[c], volume[c], s)
+        for c, h, s in zip(candle.tolist(), is_high.tolist(), strength.tolist()) if c >= 0
+    ]
+    return _block_list(rows, float(close[-1]), limit)
+
+
+def analyze(candles, left_bars: int = LEFT_BARS, right_bars: int = RIGHT_BARS) -> Optional[Dict]:
+    """
+    Full SMC analysis of a candle window, as the dashboard computes it.
+
+    Args:
+        candles: CandleStore, or dict with time/open/high/low/close/volume arrays
+
+    Returns:
+        Dictionary with swing_highs / swing_lows (candle indexes), structure,
+        premium_discount, fvgs and order_blocks; None for no candles
+    """
+    time, open_, high, low, close, volume = (
+        _column(candles, name) for name in ('time', 'open', 'high', 'low', 'close', 'volume')
+    )
+    if not len(time):
+        return None
+
+    swing_high, swing_low = detect_swing_points(high, low, left_bars, right_bars)
+    highs, lows = np.flatnonzero(swing_high), np.flatnonzero(swing_low)
+    structure = detect_structure(high[highs], time[highs], low[lows], time[lows])
+
+    # BOS swings: every swing high in an uptrend, every swing low in a downtrend
+    bos_indexes = {'ALTA': highs, 'BAIXA': lows}.get(structure['trend'], highs[:0])
+    bos_type = 'low' if structure['trend'] == 'BAIXA' else 'high'
+
+    return {
+        'swing_highs': highs,
+        'swing_lows': lows,
+        'structure': structure,
+        'premium_discount': calculate_premium_discount(close[-1], high[highs], low[lows]),
+        'fvgs': detect_fvg(high, low, close),
+        'order_blocks': detect_order_blocks(open_, high, low, close, volume, bos_indexes, [bos_type] * len(bos_indexes))
+    }
+
+
+def summarize(analysis: Optional[Dict]) -> Optional[Dict]:
+    """Compact analysis for a signal's features_summary."""
+    if analysis is None:
+        return None
+
+    structure = analysis['structure']
+    premium_discount = analysis['premium_discount']
+    fvgs = analysis['fvgs']
+    blocks = analysis['order_blocks']
+    return {
+        'trend': structure['trend'],
+        'confidence': structure['confidence'],
+        'last_bos': structure['last_bos'],
+        'last_choch': structure['last_choch'],
+        'premium_discount': premium_discount['status'],
+        'range_percentage': round(premium_discount['range_percentage'], 1),
+        'fvgs': len(fvgs),
+        'last_fvg': {key: fvgs[-1][key] for key in ('type', 'bottom', 'top')} if fvgs else None,
+        'order_block': {key: blocks[0][key] for key in ('type', 'bottom', 'top', 'strength', 'confirmed')} if blocks else None
+    }
+
+
+class SMCEngine:
+    """
+    SMC analysis of a live candle window, updated incrementally.
+
+    Swings and gaps of closed candles are detected once, when the candles
+    that confirm them arrive, and kept by open time with their order
+    blocks; on each update only the newest candidates (those that depend on
+    the still-open last candle) are checked, with scalar comparisons. Trend,
+    range, unfilled gaps and the strongest blocks are then read from the
+    kept points. The result equals analyze() on the same window.
+
+    Candles before the last are assumed final (as in CandleStore); a window
+    that no longer contains the previous last candle is analysed from scratch.
+    """
+
+    SCALAR_CANDIDATES = 8  # More new candidates than this are detected vectorized
+
+    def __init__(self, left_bars: int = LEFT_BARS, right_bars: int = RIGHT_BARS):
+        self.left_bars = left_bars
+        self.right_bars = right_bars
+        self.analysis: Optional[Dict] = None
+        self.stats = {'updates': 0, 'rebuilds': 0}
+        self._clear()
+
+    def _clear(self):
+        self._last_time: Optional[int] = None
+        self._swings = ([], [])  # (open time, price) of final swing highs, lows
+        self._gaps: List[Tuple[int, int, float, float]] = []  # (centre open time, kind, bottom, top) of final gaps
+        self._blocks: Dict[Tuple[int, bool], Tuple] = {}  # (swing time, is high) -> order block, see _order_blocks
+
+    def reset(self):
+        self._clear()
+        self.analysis = None
+
+    def update(self, candles) -> Optional[Dict]:
+        """
+        Bring the analysis up to date with the window.
+
+        Args:
+            candles: CandleStore, or dict with time/open/high/low/close/volume arrays
+
+        Returns:
+            The analysis (see analyze), None for an empty window
+        """
+        columns = tuple(_column(candles, name) for name in ('time', 'open', 'high', 'low', 'close', 'volume'))
+        time, _, high, low, close, _ = columns
+        n = len(time)
+        self.stats['updates'] += 1
+        if not n:
+            self.reset()
+            return None
+
+        left, right = self.left_bars, self.right_bars
+        previous = self._last_position(time)
+        if previous is None:
+            self._clear()
+            swing_start, gap_start = left, 1
+            self.stats['rebuilds'] += 1
+        else:
+            # Swings up to previous - 1 - right and gaps up to previous - 2 were final already
+            swing_start, gap_start = max(previous - right, left), max(previous - 1, 1)
+        self._last_time = int(time[-1])
+
+        # Newly final: swings whose right bars are all closed, gaps whose right candle is
+        for kept, found in zip(self._swings, self._find_swings(time, high, low, swing_start, n - 2 - right)):
+            kept.extend(found)
+        self._gaps.extend(self._find_gaps(time, high, low, gap_start, n - 3))
+        self._prune(time)
+
+        # Candidates that depend on the open candle, re-evaluated on every update
+        swings = [list(kept) for kept in self._swings]
+        for side, found in zip(swings, self._find_swings(time, high, low, max(n - 1 - right, left), n - 1 - right)):
+            side.extend(found)
+        gaps = self._gaps + self._find_gaps(time, high, low, max(n - 2, 1), n - 2)
+
+        highs, lows = swings
+        current_price = float(close[-1])
+        high_times = [t for t, _ in highs]
+        low_times = [t for t, _ in lows]
+        recent_highs = [p for _, p in highs[-STRUCTURE_SWINGS:]]
+        recent_lows = [p for _, p in lows[-STRUCTURE_SWINGS:]]
+        structure = detect_structure(recent_highs, high_times, recent_lows, low_times)
+
+        bos = {'ALTA': (high_times, True), 'BAIXA': (low_times, False)}.get(structure['trend'], ([], True))
+        self.analysis = {
+            'swing_highs': np.searchsorted(time, high_times).astype(np.int64),
+            'swing_lows': np.searchsorted(time, low_times).astype(np.int64),
+            'structure': structure,
+            'premium_discount': calculate_premium_discount(current_price, recent_highs, recent_lows),
+            'fvgs': self._unfilled(time, gaps, current_price),
+            'order_blocks': _block_list(self._order_blocks(columns, *bos), current_price, ORDER_BLOCK_LIMIT)
+        }
+        return self.analysis
+
+    def _last_position(self, time: np.ndarray) -> Optional[int]:
+        """Index of the previous update's last candle, None to rebuild."""
+        if self._last_time is None:
+            return None
+        position = int(np.searchsorted(time, self._last_time))
+        if position >= len(time) or time[position] != self._last_time:
+            return None
+        return position
+
+    def _find_swings(self, time, high, low, start: int, stop: int) -> Tuple[List, List]:
+        """(open time, price) of swing highs and lows centred on start..stop (inclusive)."""
+        found = ([], [])
+        if stop < start:
+            return found
+
+        left, right = self.left_bars, self.right_bars
+        if stop - start >= self.SCALAR_CANDIDATES:
+            sh, sl = detect_swing_points(high[start - left:stop + right + 1], low[start - left:stop + right + 1], left, right)
+            for side, mask, values in zip(found, (sh, sl), (high, low)):
+                index = start - left + np.flatnonzero(mask)
+                side.extend(zip(time[index].tolist(), values[index].tolist()))
+            return found
+
+        for i in range(start, stop + 1):
+            highs = high[i - left:i + right + 1].tolist()
+            lows = low[i - left:i + right + 1].tolist()
+            centre_high, centre_low = highs.pop(left), lows.pop(left)
+            if all(centre_high > value for value in highs):
+                found[0].append((int(time[i]), centre_high))
+            if all(centre_low < value for value in lows):
+                found[1].append((int(time[i]), centre_low))
+        return found
+
+    def _find_gaps(self, time, high, low, start: int, stop: int) -> List[Tuple[int, int, float, float]]:
+        """Gaps centred on start..stop (inclusive), ordered as fvg_arrays."""
+        if stop < start:
+            return []
+        if stop - start >= self.SCALAR_CANDIDATES:
+            index, kind, bottom, top = fvg_arrays(high, low, start, stop + 1)
+            return list(zip(time[index].tolist(), kind.tolist(), bottom.tolist(), top.tolist()))
+
+        gaps = []
+        for i in range(start, stop + 1):
+            before_high, _, after_high = high[i - 1:i + 2].tolist()
+            before_low, _, after_low = low[i - 1:i + 2].tolist()
+            if before_high < after_low:
+                gaps.append((int(time[i]), BULLISH, before_high, after_low))
+            if before_low > after_high:
+                gaps.append((int(time[i]), BEARISH, after_high, before_low))
+        return gaps
+
+    def _prune(self, time: np.ndarray):
+        """Forget points analyze() would not see in this window (and later ones)."""
+        first_swing = int(time[self.left_bars]) if len(time) > self.left_bars else None
+        first_gap = int(time[1]) if len(time) > 1 else None
+
+        for kept in self._swings:
+            drop = 0
+            while drop < len(kept) and (first_swing is None or kept[drop][0] < first_swing):
+                drop += 1
+            del kept[:drop]
+        drop = 0
+        while drop < len(self._gaps) and (first_gap is None or self._gaps[drop][0] < first_gap):
+            drop += 1
+        del self._gaps[:drop]
+
+        if first_swing is None:
+            self._blocks.clear()
+        else:
+            for key in [key for key in self._blocks if key[0] < first_swing]:
+                del self._blocks[key]
+
+    def _unfilled(self, time: np.ndarray, gaps: List[Tuple], current_price: float) -> List[Dict]:
+        """The FVG_LIMIT most recent gaps the price is not inside, oldest first."""
+        recent = []
+        for gap in reversed(gaps):
+            if not gap[2] <= current_price <= gap[3]:
+                recent.append(gap)
+                if len(recent) == FVG_LIMIT:
+                    break
+        recent.reverse()
+        index = np.searchsorted(time, [gap[0] for gap in recent]).tolist()
+        return [_gap(i, kind, bottom, top) for i, (_, kind, bottom, top) in zip(index, recent)]
+
+    def _order_blocks(self, columns: Tuple[np.ndarray, ...], swing_times: List[int], is_high: bool) -> List[Tuple]:
+        """
+        Order block rows of the BOS swings, for _block_list.
+
+        A block depends on closed candles only, so it is kept per swing while
+        its whole lookback (and the ORDER_BLOCK_SIZE_PERIOD candles before
+        the block) is still in the window; blocks near the start of the
+        window are recomputed, as analyze() sees them truncated.
+        """
+        time, open_, high, low, close, volume = columns
+        first_time = int(time[0])
+        cached = {}
+        missing = []
+        for swing_time in swing_times:
+            block = self._blocks.get((swing_time, is_high))
+            if block is not None and block[0] >= first_time:
+                cached[swing_time] = block
+            else:
+                missing.append(swing_time)
+
+        if missing:
+            indexes = np.searchsorted(time, missing).astype(np.int64)
+            candle, strength = _order_block_rows(open_, high, low, close, volume, indexes, np.full(len(indexes), is_high))
+            for swing_time, b, c, s in zip(missing, indexes.tolist(), candle.tolist(), strength.tolist()):
+                # Oldest candle the result depends on
+                needed = c - ORDER_BLOCK_SIZE_PERIOD if c >= 0 else b - ORDER_BLOCK_LOOKBACK
+                found = (int(time[c]), float(high[c]), float(low[c]), float(volume[c]), s) if c >= 0 else None
+                block = (int(time[needed]) if needed >= 0 else None, found)
+                cached[swing_time] = block
+                if needed >= 0:
+                    self._blocks[(swing_time, is_high)] = block
+
+        rows = [cached[swing_time][1] for swing_time in swing_times if cached[swing_time][1] is not None]
+        index = np.searchsorted(time, [row[0] for row in rows]).tolist()
+        return [(i, is_high, top, bottom, vol, s) for i, (_, top, bottom, vol, s) in zip(index, rows)]
+
+    def summary(self) -> Optional[Dict]:
+        return summarize(self.analysis)
+
+
+# Per-candle features
+
+
+def _recent_swings(mask: np.ndarray, values: np.ndarray, delay: int) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """
+    The last STRUCTURE_SWINGS swings known at each candle (confirmed `delay` candles later).
+
+    Returns:
+        (swing positions, number of swings known at each candle, values of
+        the last STRUCTURE_SWINGS known swings at each candle, latest first,
+        NaN if missing)
+    """
+    positions = np.flatnonzero(mask)
+    known = np.searchsorted(positions + delay, np.arange(len(values)), side='right')
+    swing_values = np.concatenate([[np.nan], values[positions]])  # 1-based, 0: none
+    recent = [swing_values[np.maximum(known - k, 0)] for k in range(STRUCTURE_SWINGS)]
+    return positions, known, recent
+
+
+def _consecutive(recent: List[np.ndarray], known: np.ndarray, compare) -> np.ndarray:
+    """Each of the last (up to STRUCTURE_SWINGS) swings compares `compare` to the one before."""
+    result = known >= 2
+    for k in range(STRUCTURE_SWINGS - 1):
+        result &= (known < k + 2) | compare(recent[k], recent[k + 1])
+    return result
+
+
+def smc_feature_columns(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    atr: np.ndarray,
+    left_bars: int = LEFT_BARS,
+    right_bars: int = RIGHT_BARS
+) -> Dict[str, np.ndarray]:
+    """
+    SMC state as known at every candle, for the numeric candle features.
+
+    Swings count from the candle that confirms them (`right_bars` later).
+    Columns: smc_trend (+1 ALTA, -1 BAIXA, 0), premium_discount (position in
+    the swing range, 0-1, 0.5 if undefined), fvg_bullish / fvg_bearish (size
+    of a gap completed by the candle, ATR units), ob_bullish_distance /
+    ob_bearish_distance (close minus the midpoint of the order block of the
+    latest swing high / low, ATR units, 0 if none).
+    """
+    n = len(close)
+    swing_high, swing_low = detect_swing_points(high, low, left_bars, right_bars)
+    high_positions, high_known, highs = _recent_swings(swing_high, high, right_bars)
+    low_positions, low_known, lows = _recent_swings(swing_low, low, right_bars)
+
+    rising = _consecutive(highs, high_known, np.greater) & _consecutive(lows, low_known, np.greater)
+    falling = _consecutive(highs, high_known, np.less) & _consecutive(lows, low_known, np.less)
+    trend = np.where(rising, 1.0, np.where(falling, -1.0, 0.0))
+
+    range_high = functools.reduce(np.fmax, highs)
+    range_low = functools.reduce(np.fmin, lows)
+    range_size = range_high - range_low
+    defined = (high_known > 0) & (low_known > 0) & (range_size > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        premium = np.where(defined, (close - range_low) / np.where(defined, range_size, 1.0), 0.5)
+    premium = np.clip(premium, 0.0, 1.0)
+
+    fvg_bullish = np.zeros(n)
+    fvg_bearish = np.zeros(n)
+    if n >= 3:
+        gap_up = low[2:] - high[:-2]
+        gap_down = low[:-2] - high[2:]
+        fvg_bullish[2:] = np.where(gap_up > 0, gap_up, 0.0) / atr[2:]
+        fvg_bearish[2:] = np.where(gap_down > 0, gap_down, 0.0) / atr[2:]
+
+    midpoint = (high + low) / 2
+    columns = {'smc_trend': trend, 'premium_discount': premium, 'fvg_bullish': fvg_bullish, 'fvg_bearish': fvg_bearish}
+    for name, positions, known, is_high in (
+        ('ob_bullish_distance', high_positions, high_known, True),
+        ('ob_bearish_distance', low_positions, low_known, False)
+    ):
+        # Block of each swing, then of the latest swing known at each candle
+        blocks = _order_block_candles(open_, close, positions, np.full(len(positions), is_high))
+        block = np.concatenate([[-1], blocks])[known]
+        columns[name] = np.where(block >= 0, (close - midpoint[np.maximum(block, 0)]) / atr, 0.0)
+
+    return columns
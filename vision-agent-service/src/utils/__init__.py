@@ -1,4 +1,5 @@
 """Utilities package."""
 from .logger import AgentLogger, logger
+from .lazy_import import lazy_import
 
-__all__ = ["AgentLogger", "logger"]
+__all__ = ["AgentLogger", "logger", "lazy_import"]
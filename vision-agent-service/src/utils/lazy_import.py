@@ -0,0 +1,35 @@
+"""Deferred imports for heavy dependencies."""
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+    
+    def _load(self) -> types.ModuleType:
+        if self._module is None:
+            self._module = importlib.import_module(self.__name__)
+        return self._module
+    
+    def __getattr__(self, item: str):
+        return getattr(self._load(), item)
+    
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Import a module on first use.
+    
+    Keeps TensorFlow, MediaPipe, yt-dlp etc. out of startup for commands
+    and modes that never touch them.
+    
+    Args:
+        name: Absolute module name (e.g. 'tensorflow')
+    """
+    return LazyModule(name)